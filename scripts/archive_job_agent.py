@@ -1,28 +1,78 @@
 """
-Fetch a job posting URL with Playwright, extract text and PDF, and save to data/<company>/<date>/
-(url.txt, raw.html, job.txt, job.pdf). Infers company from job page if not provided.
-Exit 2 if posting not found (e.g. 4xx/5xx or "no longer available"). Used by popjobs and archivejobs.
+Fetch a job posting URL with Playwright, extract text, and save to data/<company>/<date>/
+(url.txt, raw.html, job.txt, and job_main.txt: the posting body without nav, cookie banners, related
+jobs or footers, which agents prefer over job.txt). Greenhouse, Lever and Ashby links are read from the board's
+public JSON API instead (no browser) and also get a structured job.json. Other pages are
+fetched with a plain HTTP GET first and only escalate to Playwright when the result looks incomplete
+(a 404 / 410 or a full "no longer available" page is reported as not found straight away).
+The tier that served each URL is logged to data/archive_log.jsonl.
+Company and role title are read from the page's JobPosting JSON-LD / OpenGraph tags when present (saved
+as posting.json); Claude is asked only when they are missing. popjobs passes an infer function instead
+(batch_extract_metadata.extract_posting_fields), so one Claude call returns company, title and the role /
+company-type metadata together; its answer is saved as posting_extract.json for the metadata stage.
+job.pdf is not printed here by default: render_pdfs renders it later from raw.html in a background
+batch (ARCHIVE_PDF_MODE=deferred). ARCHIVE_PDF_MODE=inline prints it from the live browser page
+as before; ARCHIVE_PDF_MODE=off skips PDFs entirely.
+Infers company from job page if not provided.
+Exit 2 if posting not found (e.g. 4xx/5xx or "no longer available"). Used by popjobs and archivejobs,
+which call archive_job() in-process with a shared BrowserPool instead of running this script per row.
 
 Invoked by: popjobs, archivejobs (no direct alias).
 """
+import json
 import os
 import sys
+import threading
+import time
 from pathlib import Path
-from datetime import date
+from datetime import date, datetime
+from urllib.parse import urlparse
 
+import httpx
 from anthropic import Anthropic
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+
+from ats_api import fetch_ats_posting, posting_to_html
+from browser_pool import BrowserPool
+from company_store import company_key, folder_slug, lookup, register
+from html_text import html_to_text
+from http_client import get_client
+from job_text import JOB_MAIN_FILE
+from llm_cache import cached_create
+from main_content import extract_main_text
+from page_readiness import wait_until_ready
+from render_pdfs import pdf_mode, start_background_render
+from structured_data import POSTING_FILE, extract_structured_posting, strip_legal_suffix
+
+DATA_DIR = Path("data")
+POSTING_EXTRACT_FILE = "posting_extract.json"
+# One JSON line per archived URL (tier, readiness strategy, wait and total time) for tuning archive latency
+ARCHIVE_LOG_FILE = "archive_log.jsonl"
+_archive_log_lock = threading.Lock()
+# Concurrent rows for the same company and date share data/<company>/<date>/: one lock per folder keeps their files apart
+_out_dir_locks: dict[Path, threading.Lock] = {}
+_out_dir_locks_lock = threading.Lock()
+# Written only for some postings; removed when the posting archived over them doesn't have them
+OPTIONAL_ARCHIVE_FILES = (JOB_MAIN_FILE, POSTING_FILE, POSTING_EXTRACT_FILE, "job.json", "job.pdf")
+
+# HTTP tier: a plain GET is accepted only if it yields at least this much text and doesn't look like a JS shell
+DEFAULT_HTTP_MIN_TEXT_CHARS = 1500
+JS_SHELL_PHRASES = (
+    "enable javascript",
+    "javascript is required",
+    "requires javascript",
+    "javascript is disabled",
+    "turn on javascript",
+    "browser is not supported",
+)
+# HTTP statuses that mean the posting is gone; a browser would get the same answer, so archiving stops there
+HTTP_GONE_STATUSES = (404, 410)
 
 def slugify(s: str) -> str:
     return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
 
 def clean_text_from_html(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    return " ".join(soup.get_text(separator=" ").split())
+    return html_to_text(html)
 
 
 # Exit code 2 = posting not found / unparseable (for batch to skip row)
@@ -59,7 +109,8 @@ ROLE_TITLE: <the exact job title from the posting, e.g. "Senior Software Enginee
 
 Use short company names where natural (e.g. "Costco" not "Costco Wholesale Corporation"). One line each. If unclear, use "Unknown"."""
     snippet = job_text[:20000].strip()
-    msg = client.messages.create(
+    msg = cached_create(
+        client,
         model="claude-3-haiku-20240307",
         max_tokens=128,
         messages=[{"role": "user", "content": f"{prompt}\n\n{snippet}"}],
@@ -76,48 +127,280 @@ Use short company names where natural (e.g. "Costco" not "Costco Wholesale Corpo
     return company_raw or "Unknown", role_title or "Unknown"
 
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: python scripts/archive_job_agent.py <url> <date_YYYY-MM-DD>", file=sys.stderr)
-        raise SystemExit(1)
+def log_archive_event(data_dir: Path, record: dict) -> None:
+    """Append one archive timing record to data_dir/archive_log.jsonl."""
+    record = {"ts": datetime.now().isoformat(timespec="seconds"), **record}
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with _archive_log_lock, open(data_dir / ARCHIVE_LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _run_infer(infer, text: str) -> dict:
+    """Call the combined extraction (see archive_job's infer); company_name / role_title default to "Unknown"."""
+    extracted = dict(infer(text))
+    extracted["company_name"] = (extracted.get("company_name") or "").strip() or "Unknown"
+    extracted["role_title"] = (extracted.get("role_title") or "").strip() or "Unknown"
+    print("  🧠 Company, title and role metadata from one Claude call")
+    return extracted
+
+
+def prefer_known_name(company: str, alternative: str | None = None) -> str:
+    """A page-supplied company name ("Costco Wholesale", legal suffix already dropped), or a shorter form of it: the
+    longest leading run of its words the company store already knows ("Costco"), else alternative (Claude's short
+    name) when it is such a leading run. Keeps JSON-LD / ATS names from opening new folders for known companies."""
+    if not company or lookup(company):
+        return company
+    words = company.split()
+    for n in range(len(words) - 1, 0, -1):
+        if lookup(" ".join(words[:n])):
+            return " ".join(words[:n])
+    if alternative and company_key(company).startswith(company_key(alternative) + "-"):
+        return alternative
+    return company
+
+
+def identify_posting(rendered_html: str, text: str, infer=None) -> tuple[str, str, dict | None, dict | None]:
+    """(company, role_title, structured, extracted) for a fetched page. Company and title come from the page's JobPosting
+    JSON-LD / OpenGraph (structured_data) when both are present; Claude is asked only otherwise. With infer, it is
+    always called (it also answers the metadata fields) and extracted is its answer, with company / title from
+    structured data taking precedence."""
+    structured = extract_structured_posting(rendered_html)
+    has_structured = bool(structured and structured["source"] and structured["company"] and structured["title"])
+    extracted = None
+    if infer is not None:
+        extracted = _run_infer(infer, text)
+        company_raw, role_title = extracted["company_name"], extracted["role_title"]
+    elif has_structured:
+        print(f"  🏷️ Company and title from {structured['source']}")
+        return prefer_known_name(structured["company"]), structured["title"], structured, None
+    else:
+        company_raw, role_title = infer_company_and_role_title(text)
+    if structured:
+        company_raw = prefer_known_name(structured["company"], company_raw) if structured["company"] else company_raw
+        role_title = structured["title"] or role_title
+    if extracted is not None:
+        extracted.update(company_name=company_raw, role_title=role_title)
+    return company_raw, role_title, structured, extracted
+
+
+def _out_dir_lock(out_dir: Path) -> threading.Lock:
+    """The lock held while writing into a job folder (same Path -> same lock)."""
+    with _out_dir_locks_lock:
+        return _out_dir_locks.setdefault(out_dir, threading.Lock())
+
+
+def _save_archive(
+    data_dir: Path,
+    company_raw: str,
+    folder_date: str,
+    url: str,
+    rendered_html: str,
+    text: str,
+    main_text: str | None,
+    structured: dict | None = None,
+    extracted: dict | None = None,
+    job_json: dict | None = None,
+    pdf: bytes | None = None,
+) -> Path:
+    """Write url.txt, raw.html, job.txt and (when given) job_main.txt, posting.json, posting_extract.json, job.json and job.pdf under
+    data_dir/<company>/<folder_date>/; return that folder. <company> is the company store's slug for this name when known, so spelling variants share one folder.
+    The folder's lock is held for the whole write, and optional files this posting lacks are removed, so a row archived
+    concurrently (or earlier) into the same folder never leaves its files mixed with these."""
+    out_dir = data_dir / register(company_raw, folder_slug(company_raw)) / folder_date
+    files = {
+        "url.txt": url,
+        "raw.html": rendered_html,
+        "job.txt": text,
+        JOB_MAIN_FILE: main_text,
+        POSTING_FILE: json.dumps(structured, indent=2, ensure_ascii=False) if structured else None,
+        POSTING_EXTRACT_FILE: json.dumps(extracted, indent=2, ensure_ascii=False) if extracted else None,
+        "job.json": json.dumps(job_json, indent=2, ensure_ascii=False) if job_json else None,
+        "job.pdf": pdf,
+    }
+    with _out_dir_lock(out_dir):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name in OPTIONAL_ARCHIVE_FILES:
+            if not files.get(name):
+                (out_dir / name).unlink(missing_ok=True)
+        for name, content in files.items():
+            if isinstance(content, bytes):
+                (out_dir / name).write_bytes(content)
+            elif content:
+                (out_dir / name).write_text(content, encoding="utf-8")
+    return out_dir
 
-    url, folder_date = sys.argv[1], sys.argv[2]
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        try:
-            page = browser.new_page()
-            response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            page.wait_for_timeout(3000)
-            rendered_html = page.content()
-            text = clean_text_from_html(rendered_html)
+def _fetch_over_http(url: str) -> tuple[int | None, str, str | None]:
+    """Plain GET through the pooled client. Returns (status, html, error); error is set when the browser must be used."""
+    try:
+        resp = get_client().get(url)
+    except httpx.HTTPError as e:
+        return None, "", f"http error: {type(e).__name__}"
+    content_type = resp.headers.get("content-type", "")
+    if "html" not in content_type:
+        return resp.status_code, "", f"content-type {content_type or 'missing'}"
+    return resp.status_code, resp.text, None
 
-            status = response.status if response else None
-            if posting_unavailable(status, text):
-                print("POSTING_NOT_FOUND", file=sys.stderr)
-                sys.exit(POSTING_NOT_FOUND_EXIT)
 
-            company_raw, role_title = infer_company_and_role_title(text)
-            print(f"COMPANY: {company_raw}", flush=True)
-            print(f"ROLE_TITLE: {role_title}", flush=True)
+def _http_escalation_reason(status: int | None, text: str) -> str | None:
+    """Why a plain-HTTP page can't be trusted as the archived posting, or None if it can (it may still read as
+    unavailable: archive_job checks posting_unavailable next)."""
+    if status is None or not 200 <= status < 300:
+        return f"status {status}"
+    min_chars = int(os.environ.get("ARCHIVE_HTTP_MIN_TEXT_CHARS", DEFAULT_HTTP_MIN_TEXT_CHARS))
+    if len(text) < min_chars:
+        return f"short text ({len(text)} chars)"
+    t = text.lower()
+    if any(p in t for p in JS_SHELL_PHRASES):
+        return "javascript shell"
+    return None
 
-            company = slugify(company_raw)
-            out_dir = Path("data") / company / folder_date
-            out_dir.mkdir(parents=True, exist_ok=True)
 
-            (out_dir / "url.txt").write_text(url, encoding="utf-8")
-            (out_dir / "raw.html").write_text(rendered_html, encoding="utf-8")
-            (out_dir / "job.txt").write_text(text, encoding="utf-8")
+def _archive_ats_posting(posting: dict, url: str, folder_date: str, data_dir: Path, started: float, infer=None) -> dict:
+    """Save a posting fetched from an ATS JSON API (no browser): job.txt, url.txt, raw.html and job.json."""
+    rendered_html = posting_to_html(posting)
+    text = clean_text_from_html(rendered_html)
+    main_text = extract_main_text(rendered_html)
+    fetch_ms = int((time.monotonic() - started) * 1000)
+    log_archive_event(data_dir, {
+        "url": url,
+        "host": urlparse(url).hostname,
+        "tier": "ats_api",
+        "source": posting["source"],
+        "fetch_ms": fetch_ms,
+        "text_chars": len(text),
+        "main_chars": len(main_text or ""),
+    })
+    print(f"  ⚡ Fetched from {posting['source']} API in {fetch_ms} ms")
 
+    company_raw, role_title = strip_legal_suffix(posting.get("company") or ""), posting.get("title")
+    extracted = None
+    if infer is not None:
+        extracted = _run_infer(infer, main_text or text)
+        company_raw = prefer_known_name(company_raw, extracted["company_name"]) if company_raw else extracted["company_name"]
+        role_title = role_title or extracted["role_title"]
+        extracted.update(company_name=company_raw, role_title=role_title)
+    elif not company_raw:
+        company_raw, inferred_title = infer_company_and_role_title(main_text or text)
+        role_title = role_title or inferred_title
+    else:
+        company_raw = prefer_known_name(company_raw)
+
+    job_json = {**posting, "company": company_raw, "description_text": text,
+                "fetched_at": datetime.now().isoformat(timespec="seconds")}
+    out_dir = _save_archive(
+        data_dir, company_raw, folder_date, url, rendered_html, text, main_text, extracted=extracted, job_json=job_json
+    )
+    return {"company": company_raw, "role_title": role_title or "Unknown", "out_dir": out_dir, "extracted": extracted}
+
+
+def archive_job(url: str, folder_date: str, pool: BrowserPool, data_dir: Path = DATA_DIR, infer=None) -> dict | None:
+    """Archive one posting into data_dir/<company>/<folder_date>/. Greenhouse / Lever / Ashby links are
+    fetched from their JSON APIs; other pages are tried with a plain HTTP GET and escalate to a page
+    from pool only when that text is too short or looks like a JavaScript shell.
+    infer, when given, is called once with the job text instead of infer_company_and_role_title and must return a dict
+    with at least company_name and role_title (saved as posting_extract.json).
+    Returns {"company", "role_title", "out_dir", "extracted" (infer's answer or None)}, or None if the posting is not found."""
+    started = time.monotonic()
+    posting = fetch_ats_posting(url)
+    if posting is not None:
+        return _archive_ats_posting(posting, url, folder_date, data_dir, started, infer)
+
+    escalated_because = None
+    if os.environ.get("ARCHIVE_HTTP_FIRST", "1") != "0":
+        status, rendered_html, escalated_because = _fetch_over_http(url)
+        text = clean_text_from_html(rendered_html) if escalated_because is None else ""
+        if escalated_because is None:
+            escalated_because = _http_escalation_reason(status, text)
+        # A full page that says the job is gone (or a 404 / 410) is final: Chromium would only confirm it
+        if status in HTTP_GONE_STATUSES or (escalated_because is None and posting_unavailable(status, text)):
+            log_archive_event(data_dir, {
+                "url": url,
+                "host": urlparse(url).hostname,
+                "tier": "http",
+                "status": status,
+                "unavailable": True,
+                "fetch_ms": int((time.monotonic() - started) * 1000),
+                "text_chars": len(text),
+            })
+            return None
+        if escalated_because is None:
+            main_text = extract_main_text(rendered_html)
+            fetch_ms = int((time.monotonic() - started) * 1000)
+            log_archive_event(data_dir, {
+                "url": url,
+                "host": urlparse(url).hostname,
+                "tier": "http",
+                "status": status,
+                "fetch_ms": fetch_ms,
+                "text_chars": len(text),
+                "main_chars": len(main_text or ""),
+            })
+            print(f"  🌐 Fetched over HTTP in {fetch_ms} ms")
+            company_raw, role_title, structured, extracted = identify_posting(rendered_html, main_text or text, infer)
+            out_dir = _save_archive(
+                data_dir, company_raw, folder_date, url, rendered_html, text, main_text, structured, extracted
+            )
+            return {"company": company_raw, "role_title": role_title, "out_dir": out_dir, "extracted": extracted}
+        print(f"  ↪ Escalating to browser ({escalated_because})")
+
+    inline_pdf = pdf_mode() == "inline"
+    # Only an inline PDF needs images on the live page; otherwise they are blocked
+    with pool.page(for_pdf=inline_pdf) as page:
+        response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        status = response.status if response else None
+        readiness = wait_until_ready(page, url, status=status)
+        rendered_html = page.content()
+        text = clean_text_from_html(rendered_html)
+        main_text = extract_main_text(rendered_html)
+
+        log_archive_event(data_dir, {
+            "url": url,
+            "host": urlparse(url).hostname,
+            "tier": "browser",
+            "escalated_because": escalated_because,
+            "status": status,
+            "readiness": readiness["strategy"],
+            "ready_wait_ms": readiness["waited_ms"],
+            "fetch_ms": int((time.monotonic() - started) * 1000),
+            "text_chars": len(text),
+            "main_chars": len(main_text or ""),
+        })
+        print(f"  ⏱️ Page ready via {readiness['strategy']} after {readiness['waited_ms']} ms")
+        if posting_unavailable(status, text):
+            return None
+
+        company_raw, role_title, structured, extracted = identify_posting(rendered_html, main_text or text, infer)
+        pdf = None
+        if inline_pdf:
             try:
-                page.pdf(path=str(out_dir / "job.pdf"), format="Letter", print_background=True)
+                pdf = page.pdf(format="Letter", print_background=True)
             except Exception as e:
                 print(f"⚠️ PDF save failed: {e}")
+        out_dir = _save_archive(
+            data_dir, company_raw, folder_date, url, rendered_html, text, main_text, structured, extracted, pdf=pdf
+        )
+
+    return {"company": company_raw, "role_title": role_title, "out_dir": out_dir, "extracted": extracted}
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python scripts/archive_job_agent.py <url> <date_YYYY-MM-DD>", file=sys.stderr)
+        raise SystemExit(1)
+
+    url, folder_date = sys.argv[1], sys.argv[2]
 
-        finally:
-            browser.close()
+    with BrowserPool() as pool:
+        result = archive_job(url, folder_date, pool)
+    if result is None:
+        print("POSTING_NOT_FOUND", file=sys.stderr)
+        sys.exit(POSTING_NOT_FOUND_EXIT)
 
-    print(f"\n⬇️ Saved to {out_dir}\n")
+    print(f"COMPANY: {result['company']}", flush=True)
+    print(f"ROLE_TITLE: {result['role_title']}", flush=True)
+    print(f"\n⬇️ Saved to {result['out_dir']}\n")
+    start_background_render([result["out_dir"]])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,173 @@
+"""
+ATS API fast path for archiving: Greenhouse, Lever and Ashby boards expose public JSON posting
+endpoints, so those links can be archived over plain HTTP without launching a browser.
+
+fetch_ats_posting(url) returns a normalized posting dict (title, company, location, description
+HTML, ...) or None when the URL is not a supported board or the API did not answer cleanly, in
+which case the caller falls back to Playwright.
+
+API hosts can be pointed at a local stand-in serving recorded payloads via GREENHOUSE_API_BASE,
+LEVER_API_BASE and ASHBY_API_BASE: ats_api_standin serves scripts/fixtures/ats/, and check_ats_api
+runs every case in fixtures/ats/cases.json against it.
+
+Used by: archive_job_agent, check_ats_api.
+"""
+import html
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from http_client import get_client
+
+GREENHOUSE_API_BASE = "https://boards-api.greenhouse.io"
+LEVER_API_BASE = "https://api.lever.co"
+LEVER_EU_API_BASE = "https://api.eu.lever.co"
+ASHBY_API_BASE = "https://api.ashbyhq.com"
+
+_ID_RE = re.compile(r"^[A-Za-z0-9-]+$")
+
+
+def detect_ats(url: str) -> tuple[str, str, str] | None:
+    """Return (source, board_or_company, job_id) for supported ATS posting URLs, else None."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    parts = [p for p in (parsed.path or "").split("/") if p]
+    if host.endswith("greenhouse.io"):
+        if parts[:2] == ["embed", "job_app"]:
+            q = parse_qs(parsed.query)
+            board, job_id = (q.get("for") or [""])[0], (q.get("token") or [""])[0]
+            if board and job_id.isdigit():
+                return "greenhouse", board, job_id
+            return None
+        if len(parts) >= 3 and parts[1] == "jobs" and parts[2].isdigit():
+            return "greenhouse", parts[0], parts[2]
+        return None
+    if host in ("jobs.lever.co", "jobs.eu.lever.co") and len(parts) >= 2 and _ID_RE.match(parts[1]):
+        return "lever", parts[0], parts[1]
+    if host == "jobs.ashbyhq.com" and len(parts) >= 2 and _ID_RE.match(parts[1]):
+        return "ashby", parts[0], parts[1]
+    return None
+
+
+def _get_json(api_url: str, params: dict | None = None):
+    """GET JSON; None on network error, non-200 or invalid JSON (caller falls back to the browser)."""
+    try:
+        resp = get_client().get(api_url, params=params, headers={"Accept": "application/json"})
+    except httpx.HTTPError:
+        return None
+    if resp.status_code != 200:
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        return None
+
+
+def _fetch_greenhouse(board: str, job_id: str) -> dict | None:
+    base = os.environ.get("GREENHOUSE_API_BASE", GREENHOUSE_API_BASE).rstrip("/")
+    api_url = f"{base}/v1/boards/{board}/jobs/{job_id}"
+    data = _get_json(api_url)
+    if not isinstance(data, dict) or not data.get("title"):
+        return None
+    departments = [d.get("name") for d in data.get("departments") or [] if isinstance(d, dict) and d.get("name")]
+    return {
+        "source": "greenhouse",
+        "api_url": api_url,
+        "title": data.get("title"),
+        "company": data.get("company_name"),
+        "location": (data.get("location") or {}).get("name"),
+        "department": ", ".join(departments) or None,
+        "employment_type": None,
+        "posted_at": data.get("first_published") or data.get("updated_at"),
+        # Greenhouse returns the description HTML entity-escaped
+        "description_html": html.unescape(data.get("content") or ""),
+    }
+
+
+def _fetch_lever(host: str, company: str, job_id: str) -> dict | None:
+    default_base = LEVER_EU_API_BASE if host == "jobs.eu.lever.co" else LEVER_API_BASE
+    base = os.environ.get("LEVER_API_BASE", default_base).rstrip("/")
+    api_url = f"{base}/v0/postings/{company}/{job_id}"
+    data = _get_json(api_url)
+    if not isinstance(data, dict) or not data.get("text"):
+        return None
+    categories = data.get("categories") or {}
+    sections = [data.get("description") or ""]
+    for lst in data.get("lists") or []:
+        if isinstance(lst, dict):
+            sections.append(f"<h3>{html.escape(lst.get('text') or '')}</h3><ul>{lst.get('content') or ''}</ul>")
+    sections.append(data.get("additional") or "")
+    created_ms = data.get("createdAt")
+    posted_at = (
+        datetime.fromtimestamp(created_ms / 1000, tz=timezone.utc).isoformat()
+        if isinstance(created_ms, (int, float))
+        else None
+    )
+    return {
+        "source": "lever",
+        "api_url": api_url,
+        "title": data.get("text"),
+        "company": None,  # Lever postings don't carry the company's display name
+        "location": categories.get("location"),
+        "department": categories.get("team") or categories.get("department"),
+        "employment_type": categories.get("commitment"),
+        "posted_at": posted_at,
+        "description_html": "\n".join(s for s in sections if s),
+    }
+
+
+def _fetch_ashby(org: str, job_id: str) -> dict | None:
+    base = os.environ.get("ASHBY_API_BASE", ASHBY_API_BASE).rstrip("/")
+    api_url = f"{base}/posting-api/job-board/{org}"
+    data = _get_json(api_url, params={"includeCompensation": "true"})
+    if not isinstance(data, dict):
+        return None
+    job = next((j for j in data.get("jobs") or [] if isinstance(j, dict) and j.get("id") == job_id), None)
+    if not job or not job.get("title"):
+        return None
+    return {
+        "source": "ashby",
+        "api_url": api_url,
+        "title": job.get("title"),
+        "company": None,  # the job-board payload has no organization display name
+        "location": job.get("location"),
+        "department": job.get("department") or job.get("team"),
+        "employment_type": job.get("employmentType"),
+        "posted_at": job.get("publishedAt"),
+        "description_html": job.get("descriptionHtml") or "",
+    }
+
+
+def fetch_ats_posting(url: str) -> dict | None:
+    """Fetch a supported ATS posting as structured data. None = unsupported URL or API miss (use the browser)."""
+    detected = detect_ats(url)
+    if not detected:
+        return None
+    source, board, job_id = detected
+    if source == "greenhouse":
+        posting = _fetch_greenhouse(board, job_id)
+    elif source == "lever":
+        posting = _fetch_lever((urlparse(url).hostname or "").lower(), board, job_id)
+    else:
+        posting = _fetch_ashby(board, job_id)
+    if posting is not None:
+        posting["url"] = url
+        posting["board"] = board
+        posting["job_id"] = job_id
+    return posting
+
+
+def posting_to_html(posting: dict) -> str:
+    """Render a fetched posting as a small standalone HTML page (saved as raw.html)."""
+    meta = " · ".join(
+        html.escape(str(v)) for v in (posting.get("company"), posting.get("location"), posting.get("employment_type")) if v
+    )
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"></head><body>\n<article class=\"job-post\">\n"
+        f"<h1>{html.escape(posting.get('title') or '')}</h1>\n"
+        + (f"<p>{meta}</p>\n" if meta else "")
+        + f"<div class=\"job-description\">\n{posting.get('description_html') or ''}\n</div>\n</article>\n</body></html>\n"
+    )
@@ -0,0 +1,79 @@
+"""
+Local stand-in for the Greenhouse, Lever and Ashby posting APIs, serving the recorded payloads in
+scripts/fixtures/ats/ so ats_api (fetch, parsing, posting_to_html) can be checked offline:
+
+  GET /v1/boards/<board>/jobs/<id>       -> fixtures/ats/greenhouse/<board>/<id>.json
+  GET /v0/postings/<company>/<id>        -> fixtures/ats/lever/<company>/<id>.json
+  GET /posting-api/job-board/<org>       -> fixtures/ats/ashby/<org>.json
+
+Anything else is a 404, as the real APIs answer for unknown boards / jobs.
+
+  python scripts/ats_api_standin.py [--port 8766]
+  GREENHOUSE_API_BASE=http://127.0.0.1:8766 LEVER_API_BASE=http://127.0.0.1:8766 ASHBY_API_BASE=http://127.0.0.1:8766 archivejob <url>
+
+check_ats_api runs it in-process against fixtures/ats/cases.json.
+
+Used by: check_ats_api.
+"""
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "ats"
+DEFAULT_PORT = 8766
+SEGMENT = r"([A-Za-z0-9_-]+)"
+ROUTES = [
+    (re.compile(rf"^/v1/boards/{SEGMENT}/jobs/{SEGMENT}$"), "greenhouse/{0}/{1}.json"),
+    (re.compile(rf"^/v0/postings/{SEGMENT}/{SEGMENT}$"), "lever/{0}/{1}.json"),
+    (re.compile(rf"^/posting-api/job-board/{SEGMENT}$"), "ashby/{0}.json"),
+]
+
+
+def fixture_for_path(path: str) -> Path | None:
+    """Recorded payload for an API path (query string ignored), or None."""
+    path = path.split("?", 1)[0]
+    for pattern, template in ROUTES:
+        m = pattern.match(path)
+        if m:
+            fixture = FIXTURES_DIR / template.format(*m.groups())
+            return fixture if fixture.is_file() else None
+    return None
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        fixture = fixture_for_path(self.path)
+        body = fixture.read_bytes() if fixture else b'{"error": "not found"}'
+        self.send_response(200 if fixture else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(port: int = 0) -> ThreadingHTTPServer:
+    """Stand-in bound to 127.0.0.1:port (0 = any free port; see server.server_address)."""
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def main():
+    args = sys.argv[1:]
+    port = DEFAULT_PORT
+    if args[:1] == ["--port"] and len(args) == 2:
+        port = int(args[1])
+    elif args:
+        raise SystemExit("Usage: python scripts/ats_api_standin.py [--port N]")
+    server = make_server(port)
+    print(f"🧪 ATS API stand-in on http://127.0.0.1:{port} (payloads from {FIXTURES_DIR})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Local stand-in for the Message Batches endpoint, for checking genbullets / evalskills / popcl --batch-api
+end to end without calling the API. Serves create, retrieve and results for /v1/messages/batches:
+a batch reports "in_progress" until --delay seconds have passed, then "ended" with one succeeded result
+per request.
+
+Replies come from --replies (a JSON file of {custom_id: text}; null makes that request "errored"); any
+other request gets DEFAULT_REPLY, a JSON object that parses as both a bullets draft / validation and a
+skills evaluation (popcl uploads it as the letter text). Requests are logged to stdout.
+
+  python scripts/batch_api_standin.py [--port 8765] [--delay 5] [--replies replies.json]
+  ANTHROPIC_BASE_URL=http://127.0.0.1:8765 BATCH_POLL_INITIAL_S=2 genbullets --batch-api
+
+Set LLM_CACHE=0 for repeated runs, or stand-in answers are replayed from (and stored in) the LLM cache.
+
+Used by: (manual checks of message_batches).
+"""
+import json
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+DEFAULT_DELAY_S = 5.0
+DEFAULT_REPLY = json.dumps({
+    "tailored_bullets": [],
+    "bullets_to_remove": [],
+    "warnings": [],
+    "skills_to_consider_omitting": [],
+    "skills_to_consider_adding": [],
+})
+BATCHES_PATH = "/v1/messages/batches"
+
+_batches: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _batch_object(batch: dict, base_url: str, delay: float) -> dict:
+    ended = time.time() - batch["created"] >= delay
+    n = len(batch["requests"])
+    errored = sum(1 for r in batch["requests"] if r["reply"] is None) if ended else 0
+    return {
+        "id": batch["id"],
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else n,
+            "succeeded": n - errored if ended else 0,
+            "errored": errored,
+            "canceled": 0,
+            "expired": 0,
+        },
+        "created_at": _iso(batch["created"]),
+        "expires_at": _iso(batch["created"] + timedelta(hours=24).total_seconds()),
+        "ended_at": _iso(batch["created"] + delay) if ended else None,
+        "archived_at": None,
+        "cancel_initiated_at": None,
+        "results_url": f"{base_url}{BATCHES_PATH}/{batch['id']}/results" if ended else None,
+    }
+
+
+def _result_line(request: dict) -> dict:
+    params = request["params"]
+    if request["reply"] is None:
+        result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": "stand-in error"}}}
+    else:
+        result = {"type": "succeeded", "message": {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "stand-in"),
+            "content": [{"type": "text", "text": request["reply"]}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(json.dumps(params)) // 4, "output_tokens": len(request["reply"]) // 4},
+        }}
+    return {"custom_id": request["custom_id"], "result": result}
+
+
+def make_handler(replies: dict, delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body, content_type: str = "application/json") -> None:
+            data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _base_url(self) -> str:
+            return f"http://{self.headers.get('Host') or '%s:%s' % self.server.server_address[:2]}"
+
+        def do_POST(self):
+            if self.path.split("?")[0] != BATCHES_PATH:
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+            requests = [
+                {"custom_id": r["custom_id"], "params": r["params"], "reply": replies.get(r["custom_id"], DEFAULT_REPLY)}
+                for r in body.get("requests", [])
+            ]
+            batch = {"id": batch_id, "created": time.time(), "requests": requests}
+            with _lock:
+                _batches[batch_id] = batch
+            print(f"📦 Created {batch_id} with {len(requests)} request(s)")
+            self._send_json(200, _batch_object(batch, self._base_url(), delay))
+
+        def do_GET(self):
+            parts = self.path.split("?")[0][len(BATCHES_PATH):].strip("/").split("/")
+            with _lock:
+                batch = _batches.get(parts[0]) if self.path.startswith(BATCHES_PATH) else None
+            if batch is None:
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+                return
+            if len(parts) == 2 and parts[1] == "results":
+                lines = "".join(json.dumps(_result_line(r)) + "\n" for r in batch["requests"])
+                print(f"📄 Results for {batch['id']}")
+                self._send_json(200, lines.encode("utf-8"), "application/binary")
+                return
+            self._send_json(200, _batch_object(batch, self._base_url(), delay))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    args = sys.argv[1:]
+    port, delay, replies = DEFAULT_PORT, DEFAULT_DELAY_S, {}
+    i = 0
+    while i < len(args):
+        if args[i] == "--port" and i + 1 < len(args):
+            port = int(args[i + 1])
+        elif args[i] == "--delay" and i + 1 < len(args):
+            delay = float(args[i + 1])
+        elif args[i] == "--replies" and i + 1 < len(args):
+            with open(args[i + 1], encoding="utf-8") as f:
+                replies = json.load(f)
+        else:
+            raise SystemExit("Usage: python scripts/batch_api_standin.py [--port N] [--delay SECONDS] [--replies FILE.json]")
+        i += 2
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(replies, delay))
+    print(f"🧪 Message Batches stand-in on http://127.0.0.1:{port} (batches end after {delay:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,18 @@ Does not run metadata or fit score.
 Alias: archivejobs
 """
 import os
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
 import gspread
 from dotenv import load_dotenv
 
-ARCHIVE_SCRIPT = Path(__file__).resolve().parent / "archive_job_agent.py"
+from company_store import find_job_dir
+from concurrent_archive import archive_in_order
+from render_pdfs import start_background_render
+from sheet_writer import SheetWriter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = Path("data")
 
 # Header name for the "date applied" column (used for folder name under data/company/)
@@ -23,10 +27,6 @@ DATE_APPLIED_HEADER = "date applied"
 JOB_DIR_HEADERS = ("job_dir", "archive_path", "archive path")
 
 
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
-
-
 def parse_date_applied(raw: str) -> str | None:
     """Parse date applied from sheet into YYYY-MM-DD, or return None if missing/invalid."""
     raw = (raw or "").strip()
@@ -88,6 +88,7 @@ def main():
 
     rows = ws.get_all_values()[1:]  # skip header
 
+    pending = []  # (sheet row, url, date applied)
     for idx, row in enumerate(rows, start=2):  # sheet row numbers
         archived_at = (row[archived_at_col - 1] or "").strip()
         url = (row[url_col - 1] or "").strip()
@@ -100,39 +101,40 @@ def main():
         if not date_applied_iso:
             print(f"\n⏭️ Skipping row {idx}: no valid '{DATE_APPLIED_HEADER}' (got: {date_applied_raw!r})")
             continue
-
-        print(f"\n⬇️ Populating row {idx}: (inferring company + role title) | {url} | {date_applied_iso}")
-        result = subprocess.run(
-            ["python", str(ARCHIVE_SCRIPT), url, date_applied_iso],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).resolve().parent.parent,
-            check=False,
-        )
-        if result.returncode != 0:
-            print(f"  ⚠️ Archive failed: {result.stderr or result.stdout}")
-            continue
-
-        inferred_company = None
-        inferred_role_title = None
-        for line in (result.stdout or "").splitlines():
-            line = line.strip()
-            if line.upper().startswith("COMPANY:"):
-                inferred_company = line.split(":", 1)[1].strip()
-            elif line.upper().startswith("ROLE_TITLE:"):
-                inferred_role_title = line.split(":", 1)[1].strip()
-
-        if company_col and inferred_company:
-            ws.update_cell(idx, company_col, inferred_company)
-        if role_title_col and inferred_role_title:
-            ws.update_cell(idx, role_title_col, inferred_role_title)
-
-        if job_dir_col and inferred_company:
-            archive_path = str(DATA_DIR / slugify(inferred_company) / date_applied_iso)
-            ws.update_cell(idx, job_dir_col, archive_path)
-
-        ws.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
-
+        pending.append((idx, url, date_applied_iso))
+
+    print(f"\n⬇️ Archiving {len(pending)} row(s) (inferring company + role title)…")
+    jobs = [(url, date_applied_iso) for _, url, date_applied_iso in pending]
+    results = archive_in_order(jobs, data_dir=PROJECT_ROOT / DATA_DIR)
+
+    archived_dirs = []
+    with SheetWriter(ws) as writer:
+        for (idx, url, date_applied_iso), (_, result, error) in zip(pending, results):
+            print(f"\n⬇️ Populating row {idx}: {url} | {date_applied_iso}")
+            if error is not None:
+                print(f"  ⚠️ Archive failed: {error}")
+                continue
+            if result is None:
+                print(f"  ⚠️ Row {idx} skipped: posting not found.")
+                continue
+
+            archived_dirs.append(result["out_dir"])
+            inferred_company = result["company"]
+            inferred_role_title = result["role_title"]
+
+            if company_col and inferred_company:
+                writer.update_cell(idx, company_col, inferred_company)
+            if role_title_col and inferred_role_title:
+                writer.update_cell(idx, role_title_col, inferred_role_title)
+
+            if job_dir_col and inferred_company:
+                archive_path = str(find_job_dir(inferred_company, date_applied_iso))
+                writer.update_cell(idx, job_dir_col, archive_path)
+
+            writer.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
+            writer.end_row()
+
+    start_background_render(archived_dirs)
     print("\nDone\n")
 
 if __name__ == "__main__":
@@ -2,7 +2,11 @@
 Generate skills_recommendations.json for job folders for a given day (default today) from the
 tracker sheet. Overwrites existing file in each folder.
 
-Alias: evalskills [today|YYYY-MM-DD]
+--batch-api: submits every evaluation for the day as one Message Batches job (message_batches) and writes
+each folder's skills_recommendations.json when it ends. Half the cost per token; failed jobs are listed
+for a single-job re-run.
+
+Alias: evalskills [today|YYYY-MM-DD] [--batch-api]
 """
 import os
 import subprocess
@@ -13,6 +17,10 @@ from pathlib import Path
 import gspread
 from dotenv import load_dotenv
 
+from company_store import find_job_dir
+from llm_cache import forget
+from message_batches import reply_text, run_batch
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 EVAL_SKILLS_SCRIPT = SCRIPT_DIR / "evaluate_resume_skills_agent.py"
 DATA_DIR = Path("data")
@@ -22,10 +30,6 @@ APPLIED_VIA_HEADER = "applied via"
 APPLIED_VIA_NOT_APPLIED = "NOT APPLIED YET"
 
 
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
-
-
 def parse_date_applied(raw: str) -> str | None:
     raw = (raw or "").strip()
     if not raw:
@@ -61,16 +65,48 @@ def is_job_dir_path(arg: str) -> bool:
     return p.is_dir() and (p / "job.txt").exists()
 
 
+def run_with_batch_api(target_dirs: list[Path], day: str) -> int:
+    """Evaluate skills for target_dirs with one Message Batches job; returns the number written."""
+    from anthropic import Anthropic
+
+    from evaluate_resume_skills_agent import finish_skills, skills_request, write_skills
+    from job_text import read_job_text
+    from resume_loader import get_resume_text
+
+    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    resume_text = get_resume_text()
+    dirs = {f"job{i}": job_dir for i, job_dir in enumerate(target_dirs)}
+
+    print(f"📋 Skills: {len(dirs)} job(s)")
+    wrote = 0
+    requests = {custom_id: skills_request(read_job_text(job_dir), resume_text) for custom_id, job_dir in dirs.items()}
+    results = run_batch(client, f"evalskills-{day}", requests)
+    for custom_id, result in results.items():
+        try:
+            data = finish_skills(reply_text(result))
+        except ValueError as e:
+            forget(requests[custom_id])
+            print(f"  ⚠️ {dirs[custom_id]}: {e} — re-run with: evalskills {dirs[custom_id]}")
+            continue
+        write_skills(dirs[custom_id], data)
+        print(f"  📋 Skills: {dirs[custom_id].relative_to(DATA_DIR)}")
+        wrote += 1
+    return wrote
+
+
 def main():
-    if len(sys.argv) == 2 and is_job_dir_path(sys.argv[1]):
-        job_dir = Path(sys.argv[1]).resolve()
+    args = [a for a in sys.argv[1:] if a != "--batch-api"]
+    batch_api = len(args) < len(sys.argv) - 1
+
+    if len(args) == 1 and is_job_dir_path(args[0]):
+        job_dir = Path(args[0]).resolve()
         print(f"📋 Skills (single): {job_dir}")
         subprocess.run(["python", str(EVAL_SKILLS_SCRIPT), str(job_dir)], check=True)
         return
 
     day = date.today().isoformat()
-    if len(sys.argv) == 2:
-        arg = sys.argv[1].strip().lower()
+    if len(args) == 1:
+        arg = args[0].strip().lower()
         if arg == "today":
             day = date.today().isoformat()
         else:
@@ -107,11 +143,16 @@ def main():
             if applied_via != APPLIED_VIA_NOT_APPLIED:
                 print(f"  ⏭️ Skipping row {idx}: {company} / {date_iso} (APPLIED VIA = {applied_via!r})")
                 continue
-        job_dir = DATA_DIR / slugify(company) / date_iso
+        job_dir = find_job_dir(company, date_iso)
         if not (job_dir / "job.txt").exists():
             continue
         target_dirs.append(job_dir)
 
+    if batch_api:
+        wrote = run_with_batch_api(target_dirs, day) if target_dirs else 0
+        print(f"\n✅ Done. wrote={wrote}\n")
+        return
+
     wrote = 0
     for job_dir in target_dirs:
         print(f"📋 Skills: {job_dir.relative_to(DATA_DIR)}")
@@ -7,31 +7,44 @@ Fill or overwrite metadata:
 - role focus -  ❌ defaulting incorrectly to full-stack most of the time
 - role level - ❌ defaulting incorrectly to mid
 
+Usage:
+  batchmetadata [company]                     interactive (prompts when several LinkedIn companies match)
+  batchmetadata --unattended [--overwrite]    never prompts: ambiguous companies are queued in
+                                              data/_cache/linkedin_pending.json and their rows skipped
+  batchmetadata --resolve                     pick a LinkedIn company for each queued one, then process their rows
+  batchmetadata --resume                      process rows whose queued company was resolved elsewhere (UI)
+  batchmetadata --reparse [--save]            re-run the LinkedIn parser over saved pages (data/_cache/raw/), offline;
+                                              --save writes changed employee counts / industries to the company store
+
+LinkedIn profiles are settled for every row first (prompts happen up front); research + LLM calls then run for
+up to METADATA_CONCURRENCY rows at once (default 4), with one research pass per company, and sheet rows are
+written in order.
+
 Alias: batchmetadata
 """
-import contextlib
-import io
 import json
 import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-
-@contextlib.contextmanager
-def _suppress_ddgs_stderr():
-    """Temporarily suppress stderr to hide ddgs 'Impersonate ... does not exist' messages."""
-    stderr, sys.stderr = sys.stderr, io.StringIO()
-    try:
-        yield
-    finally:
-        sys.stderr = stderr
-
 import gspread
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from company_store import companies_with_fact, find_job_dir, get_facts, register, set_facts
+from job_text import read_job_text
+from linkedin_parser import parse_company_page
+from llm_cache import cache_summary, cached_create, forget
+import raw_cache
+from request_blocking import install_request_blocking
+from sheet_writer import SheetWriter
+from web_search import ddg_text, ddg_text_many, search_summary
+
 DATA_DIR = Path("data")
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
@@ -64,6 +77,10 @@ COMPANY_SIZE_BUCKETS = ["<50", "50-200", "200-1000", "1000+", "10,000+", "UNKNOW
 ROLE_FOCUS_OPTIONS = ["FRONTEND", "BACKEND", "FULL-STACK", "EMBEDDED", "ML"]
 ROLE_LEVEL_OPTIONS = ["JUNIOR", "MID", "SENIOR", "STAFF", "PRINCIPAL"]
 MAX_SEARCH_CHARS = 3500
+LINKEDIN_COMPANY_QUERY_RESULTS = 8
+# Early-stop signals for _search_company_info
+HEADCOUNT_SNIPPET_RE = re.compile(r"\d[\d,.]*\s*[Kk]?\+?\s*(?:[-–]\s*\d[\d,.]*\s*[Kk]?\+?)?\s+employees", re.I)
+MIN_DESCRIPTION_SNIPPET_CHARS = 120
 
 COMPANY_TYPE_RUBRIC = """
 Company type: decide from business model and job/search wording first. Employee count alone must NOT determine company_type. When employee_count is null you must still assign a type using job posting and search text — do not use unknown just because headcount is missing.
@@ -116,170 +133,131 @@ def _company_display_name_from_slug(slug: str) -> str:
     return slug.replace("-", " ").title()
 
 
+# Selectors that mean the LinkedIn company page has rendered its stats (top card) or About section
+LINKEDIN_READY_SELECTOR = (
+    "div.org-top-card-summary-info-list, section.org-top-card, [data-test-id='org-top-card'], "
+    ".org-top-card-summary, [data-test-id='about-us__size']"
+)
+DEFAULT_LINKEDIN_READY_MAX_MS = 8000
+
+
+class LinkedInFetcher:
+    """One Chromium + browser context reused for every LinkedIn company page in a run, so a batch pays
+    the browser startup once. Playwright's sync API is bound to the thread that started it, so all
+    browser work runs on a dedicated single-thread executor and fetch_page() is safe to call from any thread."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="linkedin-browser")
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self.pages_fetched = 0
+
+    def _ensure_context(self):
+        if self._context is None or self._browser is None or not self._browser.is_connected():
+            from playwright.sync_api import sync_playwright
+
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch()
+            self._context = self._browser.new_context()
+            install_request_blocking(self._context)
+        return self._context
+
+    def _fetch_page(self, canonical: str) -> tuple[str | None, str]:
+        page = self._ensure_context().new_page()
+        try:
+            page.goto(canonical, wait_until="domcontentloaded", timeout=15000)
+            try:
+                max_ms = int(os.environ.get("LINKEDIN_READY_MAX_MS", DEFAULT_LINKEDIN_READY_MAX_MS))
+                page.wait_for_selector(LINKEDIN_READY_SELECTOR, timeout=max_ms)
+            except Exception:
+                pass  # authwall or layout change: parse whatever rendered
+            # Use only the stats block that contains "X followers" and "1K-5K employees" (org-top-card-summary-info-list) so we never use "Discover all 110 employees" (members count)
+            header_text = None
+            for selector in [
+                "div.org-top-card-summary-info-list",
+                "section.org-top-card",
+                "[data-test-id='org-top-card']",
+                ".org-top-card-summary",
+            ]:
+                try:
+                    loc = page.locator(selector)
+                    if loc.count() > 0:
+                        header_text = loc.first.inner_text()
+                        if header_text and ("followers" in header_text or "employees" in header_text):
+                            break
+                except Exception:
+                    continue
+            if not header_text or "followers" not in header_text:
+                try:
+                    el = page.get_by_text("followers", exact=False)
+                    if el.count() > 0:
+                        header_text = el.first.evaluate("node => node.closest('div.org-top-card-summary-info-list')?.innerText || node.closest('section')?.innerText || node.closest('div[class]')?.innerText || node.innerText || ''")
+                except Exception:
+                    pass
+            self.pages_fetched += 1
+            return header_text, page.content()
+        finally:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def fetch_page(self, canonical: str) -> tuple[str | None, str]:
+        """Load a LinkedIn company page; returns (top-card stats text or None, page HTML). Raises on navigation failure."""
+        return self._executor.submit(self._fetch_page, canonical).result()
+
+    def _close(self) -> None:
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            self._playwright.stop()
+        self._context = self._browser = self._playwright = None
+
+    def close(self) -> None:
+        self._executor.submit(self._close).result()
+        self._executor.shutdown()
+
+
+_linkedin_fetcher: LinkedInFetcher | None = None
+_linkedin_fetcher_lock = threading.Lock()
+
+
+def _get_linkedin_fetcher() -> LinkedInFetcher:
+    global _linkedin_fetcher
+    with _linkedin_fetcher_lock:
+        if _linkedin_fetcher is None:
+            _linkedin_fetcher = LinkedInFetcher()
+        return _linkedin_fetcher
+
+
+def close_linkedin_fetcher() -> None:
+    """Shut down the shared LinkedIn browser, if one was started. Call once at the end of a run."""
+    global _linkedin_fetcher
+    with _linkedin_fetcher_lock:
+        fetcher, _linkedin_fetcher = _linkedin_fetcher, None
+    if fetcher is not None:
+        fetcher.close()
+
+
 def _fetch_linkedin_company_data_via_playwright(linkedin_url: str) -> dict | None:
-    """Open LinkedIn company page with Playwright and parse visible text for employee count and industry. Return None on failure."""
+    """Open LinkedIn company page in the shared browser and parse visible text for employee count and industry. Return None on failure.
+    The fetched page is saved to the raw cache (kind "linkedin") so `--reparse` can re-run the parser without LinkedIn."""
     canonical = _normalize_linkedin_company_url(linkedin_url)
     if not canonical:
         return None
     try:
-        from bs4 import BeautifulSoup
-        from playwright.sync_api import sync_playwright
+        import playwright.sync_api  # noqa: F401
     except ImportError:
         return None
-    employee_count = None
-    industry = None
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            try:
-                page = browser.new_page()
-                page.goto(canonical, wait_until="domcontentloaded", timeout=15000)
-                page.wait_for_timeout(2000)
-                # Use only the stats block that contains "X followers" and "1K-5K employees" (org-top-card-summary-info-list) so we never use "Discover all 110 employees" (members count)
-                header_text = None
-                for selector in [
-                    "div.org-top-card-summary-info-list",
-                    "section.org-top-card",
-                    "[data-test-id='org-top-card']",
-                    ".org-top-card-summary",
-                ]:
-                    try:
-                        loc = page.locator(selector)
-                        if loc.count() > 0:
-                            header_text = loc.first.inner_text()
-                            if header_text and ("followers" in header_text or "employees" in header_text):
-                                break
-                    except Exception:
-                        continue
-                if not header_text or "followers" not in header_text:
-                    try:
-                        el = page.get_by_text("followers", exact=False)
-                        if el.count() > 0:
-                            header_text = el.first.evaluate("node => node.closest('div.org-top-card-summary-info-list')?.innerText || node.closest('section')?.innerText || node.closest('div[class]')?.innerText || node.innerText || ''")
-                    except Exception:
-                        pass
-                html = page.content()
-            finally:
-                browser.close()
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup(["script", "style", "noscript"]):
-            tag.decompose()
-        text = " ".join(soup.get_text(separator=" ").split())
-        import re
-
-        # About section (logged-out view): "Company size" / "1,001-5,000 employees" in [data-test-id="about-us__size"] — avoid face-pile "Discover all 110 employees"
-        about_size_el = soup.find(attrs={"data-test-id": "about-us__size"})
-        about_size_text = " ".join(about_size_el.get_text(separator=" ").split()) if about_size_el else None
-        about_industry_el = soup.find(attrs={"data-test-id": "about-us__industry"})
-        about_industry_text = " ".join(about_industry_el.get_text(separator=" ").split()).strip() if about_industry_el else None
-
-        stats_text = (" ".join(header_text.split())) if header_text else None
-
-        def _parse_employee_count(s: str) -> int | None:
-            # "1K-5K employees" or "1K - 5K employees" (hyphen, en-dash, or unicode minus)
-            m = re.search(r"(\d+)[Kk]\s*[-–−―]\s*(\d+)[Kk]?\s+employees?", s, re.I)
-            if m:
-                try:
-                    return int(m.group(1)) * 1000
-                except ValueError:
-                    pass
-            m = re.search(r"(\d+)[Kk]\s+employees?", s, re.I)
-            if m:
-                try:
-                    return int(m.group(1)) * 1000
-                except ValueError:
-                    pass
-            # "1,001-5,000 employees" or "10,001+ employees" (About section for large companies)
-            m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*[-–]?\s*(\d{1,3}(?:,\d{3})*)?\s*\+?\s+employees?", s, re.I)
-            if m:
-                try:
-                    return int(m.group(1).replace(",", ""))
-                except ValueError:
-                    pass
-            m = re.search(r"(\d{1,3}(?:,\d{3})*)\s+employees?\s+on\s+LinkedIn", s, re.I)
-            if m:
-                try:
-                    return int(m.group(1).replace(",", ""))
-                except ValueError:
-                    pass
-            return None
-
-        def _parse_employee_count_excluding_discover_all(full_text: str) -> int | None:
-            """Parse employee count from full page text but ignore face-pile 'Discover all N employees' (LinkedIn members count)."""
-            # Prefer range formats (1K-5K, 1,001-5,000) and "XK employees" — they don't appear in the face-pile
-            m = re.search(r"(\d+)[Kk]\s*[-–−―]\s*(\d+)[Kk]?\s+employees?", full_text, re.I)
-            if m:
-                try:
-                    return int(m.group(1)) * 1000
-                except ValueError:
-                    pass
-            m = re.search(r"(\d+)[Kk]\s+employees?", full_text, re.I)
-            if m:
-                try:
-                    return int(m.group(1)) * 1000
-                except ValueError:
-                    pass
-            m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*[-–]\s*(\d{1,3}(?:,\d{3})*)\s+employees?", full_text, re.I)
-            if m:
-                try:
-                    return int(m.group(1).replace(",", ""))
-                except ValueError:
-                    pass
-            # "10,001+ employees" (About section for large companies like Costco)
-            m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*\+\s+employees?", full_text, re.I)
-            if m:
-                try:
-                    return int(m.group(1).replace(",", ""))
-                except ValueError:
-                    pass
-            # Bare number + "employees": only accept if not from "Discover all N employees" (face-pile)
-            discover_all_re = re.compile(r"discover\s+all", re.I)
-            def is_face_pile_match(full_text: str, m: re.Match) -> bool:
-                start = max(0, m.start() - 50)
-                return discover_all_re.search(full_text[start : m.start()]) is not None
-
-            for m in re.finditer(r"(\d{1,3}(?:,\d{3})*)\s+employees?", full_text, re.I):
-                if is_face_pile_match(full_text, m):
-                    continue
-                try:
-                    n = int(m.group(1).replace(",", ""))
-                    if n < 500 and discover_all_re.search(full_text[max(0, m.start() - 20) : m.end() + 15]):
-                        continue  # small number and "discover all" nearby → face-pile
-                    return n
-                except ValueError:
-                    continue
-            for m in re.finditer(r"(\d{1,3}(?:,\d{3})*)\s+employees?\s+on\s+LinkedIn", full_text, re.I):
-                if is_face_pile_match(full_text, m):
-                    continue
-                try:
-                    n = int(m.group(1).replace(",", ""))
-                    if n < 500 and discover_all_re.search(full_text[max(0, m.start() - 20) : m.end() + 15]):
-                        continue
-                    return n
-                except ValueError:
-                    continue
-            return None
-
-        # 1) About section (logged-out): "Company size" / "1,001-5,000 employees" — correct source
-        # 2) Top card (logged-in): "X followers · 1K-5K employees"
-        # 3) Full page, excluding face-pile "Discover all N employees"
-        employee_count = _parse_employee_count(about_size_text) if about_size_text else None
-        if employee_count is None and stats_text:
-            employee_count = _parse_employee_count(stats_text)
-        if employee_count is None:
-            employee_count = _parse_employee_count_excluding_discover_all(text)
-        # Industry: prefer About section (logged-out data-test-id="about-us__industry"), then full-page label
-        if about_industry_text:
-            industry = about_industry_text
-        if not industry:
-            m = re.search(r"Industry\s*[:\s]+([^\n|]+?)(?:\n|\\n|$|\|)", text)
-            if m:
-                industry = m.group(1).strip()
-        if not industry:
-            m = re.search(r"industr[yies]?\s*[:\s]+([^\n|]+?)(?:\n|$|\|)", text, re.I)
-            if m:
-                industry = m.group(1).strip()
-        return {"employee_count": employee_count, "industry": industry}
+        header_text, html = _get_linkedin_fetcher().fetch_page(canonical)
+        raw_cache.put("linkedin", canonical, html, {"header_text": header_text})
+        return parse_company_page(header_text, html)
     except Exception:
         return None
 
@@ -292,6 +270,49 @@ def _fetch_linkedin_company_data(linkedin_url: str) -> dict:
     return {"employee_count": result.get("employee_count"), "industry": result.get("industry")}
 
 
+def _linkedin_facts(linkedin_url: str, profile: dict) -> dict:
+    """Company-store facts for a parsed LinkedIn profile. Kept under their own keys, apart from the employee_count /
+    company_type that batchmetadata records from LLM and search estimates."""
+    return {
+        "linkedin_profile_url": linkedin_url,
+        "linkedin_employee_count": profile.get("employee_count"),
+        "linkedin_industry": profile.get("industry"),
+    }
+
+
+def reparse_cached_linkedin_pages(save: bool = False) -> None:
+    """Re-run linkedin_parser.parse_company_page and the industry mapping over every LinkedIn page in the raw cache
+    (no network), and show where the result differs from the company store. save=True writes the new values back."""
+    pages = raw_cache.latest("linkedin")
+    if not pages:
+        print("No saved LinkedIn pages yet (they are saved as batchmetadata fetches them).")
+        return
+    started = time.perf_counter()
+    parsed_n = changed = 0
+    for url, entry in sorted(pages.items()):
+        html = raw_cache.get(entry["sha256"])
+        if html is None:
+            continue
+        parsed = parse_company_page(entry["meta"].get("header_text"), html)
+        parsed_n += 1
+        bucket = _derive_size_bucket_from_employee_count(parsed["employee_count"]) or "UNKNOWN"
+        company_type = _company_type_from_linkedin_industry(parsed["industry"]) or "-"
+        slugs = companies_with_fact("linkedin_profile_url", url)
+        before = get_facts(slugs[0], max_age_days=float("inf")) if slugs else {}
+        was = (before.get("linkedin_employee_count"), before.get("linkedin_industry"))
+        differs = bool(slugs) and was != (parsed["employee_count"], parsed["industry"])
+        changed += differs
+        print(f"{'≠' if differs else ' '} {url}  ({entry['fetched_at']})")
+        print(f"    employees={parsed['employee_count']} ({bucket})  industry={parsed['industry']!r} → {company_type}"
+              + (f"  [was {was[0]}, {was[1]!r}]" if differs else ""))
+        if save and differs:
+            for slug in slugs:
+                set_facts(slug, _linkedin_facts(url, parsed), source="reparse")
+    elapsed = time.perf_counter() - started
+    hint = " (saved to the company store)" if save else (" (run with --save to update the company store)" if changed else "")
+    print(f"\n🔁 Re-parsed {parsed_n} LinkedIn page(s) in {elapsed:.2f}s; {changed} differ from the company store{hint}\n")
+
+
 def _company_type_from_linkedin_industry(industry: str | None) -> str | None:
     """Map LinkedIn industry string to our company_type. Returns None if no confident match."""
     if not (industry or "").strip():
@@ -326,20 +347,18 @@ def _normalize_linkedin_company_url(href: str) -> str | None:
     return None
 
 
+def _linkedin_company_query(company_name: str) -> str:
+    return f'site:linkedin.com/company "{company_name}"'
+
+
 def _search_linkedin_company_urls(company_name: str) -> list[dict]:
     """Return list of {title, href} for LinkedIn company pages (unique canonical URLs)."""
     if not (company_name or "").strip():
         return []
-    try:
-        from ddgs import DDGS
-    except ImportError:
-        return []
     seen: set[str] = set()
     out: list[dict] = []
     try:
-        with _suppress_ddgs_stderr():
-            ddgs = DDGS()
-            results = ddgs.text(f'site:linkedin.com/company "{company_name}"', max_results=8)
+        results = ddg_text(_linkedin_company_query(company_name), max_results=LINKEDIN_COMPANY_QUERY_RESULTS)
         for r in results:
             if not isinstance(r, dict):
                 continue
@@ -363,67 +382,59 @@ def _search_company_info_from_linkedin_url(linkedin_url: str) -> str:
     slug = canonical.rstrip("/").split("/company/")[-1].split("?")[0]
     if not slug:
         return ""
-    try:
-        from ddgs import DDGS
-    except ImportError:
-        return ""
+    queries = [f'site:linkedin.com/company/{slug}', f'"{slug}" linkedin company employees']
+    answers = ddg_text_many([(q, 4) for q in queries])
+    return _combine_snippets(answers)
+
+
+def _combine_snippets(answers: dict[str, list[dict]], per_query: int = 4) -> str:
+    """Join "[title] body" lines from search answers (in query order), capped at MAX_SEARCH_CHARS."""
     snippets = []
-    for q in [f'site:linkedin.com/company/{slug}', f'"{slug}" linkedin company employees']:
-        try:
-            with _suppress_ddgs_stderr():
-                ddgs = DDGS()
-                results = ddgs.text(q, max_results=4)
-            for r in results:
-                if isinstance(r, dict):
-                    body = (r.get("body") or r.get("snippet") or "").strip()
-                    title = (r.get("title") or "").strip()
-                    if body:
-                        snippets.append(f"[{title}] {body}")
-        except Exception:
-            continue
+    for results in answers.values():
+        for r in results[:per_query]:
+            body = (r.get("body") or "").strip()
+            if body:
+                snippets.append(f"[{(r.get('title') or '').strip()}] {body}")
     combined = "\n".join(snippets).strip()
     return combined[:MAX_SEARCH_CHARS] if combined else ""
 
 
+def _has_company_signals(answers: dict[str, list[dict]]) -> bool:
+    """True once the answers hold a LinkedIn snippet with a headcount and a company description, which is
+    all the extraction prompt needs; the remaining searches are then skipped."""
+    results = [r for rs in answers.values() for r in rs]
+    has_headcount = any(
+        "linkedin.com/company" in (r.get("href") or "") and HEADCOUNT_SNIPPET_RE.search(r.get("body") or "")
+        for r in results
+    )
+    has_description = any(
+        "linkedin.com" not in (r.get("href") or "") and len((r.get("body") or "").strip()) >= MIN_DESCRIPTION_SNIPPET_CHARS
+        for r in results
+    )
+    return has_headcount and has_description
+
+
 def _search_company_info(company_name: str) -> str:
-    """Run web search for company size, type, funding, and description; return combined snippets or empty string on failure."""
+    """Run web search for company size, type, funding, and description; return combined snippets or empty string on failure.
+    Queries run concurrently and stop early once a LinkedIn headcount and a description have been found."""
     if not (company_name or "").strip():
         return ""
-    try:
-        from ddgs import DDGS
-    except ImportError:
-        return ""
-    snippets = []
     queries = [
-        f'site:linkedin.com/company "{company_name}"',
-        f'site:linkedin.com/company "{company_name}" employees',
-        f'"{company_name}" company description',
-        f'"{company_name}" about us what we do',
-        f'"{company_name}" employee count headcount',
-        f'"{company_name}" funding series startup',
-        f'"{company_name}" consulting agency services',
+        # The LinkedIn query is also run by _search_linkedin_company_urls; ask for the same count so
+        # one cached answer serves both (only four snippets are used here).
+        (_linkedin_company_query(company_name), LINKEDIN_COMPANY_QUERY_RESULTS),
+        (f'site:linkedin.com/company "{company_name}" employees', 4),
+        (f'"{company_name}" company description', 4),
+        (f'"{company_name}" about us what we do', 4),
+        (f'"{company_name}" employee count headcount', 4),
+        (f'"{company_name}" funding series startup', 4),
+        (f'"{company_name}" consulting agency services', 4),
     ]
     try:
-        with _suppress_ddgs_stderr():
-            ddgs = DDGS()
-        for q in queries:
-            try:
-                with _suppress_ddgs_stderr():
-                    results = ddgs.text(q, max_results=4)
-                for r in results:
-                    if isinstance(r, dict):
-                        body = (r.get("body") or r.get("snippet") or "").strip()
-                        title = (r.get("title") or "").strip()
-                        if body:
-                            snippets.append(f"[{title}] {body}")
-                    elif hasattr(r, "body"):
-                        snippets.append(getattr(r, "body", ""))
-            except Exception:
-                continue
+        answers = ddg_text_many(queries, stop_when=_has_company_signals)
     except Exception:
         return ""
-    combined = "\n".join(snippets).strip()
-    return combined[:MAX_SEARCH_CHARS] if combined else ""
+    return _combine_snippets(answers)
 
 
 def _pick_predicted_linkedin_url(linkedin_urls: list[dict], company_name: str) -> str:
@@ -442,25 +453,383 @@ def _pick_predicted_linkedin_url(linkedin_urls: list[dict], company_name: str) -
     return best
 
 
-def extract_metadata_for_job_dir(job_dir: Path, override_linkedin_url: str | None = None) -> tuple[dict, dict, str | None]:
-    """Extract role_title, company_type, company_size_bucket, role_focus, role_level from job_dir/job.txt. Uses optional web search for company size.
-    When override_linkedin_url is set, search is limited to that LinkedIn company page. When multiple LinkedIn candidates exist, prompts user to confirm or correct.
+# Chosen LinkedIn company pages live in the company store (fact "linkedin_url"), so an ambiguous company is asked
+# about once, not once per row. This JSON file held them before the store existed and is still read as a fallback.
+LINKEDIN_CHOICES_FILE = PROJECT_ROOT / "data" / "_cache" / "linkedin_choices.json"
+_linkedin_choices_lock = threading.Lock()
+LINKEDIN_PICKER_INITIAL_SHOW = 4
+
+
+def _load_linkedin_choices() -> dict:
+    try:
+        return json.loads(LINKEDIN_CHOICES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def get_linkedin_choice(company_slug: str) -> str | None:
+    """Previously chosen LinkedIn company URL for this company slug, if any (user choices don't expire)."""
+    url = get_facts(company_slug, max_age_days=float("inf")).get("linkedin_url")
+    if url:
+        return url
+    with _linkedin_choices_lock:
+        entry = _load_linkedin_choices().get(company_slug)
+    return (entry or {}).get("url") or None
+
+
+def save_linkedin_choice(company_slug: str, linkedin_url: str) -> None:
+    set_facts(company_slug, {"linkedin_url": linkedin_url}, source="user")
+
+
+def _prompt_linkedin_choice(linkedin_urls: list[dict]) -> str:
+    """Let the user pick one of several LinkedIn company candidates (number, M for more, or a pasted URL)."""
+    n_total = len(linkedin_urls)
+    show_count = min(LINKEDIN_PICKER_INITIAL_SHOW, n_total)
+    print(f"    ✋ Multiple LinkedIn companies found ({n_total}):")
+    for i, c in enumerate(linkedin_urls[:show_count], 1):
+        print(f"       {i}. {c['title']}")
+        print(f"          {c['href']}")
+    while True:
+        if show_count >= n_total:
+            prompt = f"     Select company (1-{n_total}), or paste a LinkedIn company URL: "
+        else:
+            prompt = f"     Select company (1-{show_count}), M for more, or paste a LinkedIn company URL: "
+        choice = input(prompt).strip()
+        if "linkedin.com/company" in choice.lower():
+            canonical = _normalize_linkedin_company_url(choice)
+            if canonical:
+                return canonical
+            print("     That doesn't look like a valid LinkedIn company URL. Try again.")
+            continue
+        if choice.upper() == "M" and show_count < n_total:
+            for i, c in enumerate(linkedin_urls[show_count:], start=show_count + 1):
+                print(f"       {i}. {c['title']}")
+                print(f"          {c['href']}")
+            show_count = n_total
+            continue
+        try:
+            num = int(choice)
+            if 1 <= num <= n_total:
+                return linkedin_urls[num - 1]["href"]
+        except ValueError:
+            pass
+        print(f"     Enter a number 1-{show_count}" + (f", M for more" if show_count < n_total else "") + ", or paste a LinkedIn company URL.")
+
+
+def linkedin_candidates_needing_choice(company_slug: str, override_linkedin_url: str | None = None) -> list[dict]:
+    """LinkedIn candidates the user must choose between for this company, or [] when the profile is already
+    decided (row override, cached choice) or unambiguous (fewer than two search hits)."""
+    if override_linkedin_url or get_linkedin_choice(company_slug):
+        return []
+    # Companies already searched and found unambiguous aren't searched again until the fact expires
+    if get_facts(company_slug).get("linkedin_candidates", 2) < 2:
+        return []
+    company_display = _company_display_name_from_slug(company_slug)
+    linkedin_urls = _search_linkedin_company_urls(company_display) if company_display else []
+    if len(linkedin_urls) < 2:
+        set_facts(company_slug, {"linkedin_candidates": len(linkedin_urls)}, source="search")
+        return []
+    return linkedin_urls
+
+
+def resolve_linkedin_profile(company_slug: str, override_linkedin_url: str | None = None) -> str | None:
+    """Decide which LinkedIn company page (if any) describes this company, before any extraction work:
+    the row's saved URL, else the choice cached for this company slug, else ask the user when the
+    search finds two or more candidates (the answer is cached for the slug). None = no profile; use search."""
+    if override_linkedin_url:
+        return _normalize_linkedin_company_url(override_linkedin_url) or override_linkedin_url
+    candidates = linkedin_candidates_needing_choice(company_slug)
+    if not candidates:
+        return get_linkedin_choice(company_slug)
+    chosen = _prompt_linkedin_choice(candidates)
+    save_linkedin_choice(company_slug, chosen)
+    return chosen
+
+
+# ---- Deferred disambiguation (--unattended / --resolve / --resume) ----
+# Ambiguous companies found by an unattended run: {slug: {company, candidates, job_dirs, queued_at, chosen?}}
+LINKEDIN_PENDING_FILE = PROJECT_ROOT / "data" / "_cache" / "linkedin_pending.json"
+
+
+def load_pending_choices() -> dict:
+    try:
+        return json.loads(LINKEDIN_PENDING_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pending_choices(pending: dict) -> None:
+    LINKEDIN_PENDING_FILE.parent.mkdir(parents=True, exist_ok=True)
+    LINKEDIN_PENDING_FILE.write_text(json.dumps(pending, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def queue_pending_choice(company_slug: str, company: str, candidates: list[dict], job_dir: Path) -> None:
+    """Record an ambiguous company (and the row's job folder) for a later --resolve instead of prompting."""
+    with _linkedin_choices_lock:
+        pending = load_pending_choices()
+        entry = pending.setdefault(company_slug, {"company": company, "job_dirs": []})
+        entry["candidates"] = candidates
+        entry["queued_at"] = datetime.now().isoformat(timespec="seconds")
+        entry.pop("chosen", None)
+        if str(job_dir) not in entry["job_dirs"]:
+            entry["job_dirs"].append(str(job_dir))
+        _save_pending_choices(pending)
+
+
+def resolve_pending_choice(company_slug: str, linkedin_url: str) -> None:
+    """Save the user's pick for a queued company; its rows are picked up by the next --resume."""
+    save_linkedin_choice(company_slug, linkedin_url)
+    with _linkedin_choices_lock:
+        pending = load_pending_choices()
+        if company_slug in pending:
+            pending[company_slug]["chosen"] = linkedin_url
+            _save_pending_choices(pending)
+
+
+def _resolve_pending_interactively() -> int:
+    """Prompt for every unresolved queued company. Returns how many were resolved."""
+    pending = {slug: e for slug, e in load_pending_choices().items() if not e.get("chosen")}
+    if not pending:
+        print("No pending LinkedIn choices.")
+        return 0
+    for n, (slug, entry) in enumerate(sorted(pending.items()), 1):
+        print(f"\n[{n}/{len(pending)}] {entry.get('company') or slug} ({len(entry.get('job_dirs') or [])} row(s))")
+        resolve_pending_choice(slug, _prompt_linkedin_choice(entry["candidates"]))
+    return len(pending)
+
+
+def _take_resumable_job_dirs() -> set[str]:
+    """Job folders of queued companies that now have a choice; their entries are removed from the queue."""
+    with _linkedin_choices_lock:
+        pending = load_pending_choices()
+        resolved = {slug for slug, e in pending.items() if e.get("chosen")}
+        job_dirs = {d for slug in resolved for d in pending[slug].get("job_dirs") or []}
+        for slug in resolved:
+            del pending[slug]
+        _save_pending_choices(pending)
+    return job_dirs
+
+
+def _linkedin_profile_for(company_slug: str, linkedin_url: str) -> dict:
+    """{employee_count, industry} for the company's LinkedIn page: from the company store when recorded for this
+    URL within COMPANY_FACTS_TTL_DAYS, else fetched with Playwright (and recorded)."""
+    facts = get_facts(company_slug)
+    if facts.get("linkedin_profile_url") == linkedin_url and ("linkedin_employee_count" in facts or "linkedin_industry" in facts):
+        return {"employee_count": facts.get("linkedin_employee_count"), "industry": facts.get("linkedin_industry")}
+    profile = _fetch_linkedin_company_data(linkedin_url)
+    if profile["employee_count"] is not None or profile["industry"]:
+        set_facts(company_slug, _linkedin_facts(linkedin_url, profile), source="linkedin")
+    return profile
+
+
+def research_company(company_slug: str, linkedin_url: str | None) -> dict:
+    """Web research for one company: {"linkedin_url": the resolved profile (or None), "external_search": snippets,
+    "linkedin_profile": {employee_count, industry} | None}."""
+    if linkedin_url:
+        return {
+            "linkedin_url": linkedin_url,
+            "external_search": _search_company_info_from_linkedin_url(linkedin_url),
+            "linkedin_profile": _linkedin_profile_for(company_slug, linkedin_url),
+        }
+    company_display = _company_display_name_from_slug(company_slug)
+    return {
+        "linkedin_url": None,
+        "external_search": _search_company_info(company_display) if company_display else "",
+        "linkedin_profile": None,
+    }
+
+
+_research_lock = threading.Lock()
+_research_futures: dict[tuple[str, str | None], Future] = {}
+
+
+def research_company_once(company_slug: str, linkedin_url: str | None) -> dict:
+    """research_company(), run at most once per (company, profile) per process. Concurrent callers for the
+    same company wait for the first one's answer instead of repeating the searches and LinkedIn fetch."""
+    key = (company_slug, linkedin_url)
+    with _research_lock:
+        fut = _research_futures.get(key)
+        owner = fut is None
+        if owner:
+            fut = _research_futures[key] = Future()
+    if owner:
+        try:
+            fut.set_result(research_company(company_slug, linkedin_url))
+        except Exception as e:
+            fut.set_exception(e)
+    return fut.result()
+
+
+DEFAULT_METADATA_CONCURRENCY = 4
+# Posting excerpt sent with the search snippets when only company type / size are still open (combined mode)
+COMPANY_EXCERPT_CHARS = 2000
+
+
+def extract_rows_in_order(rows: list[dict], concurrency: int | None = None):
+    """Run extract_metadata_for_job_dir for rows ({job_dir, linkedin_url, ...}, profiles already resolved) on up to
+    METADATA_CONCURRENCY threads, sharing company research between rows. Yields (row, result, error) in input order,
+    where result is (data_out, reasons, linkedin_url_used) and error is the exception if the row failed."""
+    if not rows:
+        return
+    concurrency = max(1, concurrency or int(os.environ.get("METADATA_CONCURRENCY", DEFAULT_METADATA_CONCURRENCY)))
+
+    def work(row: dict):
+        research = research_company_once(row["job_dir"].parent.name, row["linkedin_url"])
+        return extract_metadata_for_job_dir(row["job_dir"], research=research)
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(rows))) as pool:
+        futures = [pool.submit(work, row) for row in rows]
+        for row, fut in zip(rows, futures):
+            try:
+                yield row, fut.result(), None
+            except Exception as e:
+                yield row, None, e
+
+
+def _create_message(client: Anthropic, **kwargs):
+    """llm_cache.cached_create (client.messages.create, answered from disk for a repeated request) with up to 3 attempts
+    on rate-limit / overloaded errors."""
+    for attempt in range(3):
+        try:
+            return cached_create(client, **kwargs)
+        except Exception as e:
+            if _is_retryable(e) and attempt < 2:
+                time.sleep(2 ** attempt)
+                continue
+            raise
+    raise RuntimeError("Claude returned no message.")
+
+
+def _parse_json_reply(msg) -> dict:
+    """The JSON object in a Claude reply (tolerates text around it)."""
+    raw = (msg.content[0].text or "").strip()
+    if not raw:
+        raise RuntimeError("Claude returned empty output.")
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        start = raw.find("{")
+        end = raw.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(raw[start : end + 1])
+
+
+def _ask_json(client: Anthropic, **kwargs) -> dict:
+    """_create_message + _parse_json_reply; an unparseable answer is dropped from the LLM cache so a re-run asks again."""
+    msg = _create_message(client, **kwargs)
+    try:
+        return _parse_json_reply(msg)
+    except (ValueError, RuntimeError):
+        forget(kwargs)
+        raise
+
+
+def extract_posting_fields(job_text: str) -> dict:
+    """One Claude call over the posting alone (popjobs' combined mode, used at archive time): company_name, role_title,
+    role_focus, role_level and the company-type hints (company_type, employee_count, company_size_bucket) as the posting
+    states them. extract_metadata_for_job_dir(posting_fields=...) then adds web / LinkedIn research for company type and size."""
+    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    prompt = f"""From the job posting below, extract metadata. Return ONLY valid JSON with exactly these keys:
+
+- "company_name": string, the name of the company that is hiring. Use a short, common name when obvious (e.g. "Costco" not "Costco Wholesale Corporation"). If unclear, "Unknown".
+- "role_title": string, the exact job title from the posting. If unclear, "Unknown".
+- "role_focus": exactly one of {json.dumps(ROLE_FOCUS_OPTIONS)}. Pick the SINGLE best match. Do NOT default to FULL-STACK unless the posting clearly indicates it.
+- "role_level": exactly one of {json.dumps(ROLE_LEVEL_OPTIONS)}. Infer from job title and requirements. Do NOT default to MID unless clearly mid-level.
+- "employee_count": integer or null. Only when the posting itself states the company's headcount; otherwise null.
+- "company_type": exactly one of {json.dumps(COMPANY_TYPES)}, from the business model and keywords in the posting.
+{COMPANY_TYPE_RUBRIC}
+- "company_size_bucket": exactly one of {json.dumps(COMPANY_SIZE_BUCKETS)}. UNKNOWN unless the posting states the company's size.
+
+No other keys. No explanation.
+
+JOB POSTING:
+{job_text[:30000].strip()}
+"""
+    return _ask_json(
+        client,
+        model="claude-3-haiku-20240307",
+        max_tokens=512,
+        messages=[{"role": "user", "content": prompt}],
+    )
+
+
+def extract_metadata_for_job_dir(
+    job_dir: Path,
+    override_linkedin_url: str | None = None,
+    research: dict | None = None,
+    posting_fields: dict | None = None,
+) -> tuple[dict, dict, str | None]:
+    """Extract role_title, company_type, company_size_bucket, role_focus, role_level from the job text (job_main.txt, else job.txt). Uses optional web search for company size.
+    The LinkedIn profile is resolved first (override_linkedin_url, the choice cached for the company, or a prompt when several
+    candidates exist), so each call does one research pass and one LLM call. research, when given, is a research_company() result to reuse
+    (its linkedin_url is taken as the resolved profile, so nothing is searched or prompted for).
+    posting_fields, when given, is an extract_posting_fields() answer (popjobs saves it as posting_extract.json at archive time):
+    it supplies the role fields; company type and size come from LinkedIn when the profile settles both, else from a
+    small company-only LLM call (company name, search snippets, the posting's first COMPANY_EXCERPT_CHARS characters).
+    The posting-only answer is kept when there are no snippets.
     Returns (data_out, reasons, linkedin_url_used). linkedin_url_used is the LinkedIn company URL used for type/size when user selected or override was provided."""
     job_txt = job_dir / "job.txt"
     if not job_txt.exists():
         raise FileNotFoundError(f"No job.txt at {job_dir}")
-    job_text = job_txt.read_text(encoding="utf-8")[:30000]
 
     company_slug = job_dir.parent.name
-    company_display = _company_display_name_from_slug(company_slug)
-    linkedin_profile_data: dict | None = None
-    if override_linkedin_url:
-        linkedin_profile_data = _fetch_linkedin_company_data(override_linkedin_url)
-        external_search = _search_company_info_from_linkedin_url(override_linkedin_url)
-        linkedin_urls = []
+    if research is None:
+        research = research_company(company_slug, resolve_linkedin_profile(company_slug, override_linkedin_url))
+    linkedin_url_used = research["linkedin_url"]
+    linkedin_profile_data: dict | None = research["linkedin_profile"]
+    external_search = research["external_search"]
+    posting_only = False
+    if posting_fields is None:
+        data = _metadata_from_llm(read_job_text(job_dir)[:30000], external_search)
+    elif external_search and not _linkedin_settles_company(linkedin_profile_data):
+        excerpt = read_job_text(job_dir)[:COMPANY_EXCERPT_CHARS]
+        company_name = posting_fields.get("company_name") or company_slug
+        data = {**posting_fields, **_company_fields_from_llm(company_name, excerpt, external_search)}
     else:
-        external_search = _search_company_info(company_display) if company_display else ""
-        linkedin_urls = _search_linkedin_company_urls(company_display) if company_display else []
+        data, posting_only = dict(posting_fields), True
+    return _finish_metadata(data, company_slug, linkedin_url_used, linkedin_profile_data, posting_only)
+
+
+def _linkedin_settles_company(linkedin_profile_data: dict | None) -> bool:
+    """True when the LinkedIn profile gives both a headcount and an industry that maps to a company type."""
+    return bool(
+        linkedin_profile_data
+        and linkedin_profile_data.get("employee_count") is not None
+        and _company_type_from_linkedin_industry(linkedin_profile_data.get("industry"))
+    )
+
+
+def _company_fields_from_llm(company_name: str, posting_excerpt: str, external_search: str) -> dict:
+    """company_type, employee_count and company_size_bucket judged from the search results (plus a short posting excerpt
+    for the business model): the part of _metadata_from_llm that an archive-time extract_posting_fields() answer can't
+    supply. The role fields are already known, so the full posting isn't sent again."""
+    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    prompt = f"""Classify the hiring company "{company_name}" from the external search results and the job posting excerpt below. Return ONLY valid JSON with exactly these keys:
+
+- "employee_count": integer or null. Prefer employee count from LinkedIn (linkedin.com/company) or official company/about pages in the search results, and only for the hiring company (ignore other companies in the results). Use the EXACT number when clearly stated; if no clear number, use null.
+- "company_type": exactly one of {json.dumps(COMPANY_TYPES)}. Decide from business model and keywords (consulting, agency, government, nonprofit, startup, big tech, etc.) in the posting and search results. Missing employee_count must NOT push company_type to unknown.
+{COMPANY_TYPE_RUBRIC}
+- "company_size_bucket": exactly one of {json.dumps(COMPANY_SIZE_BUCKETS)}. Prefer from employee count when stated: <50 → "<50", 50-199 → "50-200", 200-999 → "200-1000", 1000-9999 → "1000+", 10000+ → "10,000+". If employee count not clearly stated, use UNKNOWN.
+
+No other keys. No explanation.
+
+EXTERNAL SEARCH RESULTS:
+{external_search}
+
+JOB POSTING (excerpt):
+{posting_excerpt}
+"""
+    data = _ask_json(
+        client,
+        model="claude-3-haiku-20240307",
+        max_tokens=256,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return {k: data.get(k) for k in ("employee_count", "company_type", "company_size_bucket")}
+
+
+def _metadata_from_llm(job_text: str, external_search: str) -> dict:
     if external_search:
         search_block = f"""
 EXTERNAL SEARCH RESULTS (use for company description, funding, employee count, and business model; combine with job posting to classify company type and size). For employee_count, prefer numbers from LinkedIn or official company/about pages when present below:
@@ -488,37 +857,20 @@ JOB POSTING:
 {job_text}
 """
 
-    last_error = None
-    msg = None
-    for attempt in range(3):
-        try:
-            msg = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=512,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            break
-        except Exception as e:
-            last_error = e
-            if _is_retryable(e) and attempt < 2:
-                time.sleep(2 ** attempt)
-                continue
-            raise
-    if msg is None:
-        raise RuntimeError("Claude returned no message.")
+    return _ask_json(
+        client,
+        model="claude-3-haiku-20240307",
+        max_tokens=512,
+        messages=[{"role": "user", "content": prompt}],
+    )
 
-    raw = (msg.content[0].text or "").strip()
-    if not raw:
-        raise RuntimeError("Claude returned empty output.")
 
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        start = raw.find("{")
-        end = raw.rfind("}")
-        if start == -1 or end <= start:
-            raise
-        data = json.loads(raw[start : end + 1])
+def _finish_metadata(
+    data: dict, company_slug: str, linkedin_url_used: str | None, linkedin_profile_data: dict | None, posting_only: bool
+) -> tuple[dict, dict, str | None]:
+    """Normalize the extracted fields to the sheet's dropdown values, overlay LinkedIn profile data, and record the
+    company facts. Returns extract_metadata_for_job_dir's (data_out, reasons, linkedin_url_used)."""
+    basis = "archive-time extraction" if posting_only else "search + job posting"
 
     def pick(allowed: list[str], key: str, default: str) -> str:
         val = (data.get(key) or "").strip()
@@ -545,7 +897,7 @@ JOB POSTING:
                 pass
     # Company type: from LLM (rubric) unless we have LinkedIn profile data
     company_type = pick(COMPANY_TYPES, "company_type", "unknown")
-    reason_company_type = "from search + job posting (rubric)"
+    reason_company_type = f"from {basis} (rubric)"
     if linkedin_profile_data:
         linkedin_type = _company_type_from_linkedin_industry(linkedin_profile_data.get("industry"))
         if linkedin_type:
@@ -562,10 +914,10 @@ JOB POSTING:
         size_from_ec = _derive_size_bucket_from_employee_count(employee_count)
         if size_from_ec is not None:
             company_size_bucket = size_from_ec
-            reason_company_size = f"derived from employee_count={employee_count} (LLM from search/job; verify on LinkedIn if needed)"
+            reason_company_size = f"derived from employee_count={employee_count} ({basis}; verify on LinkedIn if needed)"
         else:
             company_size_bucket = pick(COMPANY_SIZE_BUCKETS, "company_size_bucket", "UNKNOWN")
-            reason_company_size = f"from search + job posting → {company_size_bucket}"
+            reason_company_size = f"from {basis} → {company_size_bucket}"
     role_focus = pick(ROLE_FOCUS_OPTIONS, "role_focus", "FULL-STACK")
     role_level = pick(ROLE_LEVEL_OPTIONS, "role_level", "SENIOR")
 
@@ -585,43 +937,14 @@ JOB POSTING:
         "role_focus": role_focus,
         "role_level": role_level,
     }
+    set_facts(company_slug, {
+        "company_type": company_type_display,
+        "company_size_bucket": company_size_bucket,
+        "employee_count": employee_count,
+    }, source="batchmetadata")
+    if data_out["company_name"] != "Unknown":
+        register(data_out["company_name"], company_slug)
 
-    # When multiple LinkedIn companies match, pause and let user pick by number
-    INITIAL_SHOW = 4
-    if len(linkedin_urls) >= 2:
-        n_total = len(linkedin_urls)
-        show_count = min(INITIAL_SHOW, n_total)
-        print(f"    ✋ Multiple LinkedIn companies found ({n_total}):")
-        for i, c in enumerate(linkedin_urls[:show_count], 1):
-            print(f"       {i}. {c['title']}")
-            print(f"          {c['href']}")
-        while True:
-            if show_count >= n_total:
-                prompt = f"     Select company (1-{n_total}), or paste a LinkedIn company URL: "
-            else:
-                prompt = f"     Select company (1-{show_count}), M for more, or paste a LinkedIn company URL: "
-            choice = input(prompt).strip()
-            if "linkedin.com/company" in choice.lower():
-                canonical = _normalize_linkedin_company_url(choice)
-                if canonical:
-                    return extract_metadata_for_job_dir(job_dir, override_linkedin_url=canonical)
-                print("     That doesn't look like a valid LinkedIn company URL. Try again.")
-                continue
-            if choice.upper() == "M" and show_count < n_total:
-                for i, c in enumerate(linkedin_urls[show_count:], start=show_count + 1):
-                    print(f"       {i}. {c['title']}")
-                    print(f"          {c['href']}")
-                show_count = n_total
-                continue
-            try:
-                num = int(choice)
-                if 1 <= num <= n_total:
-                    chosen_url = linkedin_urls[num - 1]["href"]
-                    return extract_metadata_for_job_dir(job_dir, override_linkedin_url=chosen_url)
-            except ValueError:
-                pass
-            print(f"     Enter a number 1-{show_count}" + (f", M for more" if show_count < n_total else "") + ", or paste a LinkedIn company URL.")
-    linkedin_url_used = override_linkedin_url if override_linkedin_url else None
     return data_out, reasons, linkedin_url_used
 
 
@@ -661,6 +984,9 @@ def parse_date_applied(raw: str) -> str | None:
 
 def main():
     load_dotenv()
+    if "--reparse" in sys.argv[1:]:
+        reparse_cached_linkedin_pages(save="--save" in sys.argv[1:])
+        return
 
     sa_json = os.environ["GOOGLE_SA_JSON"]
     sheet_id = os.environ["SHEET_ID"]
@@ -688,85 +1014,126 @@ def main():
     if not date_applied_col:
         raise SystemExit(f'Sheet must have a column named "{DATE_APPLIED_HEADER}".')
 
-    company_filter = (sys.argv[1].strip() if len(sys.argv) > 1 else None) or None
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = {a for a in sys.argv[1:] if a.startswith("--")}
+    unattended = "--unattended" in flags
+    resume_job_dirs: set[str] | None = None
+    if "--resolve" in flags:
+        _resolve_pending_interactively()
+        flags.add("--resume")
+    if "--resume" in flags:
+        resume_job_dirs = _take_resumable_job_dirs()
+        if not resume_job_dirs:
+            print("No resolved rows to resume.")
+            return
+        print(f"Resuming {len(resume_job_dirs)} row(s) whose LinkedIn company was just chosen.\n")
+
+    company_filter = (args[0].strip() if args else None) or None
     if company_filter:
         print(f"Company filter: only rows matching {company_filter!r}\n")
         overwrite_all = True
+    elif resume_job_dirs is not None:
+        overwrite_all = True
+    elif unattended:
+        overwrite_all = "--overwrite" in flags
     else:
         print("Metadata: overwrite all existing metadata, or only populate rows that don't have metadata yet?")
         choice = input("  [A]ll overwrite  |  [N]ew only (default: N): ").strip().upper() or "N"
         overwrite_all = choice == "A" or choice == "ALL"
-    if overwrite_all:
+    if resume_job_dirs is not None:
+        pass
+    elif overwrite_all:
         print("Mode: overwrite all existing metadata.\n")
     elif not company_filter:
         print("Mode: only populate rows missing metadata (company type empty).\n")
 
     rows = ws.get_all_values()[1:]
 
-    for idx, row in enumerate(rows, start=2):
-        company = (row[company_col - 1] or "").strip()
-        date_applied_raw = (row[date_applied_col - 1] or "").strip() if date_applied_col <= len(row) else ""
-        sentinel_val = (row[sentinel_col - 1] or "").strip() if sentinel_col and sentinel_col <= len(row) else ""
-
-        if not company:
-            continue
-        if company_filter and company_filter.lower() not in company.lower() and slugify(company) != slugify(company_filter):
-            continue
-        if not overwrite_all and sentinel_val:
-            continue
+    queued = 0
+    # The LinkedIn browser is closed even when a pass fails or is interrupted
+    try:
+        # Pass 1 (main thread): pick rows and settle each company's LinkedIn profile, prompting or queueing as needed.
+        todo: list[dict] = []
+        profiles: dict[str, str | None] = {}
+        for idx, row in enumerate(rows, start=2):
+            company = (row[company_col - 1] or "").strip()
+            date_applied_raw = (row[date_applied_col - 1] or "").strip() if date_applied_col <= len(row) else ""
+            sentinel_val = (row[sentinel_col - 1] or "").strip() if sentinel_col and sentinel_col <= len(row) else ""
+
+            if not company:
+                continue
+            if company_filter and company_filter.lower() not in company.lower() and slugify(company) != slugify(company_filter):
+                continue
+            if not overwrite_all and sentinel_val:
+                continue
 
-        date_iso = parse_date_applied(date_applied_raw)
-        if not date_iso:
-            print(f"\n⏭️ Skipping row {idx}: no valid '{DATE_APPLIED_HEADER}' (got: {date_applied_raw!r})")
-            continue
+            date_iso = parse_date_applied(date_applied_raw)
+            if not date_iso:
+                print(f"\n⏭️ Skipping row {idx}: no valid '{DATE_APPLIED_HEADER}' (got: {date_applied_raw!r})")
+                continue
 
-        if job_dir_col and job_dir_col <= len(row):
-            job_dir_val = (row[job_dir_col - 1] or "").strip()
+            job_dir_val = (row[job_dir_col - 1] or "").strip() if job_dir_col and job_dir_col <= len(row) else ""
+            job_dir = None
             if job_dir_val:
                 job_dir = (PROJECT_ROOT / job_dir_val).resolve() if not Path(job_dir_val).is_absolute() else Path(job_dir_val).resolve()
-            else:
-                job_dir = DATA_DIR / slugify(company) / date_iso
-        else:
-            job_dir = DATA_DIR / slugify(company) / date_iso
-        company_slug = slugify(company)
-        job_txt = job_dir / "job.txt"
-        if not job_txt.exists():
-            # Fallback: try alternate slugs for this company only (e.g. "Premier, Inc."). Never use another company's folder.
-            found = None
-            for slug_candidate in [company_slug, slugify(company.replace(",", "").replace(".", ""))]:
-                if slug_candidate and DATA_DIR.exists():
-                    candidate = DATA_DIR / slug_candidate / date_iso
-                    if (candidate / "job.txt").exists():
-                        found = candidate
-                        break
-            if found is None:
-                print(f"\n⏭️ Skipping row {idx}: no archived job at {job_dir}")
+            if job_dir is None or not (job_dir / "job.txt").exists():
+                # Company store slug, then spelling variants of this company's name (e.g. "Premier, Inc."). Never another company's folder.
+                found = find_job_dir(company, date_iso)
+                if not (found / "job.txt").exists():
+                    print(f"\n⏭️ Skipping row {idx}: no archived job at {job_dir or found}")
+                    continue
+                job_dir = found
+            job_dir = job_dir.resolve()
+            register(company, job_dir.parent.name)
+            if resume_job_dirs is not None and str(job_dir.resolve()) not in resume_job_dirs:
                 continue
-            job_dir = found
-            job_txt = job_dir / "job.txt"
-        else:
-            job_dir = job_dir.resolve() if not job_dir.is_absolute() else job_dir
-            job_txt = job_dir / "job.txt"
-
-        row_linkedin = (row[linkedin_col - 1] or "").strip() if linkedin_col and linkedin_col <= len(row) else ""
-        override_linkedin = row_linkedin if row_linkedin and "linkedin.com/company" in row_linkedin.lower() else None
 
-        print(f"\nRow {idx}: {company} | {date_iso}")
+            row_linkedin = (row[linkedin_col - 1] or "").strip() if linkedin_col and linkedin_col <= len(row) else ""
+            override_linkedin = row_linkedin if row_linkedin and "linkedin.com/company" in row_linkedin.lower() else None
 
-        try:
-            data, reasons, linkedin_url_used = extract_metadata_for_job_dir(job_dir, override_linkedin_url=override_linkedin)
-        except Exception as e:
-            print(f"  ⚠️ Failed: {e}")
-            continue
-        for header, json_key in METADATA_COLUMNS.items():
-            c = meta_cols.get(header)
-            if c and json_key in data:
-                val = data.get(json_key)
-                ws.update_cell(idx, c, val if val is not None else "")
-        if linkedin_col and linkedin_url_used:
-            ws.update_cell(idx, linkedin_col, linkedin_url_used)
-        print(f"  → {data.get('company_name', '')} | {data.get('role_title', '')} | {data.get('company_type', '')} | {data.get('company_size_bucket', '')} | {data.get('role_focus', '')} | {data.get('role_level', '')}")
+            company_slug = job_dir.parent.name
+            if override_linkedin:
+                linkedin_url = resolve_linkedin_profile(company_slug, override_linkedin)
+            elif company_slug in profiles:
+                linkedin_url = profiles[company_slug]
+            else:
+                candidates = linkedin_candidates_needing_choice(company_slug)
+                if candidates and unattended:
+                    queue_pending_choice(company_slug, company, candidates, job_dir.resolve())
+                    queued += 1
+                    print(f"\nRow {idx}: {company} | {date_iso}")
+                    print(f"  ⏸️ {len(candidates)} LinkedIn companies match; queued for `batchmetadata --resolve`.")
+                    continue
+                if candidates:
+                    print(f"\nRow {idx}: {company} | {date_iso}")
+                    save_linkedin_choice(company_slug, _prompt_linkedin_choice(candidates))
+                linkedin_url = profiles[company_slug] = get_linkedin_choice(company_slug)
+            todo.append({"idx": idx, "company": company, "date_iso": date_iso, "job_dir": job_dir, "linkedin_url": linkedin_url})
+
+        # Pass 2: research + LLM for several rows at once (one research pass per company); sheet writes stay in row order.
+        with SheetWriter(ws) as writer:
+            for item, result, error in extract_rows_in_order(todo):
+                print(f"\nRow {item['idx']}: {item['company']} | {item['date_iso']}")
+                if error is not None:
+                    print(f"  ⚠️ Failed: {error}")
+                    continue
+                data, reasons, linkedin_url_used = result
+                for header, json_key in METADATA_COLUMNS.items():
+                    c = meta_cols.get(header)
+                    if c and json_key in data:
+                        val = data.get(json_key)
+                        writer.update_cell(item["idx"], c, val if val is not None else "")
+                if linkedin_col and linkedin_url_used:
+                    writer.update_cell(item["idx"], linkedin_col, linkedin_url_used)
+                writer.end_row()
+                print(f"  → {data.get('company_name', '')} | {data.get('role_title', '')} | {data.get('company_type', '')} | {data.get('company_size_bucket', '')} | {data.get('role_focus', '')} | {data.get('role_level', '')}")
+    finally:
+        close_linkedin_fetcher()
 
+    print(search_summary())
+    print(cache_summary())
+    if queued:
+        print(f"\n⏸️ {queued} row(s) need a LinkedIn company choice. Run `batchmetadata --resolve` (or use the UI) to pick and finish them.")
     print("\n✅ Done\n")
 
 
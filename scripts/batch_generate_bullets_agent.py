@@ -2,7 +2,11 @@
 Generate resume_bullets.json for job folders for a given day (default today) from the tracker sheet.
 Overwrites existing resume_bullets.json in each folder. Runs generate_bullets_agent per row.
 
-Alias: genbullets [today|YYYY-MM-DD]
+--batch-api: runs the day in-process as two Message Batches jobs (message_batches) — every draft, then the
+validation pass for every draft that parsed — and writes each folder's resume_bullets.json when the second
+batch ends. Half the cost per token; failed jobs are listed for a single-job re-run.
+
+Alias: genbullets [today|YYYY-MM-DD] [--batch-api]
 """
 import os
 import subprocess
@@ -13,6 +17,10 @@ from pathlib import Path
 import gspread
 from dotenv import load_dotenv
 
+from company_store import find_job_dir
+from llm_cache import forget
+from message_batches import reply_text, run_batch
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 BULLETS_SCRIPT = SCRIPT_DIR / "generate_bullets_agent.py"
 DATA_DIR = Path("data")
@@ -22,10 +30,6 @@ APPLIED_VIA_HEADER = "applied via"
 APPLIED_VIA_NOT_APPLIED = "NOT APPLIED YET"
 
 
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
-
-
 def parse_date_applied(raw: str) -> str | None:
     raw = (raw or "").strip()
     if not raw:
@@ -61,17 +65,67 @@ def is_job_dir_path(arg: str) -> bool:
     return p.is_dir() and (p / "job.txt").exists()
 
 
+def run_with_batch_api(target_dirs: list[Path], day: str) -> int:
+    """Draft and validate bullets for target_dirs with two Message Batches jobs; returns the number written."""
+    from anthropic import Anthropic
+
+    from generate_bullets_agent import draft_request, finish_draft, finish_validation, validation_request, write_bullets
+    from job_text import read_job_text
+    from resume_loader import get_resume_text
+
+    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    resume_text = get_resume_text()
+    dirs = {f"job{i}": job_dir for i, job_dir in enumerate(target_dirs)}
+    job_texts = {custom_id: read_job_text(job_dir) for custom_id, job_dir in dirs.items()}
+    failed: dict[str, str] = {}
+
+    print(f"📋 Bullets draft pass: {len(dirs)} job(s)")
+    drafts = {}
+    draft_requests = {custom_id: draft_request(job_text, resume_text) for custom_id, job_text in job_texts.items()}
+    draft_results = run_batch(client, f"genbullets-draft-{day}", draft_requests)
+    for custom_id, result in draft_results.items():
+        try:
+            drafts[custom_id] = finish_draft(reply_text(result))
+        except ValueError as e:
+            forget(draft_requests[custom_id])
+            failed[custom_id] = f"draft: {e}"
+
+    print(f"📋 Bullets validation pass: {len(drafts)} job(s)")
+    wrote = 0
+    validation_requests = {
+        custom_id: validation_request(job_texts[custom_id], resume_text, draft) for custom_id, draft in drafts.items()
+    }
+    validation_results = run_batch(client, f"genbullets-validation-{day}", validation_requests)
+    for custom_id, result in validation_results.items():
+        try:
+            data = finish_validation(reply_text(result), drafts[custom_id])
+        except ValueError as e:
+            forget(validation_requests[custom_id])
+            failed[custom_id] = f"validation: {e}"
+            continue
+        write_bullets(dirs[custom_id], data)
+        print(f"  📝 Bullets: {dirs[custom_id].relative_to(DATA_DIR)}")
+        wrote += 1
+
+    for custom_id, reason in failed.items():
+        print(f"  ⚠️ {dirs[custom_id]}: {reason} — re-run with: genbullets {dirs[custom_id]}")
+    return wrote
+
+
 def main():
+    args = [a for a in sys.argv[1:] if a != "--batch-api"]
+    batch_api = len(args) < len(sys.argv) - 1
+
     # Single job path: genbullets data/costco/2026-02-10 → overwrites if present
-    if len(sys.argv) == 2 and is_job_dir_path(sys.argv[1]):
-        job_dir = Path(sys.argv[1]).resolve()
+    if len(args) == 1 and is_job_dir_path(args[0]):
+        job_dir = Path(args[0]).resolve()
         print(f"📋 Bullets (single): {job_dir}")
         subprocess.run(["python", str(BULLETS_SCRIPT), str(job_dir)], check=True)
         return
 
     day = date.today().isoformat()
-    if len(sys.argv) == 2:
-        arg = sys.argv[1].strip().lower()
+    if len(args) == 1:
+        arg = args[0].strip().lower()
         if arg == "today":
             day = date.today().isoformat()
         else:
@@ -108,11 +162,16 @@ def main():
             if applied_via != APPLIED_VIA_NOT_APPLIED:
                 print(f"  ⏭️ Skipping row {idx}: {company} / {date_iso} (APPLIED VIA = {applied_via!r})")
                 continue
-        job_dir = DATA_DIR / slugify(company) / date_iso
+        job_dir = find_job_dir(company, date_iso)
         if not (job_dir / "job.txt").exists():
             continue
         target_dirs.append(job_dir)
 
+    if batch_api:
+        wrote = run_with_batch_api(target_dirs, day) if target_dirs else 0
+        print(f"\n✅ Done. wrote={wrote}\n")
+        return
+
     wrote = 0
     for job_dir in target_dirs:
         print(f"📋 Bullets: {job_dir.relative_to(DATA_DIR)}")
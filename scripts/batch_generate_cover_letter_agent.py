@@ -2,17 +2,29 @@
 Generate cover letters with Claude and upload them to the cover letters Drive folder as .docx
 (same naming as makecl). Runs per job folder for a given day (default today). Skips dirs without job.txt.
 
-Alias: popcl [today|YYYY-MM-DD]
+Letters are generated on up to POPCL_CONCURRENCY threads (default 4) while a single upload thread sends
+finished ones to Drive, so a day's run takes about as long as its slowest few Claude calls. A 429 (rate
+limit) or 529 (overloaded) on any thread pauses every generation thread: the pause doubles on repeated
+throttling (or follows retry-after) up to 60s, and halves after each success.
+
+--batch-api submits all of the day's letters as one Message Batches job (message_batches) and uploads
+the results when it ends: half the cost, for runs that don't need the letters right away.
+
+Alias: popcl [today|YYYY-MM-DD] [--batch-api]
 """
 import io
 import os
+import random
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 
 import gspread
-from anthropic import Anthropic
+from anthropic import Anthropic, APIConnectionError, APIStatusError
 from docx import Document
 from dotenv import load_dotenv
 from google.auth.transport.requests import Request
@@ -21,6 +33,11 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 
+from company_store import find_job_dir, folder_slugs
+from job_text import read_job_text
+from llm_cache import cacheable_system, cached_create, usage_line
+from message_batches import reply_text, run_batch
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 DATA_DIR = Path("data")
 DATE_APPLIED_HEADER = "date applied"
@@ -28,10 +45,14 @@ APPLIED_VIA_HEADER = "applied via"
 APPLIED_VIA_NOT_APPLIED = "NOT APPLIED YET"
 DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive"]
 DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DEFAULT_POPCL_CONCURRENCY = 4
+MAX_GENERATE_ATTEMPTS = 6
+MAX_BACKOFF_S = 60.0
+RETRYABLE_STATUS = (429, 500, 502, 503, 529)
 
-
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
+_backoff_lock = threading.Lock()
+_backoff_s = 0.0
+_resume_at = 0.0
 
 
 def to_camel_case(s: str) -> str:
@@ -103,12 +124,13 @@ def make_docx_from_text(text: str) -> bytes:
     return buf.read()
 
 
-def generate_letter(job_dir: Path, client: Anthropic, resume_text: str) -> str:
-    job_txt = job_dir / "job.txt"
+def letter_request(job_dir: Path, resume_text: str) -> dict:
+    """messages.create kwargs for one job's cover letter."""
     url_txt = job_dir / "url.txt"
-    job_text = job_txt.read_text(encoding="utf-8")
+    job_text = read_job_text(job_dir)
     url = url_txt.read_text(encoding="utf-8").strip() if url_txt.exists() else ""
-    prompt = f"""Write a concise, confident cover letter tailored to this job.
+    # Instructions + resume form a system prefix shared by every job (prompt-cached); the URL and job text vary
+    instructions = """Write a concise, confident cover letter tailored to the job in the user message.
 
 CRITICAL — Only reference experience and technologies that appear on the resume. Do not mention any technologies, tools, or responsibilities from the job description (e.g. ASP.NET, C#, Windows Server) unless they explicitly appear on the resume. If the JD asks for something the resume does not show, do not claim it—emphasize the candidate's actual skills and experience instead.
 
@@ -119,23 +141,17 @@ Constraints:
 - No claims you can't support from the resume; only mention tech and experience that is on the resume
 - Reference the company/role naturally (if the JD provides it)
 - End with a simple call to action
-- Output plain text ONLY
-
-JOB POSTING URL (if available):
-{url}
+- Output plain text ONLY"""
+    return {
+        "model": "claude-3-haiku-20240307",
+        "max_tokens": 900,
+        "system": cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text.strip()}"),
+        "messages": [{"role": "user", "content": f"JOB POSTING URL (if available):\n{url}\n\nJOB DESCRIPTION:\n{job_text.strip()}"}],
+    }
 
-JOB DESCRIPTION:
-{job_text}
 
-RESUME:
-{resume_text}
-"""
-    msg = client.messages.create(
-        model="claude-3-haiku-20240307",
-        max_tokens=900,
-        messages=[{"role": "user", "content": prompt.strip()}],
-    )
-    letter = (msg.content[0].text or "").strip()
+def finish_letter(letter: str) -> str:
+    """Letter text from the model's reply, without any "Here is a cover letter…" intro."""
     if not letter:
         raise RuntimeError("Claude returned empty cover letter")
     # Strip any intro line the model may have added
@@ -148,6 +164,60 @@ RESUME:
     return letter
 
 
+def generate_letter(job_dir: Path, client: Anthropic, resume_text: str) -> str:
+    msg = cached_create(client, **letter_request(job_dir, resume_text))
+    print(f"  {usage_line(msg)}")
+    return finish_letter((msg.content[0].text or "").strip())
+
+
+def _retry_after_s(err: Exception) -> float:
+    try:
+        return float(err.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def create_with_backoff(client: Anthropic, request: dict):
+    """cached_create(client, **request) with a backoff shared by all generation threads: a 429 / 529 / 5xx or
+    connection error pauses every thread (doubling the pause, or following retry-after, if it hits outside a
+    pause) and each success halves it. Gives up after MAX_GENERATE_ATTEMPTS."""
+    global _backoff_s, _resume_at
+    for attempt in range(MAX_GENERATE_ATTEMPTS):
+        with _backoff_lock:
+            wait_s = _resume_at - time.monotonic()
+        if wait_s > 0:
+            time.sleep(wait_s)
+        try:
+            msg = cached_create(client, **request)
+        except (APIStatusError, APIConnectionError) as e:
+            status = getattr(e, "status_code", None)
+            if (status is not None and status not in RETRYABLE_STATUS) or attempt == MAX_GENERATE_ATTEMPTS - 1:
+                raise
+            with _backoff_lock:
+                now = time.monotonic()
+                if now >= _resume_at:
+                    # Only the first throttle after a pause grows it; the other threads' errors were the same burst
+                    _backoff_s = min(MAX_BACKOFF_S, max(_retry_after_s(e), _backoff_s * 2 or 1.0))
+                    _resume_at = now + _backoff_s * random.uniform(1.0, 1.25)
+                    print(f"  ⏸️ Claude {status or 'connection error'}: pausing generation {_backoff_s:.0f}s")
+            continue
+        with _backoff_lock:
+            _backoff_s = _backoff_s / 2 if _backoff_s >= 1.0 else 0.0
+        return msg
+
+
+def upload_letter(drive, folder_id: str, existing: dict[str, str], name: str, letter: str) -> str:
+    """Upload letter as <name> (.docx) to the Drive folder, replacing the file of that name in existing ({name: id}).
+    Returns "Updated" or "Created"."""
+    media = MediaIoBaseUpload(io.BytesIO(make_docx_from_text(letter)), mimetype=DOCX_MIME, resumable=False)
+    if name in existing:
+        drive.files().update(fileId=existing[name], media_body=media).execute()
+        return "Updated"
+    body = {"name": name, "parents": [folder_id]}
+    drive.files().create(body=body, media_body=media, fields="id").execute()
+    return "Created"
+
+
 def is_job_dir_path(arg: str) -> bool:
     p = Path(arg).resolve()
     return p.is_dir() and (p / "job.txt").exists()
@@ -155,10 +225,12 @@ def is_job_dir_path(arg: str) -> bool:
 
 def main():
     load_dotenv()
+    args = [a for a in sys.argv[1:] if a != "--batch-api"]
+    batch_api = len(args) < len(sys.argv) - 1
 
     # Single job path: popcl data/costco/2026-02-10 → generate and upload to Drive (need company/role from sheet)
-    if len(sys.argv) == 2 and is_job_dir_path(sys.argv[1]):
-        job_dir = Path(sys.argv[1]).resolve()
+    if len(args) == 1 and is_job_dir_path(args[0]):
+        job_dir = Path(args[0]).resolve()
         company_slug = job_dir.parent.name
         date_iso = job_dir.name
         sa_json = os.environ.get("GOOGLE_SA_JSON", "").strip()
@@ -181,7 +253,7 @@ def main():
             if date_col <= len(row) and parse_date_applied((row[date_col - 1] or "").strip()) != date_iso:
                 continue
             c = (row[company_col - 1] or "").strip() if company_col <= len(row) else ""
-            if slugify(c) == company_slug:
+            if c and company_slug in folder_slugs(c):
                 if applied_via_col and applied_via_col <= len(row):
                     applied_via = (row[applied_via_col - 1] or "").strip()
                     if applied_via != APPLIED_VIA_NOT_APPLIED:
@@ -193,7 +265,8 @@ def main():
         if not company_display:
             raise SystemExit(f"Could not find sheet row for {job_dir}. Ensure date applied and company match.")
         name = f"{date_iso}__JittaniaSmith_{to_camel_case(company_display)}_{to_camel_case(role_title)}_CL.docx"
-        letter = generate_letter(job_dir, Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"]))
+        from resume_loader import get_resume_text
+        letter = generate_letter(job_dir, Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"]), get_resume_text())
         docx_bytes = make_docx_from_text(letter)
         drive = build("drive", "v3", credentials=get_drive_credentials())
         media = MediaIoBaseUpload(io.BytesIO(docx_bytes), mimetype=DOCX_MIME, resumable=False)
@@ -210,8 +283,8 @@ def main():
 
     # Batch path: by date (today or YYYY-MM-DD)
     target_date_iso = date.today().isoformat()
-    if len(sys.argv) == 2:
-        arg = sys.argv[1].strip().lower()
+    if len(args) == 1:
+        arg = args[0].strip().lower()
         if arg != "today" and len(arg) == 10 and arg[4] == "-" and arg[7] == "-":
             try:
                 datetime.strptime(arg, "%Y-%m-%d")
@@ -253,7 +326,7 @@ def main():
             if applied_via != APPLIED_VIA_NOT_APPLIED:
                 print(f"  ⏭️ Skipping row {idx}: {company} / {date_iso} (APPLIED VIA = {applied_via!r})")
                 continue
-        job_dir = DATA_DIR / slugify(company) / date_iso
+        job_dir = find_job_dir(company, date_iso)
         if not (job_dir / "job.txt").exists():
             continue
         target_rows.append((date_iso, company, role_title, job_dir))
@@ -285,28 +358,47 @@ def main():
         if not page:
             break
 
-    wrote = 0
-    for date_iso, company, role_title, job_dir in target_rows:
-        name = f"{date_iso}__JittaniaSmith_{to_camel_case(company)}_{to_camel_case(role_title)}_CL.docx"
-        print(f"\n📄 Cover letter: {job_dir.relative_to(DATA_DIR)}\n")
-        try:
-            letter = generate_letter(job_dir, client, resume_text)
-        except Exception as e:
-            print(f"  ⚠️ Generate failed: {e}")
-            continue
-        docx_bytes = make_docx_from_text(letter)
-        media = MediaIoBaseUpload(io.BytesIO(docx_bytes), mimetype=DOCX_MIME, resumable=False)
-        try:
-            if name in existing:
-                drive.files().update(fileId=existing[name], media_body=media).execute()
-                print(f"  ✅ Updated {name}")
-            else:
-                body = {"name": name, "parents": [folder_id]}
-                drive.files().create(body=body, media_body=media, fields="id").execute()
-                print(f"  ✅ Created {name}")
-            wrote += 1
-        except Exception as e:
-            print(f"  ⚠️ Drive upload failed: {e}")
+    # --batch-api: every letter for the day in one Message Batches job, then the same per-row upload
+    batch_results = None
+    if batch_api:
+        batch_results = run_batch(client, f"popcl-{target_date_iso}", {
+            f"job{i}": letter_request(job_dir, resume_text) for i, (_, _, _, job_dir) in enumerate(target_rows)
+        })
+    # create_with_backoff does the retrying, with a pause shared across threads
+    gen_client = client.with_options(max_retries=0)
+
+    def generate(i: int, job_dir: Path):
+        if batch_results is not None:
+            return batch_results[f"job{i}"]
+        return create_with_backoff(gen_client, letter_request(job_dir, resume_text))
+
+    # Generations run concurrently; results are taken in row order and handed to one upload thread
+    # (the Drive client isn't thread-safe), so uploads overlap with the generations still running.
+    concurrency = max(1, int(os.environ.get("POPCL_CONCURRENCY", DEFAULT_POPCL_CONCURRENCY)))
+    uploads = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="drive-upload") as upload_pool:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(target_rows)), thread_name_prefix="popcl") as gen_pool:
+            futures = [gen_pool.submit(generate, i, job_dir) for i, (_, _, _, job_dir) in enumerate(target_rows)]
+            for (date_iso, company, role_title, job_dir), fut in zip(target_rows, futures):
+                name = f"{date_iso}__JittaniaSmith_{to_camel_case(company)}_{to_camel_case(role_title)}_CL.docx"
+                print(f"\n📄 Cover letter: {job_dir.relative_to(DATA_DIR)}")
+                try:
+                    result = fut.result()
+                    letter = finish_letter(reply_text(result))
+                except Exception as e:
+                    print(f"  ⚠️ Generate failed: {e}")
+                    continue
+                print(f"  {usage_line(result)}")
+                uploads.append((name, upload_pool.submit(upload_letter, drive, folder_id, existing, name, letter)))
+
+        print()
+        wrote = 0
+        for name, fut in uploads:
+            try:
+                print(f"  ✅ {fut.result()} {name}")
+                wrote += 1
+            except Exception as e:
+                print(f"  ⚠️ Drive upload failed for {name}: {e}")
 
     print(f"\n✅ Done. wrote={wrote}\n")
 
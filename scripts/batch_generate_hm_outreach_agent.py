@@ -12,6 +12,9 @@ from pathlib import Path
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from job_text import read_job_text
+from llm_cache import cacheable_system, cached_create, usage_line
+
 
 def iter_job_dirs_for_day(data_dir: Path, day: str):
     for company_dir in data_dir.iterdir():
@@ -42,6 +45,27 @@ def main():
     except FileNotFoundError as e:
         raise SystemExit(str(e))
 
+    # Instructions + resume form a system prefix shared by every job (prompt-cached); job text and company context vary
+    system = cacheable_system(f"""
+Draft a short hiring-manager outreach message for the job in the user message.
+
+Constraints:
+- 3–5 sentences max
+- Professional, direct, human
+- No buzzwords
+- No overconfidence
+- No emojis
+- Assume cold outreach (LinkedIn or email)
+
+Goal:
+Express interest in the role, show light company understanding, and ask for a brief conversation.
+
+Output plain text only.
+
+RESUME:
+{resume_text}
+""".strip())
+
     wrote = 0
     skipped = 0
 
@@ -54,40 +78,19 @@ def main():
             skipped += 1
             continue
 
-        job_text = job_txt.read_text(encoding="utf-8")
+        job_text = read_job_text(job_dir)
         company_summary = read_if_exists(summary_md)
 
-        prompt = f"""
-            Draft a short hiring-manager outreach message.
-
-            Constraints:
-            - 3–5 sentences max
-            - Professional, direct, human
-            - No buzzwords
-            - No overconfidence
-            - No emojis
-            - Assume cold outreach (LinkedIn or email)
-
-            Goal:
-            Express interest in the role, show light company understanding, and ask for a brief conversation.
-
-            JOB DESCRIPTION:
-            {job_text}
-
-            COMPANY CONTEXT (if available):
-            {company_summary}
-
-            RESUME:
-            {resume_text}
-
-            Output plain text only.
-            """.strip()
+        prompt = f"JOB DESCRIPTION:\n{job_text}\n\nCOMPANY CONTEXT (if available):\n{company_summary}"
 
-        msg = client.messages.create(
+        msg = cached_create(
+            client,
             model="claude-3-haiku-20240307",
             max_tokens=400,
+            system=system,
             messages=[{"role": "user", "content": prompt}],
         )
+        print(f"  {usage_line(msg)}")
 
         text = msg.content[0].text.strip()
         if not text:
@@ -0,0 +1,123 @@
+"""
+Benchmark HTML -> text extraction over a corpus of saved pages: the lxml streaming extractor
+(html_text.html_to_text) vs the old BeautifulSoup + html.parser path. Reports throughput (MB/s),
+speedup and output parity (exact matches, plus word-level similarity for pages that differ).
+
+Before timing, every page in scripts/fixtures/html_text/ (entities split across text chunks, inline tags,
+comments, LinkedIn About sections) must give exactly the BeautifulSoup output, for html_to_text and for
+html_to_text_with_sections; --check runs only that parity check and exits 1 on a mismatch.
+
+  python scripts/bench_html_text.py                 # every data/<company>/<date>/raw.html
+  python scripts/bench_html_text.py path/to/dir ... # raw.html / *.html files under these paths
+  python scripts/bench_html_text.py --repeat 5      # time each engine over 5 passes (default 3)
+  python scripts/bench_html_text.py --check         # fixture parity only
+"""
+import difflib
+import sys
+import time
+from pathlib import Path
+
+from html_text import _sections_bs4, etree, html_to_text, html_to_text_bs4, html_to_text_with_sections
+
+DATA_DIR = Path("data")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "html_text"
+SECTION_ATTR = "data-test-id"
+SECTION_VALUES = ("about-us__size", "about-us__industry")
+DEFAULT_REPEAT = 3
+WORST_SHOWN = 5
+
+
+def collect_corpus(paths: list[str]) -> list[Path]:
+    if not paths:
+        return sorted((PROJECT_ROOT / DATA_DIR).glob("*/*/raw.html"))
+    files: list[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(p.rglob("*.html")))
+        elif p.exists():
+            files.append(p)
+    return files
+
+
+def check_fixtures() -> bool:
+    """True if the lxml extractor matches BeautifulSoup exactly on every fixture (mismatches are printed)."""
+    ok = True
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    for f in fixtures:
+        html = f.read_text(encoding="utf-8")
+        checks = [
+            ("text", html_to_text_bs4(html), html_to_text(html)),
+            ("sections", _sections_bs4(html, SECTION_ATTR, SECTION_VALUES),
+             html_to_text_with_sections(html, SECTION_ATTR, SECTION_VALUES)),
+        ]
+        for kind, expected, got in checks:
+            if expected != got:
+                ok = False
+                print(f"  ❌ {f.name} ({kind})\n     bs4:  {expected!r}\n     lxml: {got!r}")
+    print(f"  {'✅' if ok else '❌'} Fixture parity: {len(fixtures)} page(s) in {FIXTURES_DIR.name}/\n")
+    return ok
+
+
+def time_engine(fn, pages: list[str], repeat: int) -> tuple[float, list[str]]:
+    """Best-of-repeat wall time (s) to extract every page, and the outputs of the last pass."""
+    best = float("inf")
+    outputs: list[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = [fn(html) for html in pages]
+        best = min(best, time.perf_counter() - started)
+    return best, outputs
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = DEFAULT_REPEAT
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = max(1, int(args[i + 1]))
+        del args[i : i + 2]
+    if etree is None:
+        print("lxml is not installed; html_to_text would fall back to BeautifulSoup. pip install lxml")
+        raise SystemExit(1)
+
+    check = "--check" in args
+    if check:
+        args.remove("--check")
+    if not check_fixtures():
+        raise SystemExit(1)
+    if check:
+        return
+
+    files = collect_corpus(args)
+    if not files:
+        print("No HTML files found (archive some jobs first, or pass a directory of saved pages).")
+        raise SystemExit(1)
+    pages = [f.read_text(encoding="utf-8", errors="replace") for f in files]
+    total_mb = sum(len(p.encode("utf-8")) for p in pages) / 1e6
+    print(f"📚 {len(pages)} page(s), {total_mb:.1f} MB, best of {repeat} pass(es)\n")
+
+    bs4_s, bs4_out = time_engine(html_to_text_bs4, pages, repeat)
+    lxml_s, lxml_out = time_engine(html_to_text, pages, repeat)
+    print(f"  BeautifulSoup: {bs4_s:7.2f}s  {total_mb / bs4_s:7.1f} MB/s")
+    print(f"  lxml stream:   {lxml_s:7.2f}s  {total_mb / lxml_s:7.1f} MB/s  ({bs4_s / lxml_s:.1f}x faster)\n")
+
+    exact = 0
+    diffs: list[tuple[float, Path, int, int]] = []
+    for f, old, new in zip(files, bs4_out, lxml_out):
+        if old == new:
+            exact += 1
+            continue
+        ratio = difflib.SequenceMatcher(None, old.split(), new.split(), autojunk=False).ratio()
+        diffs.append((ratio, f, len(old), len(new)))
+    print(f"  Parity: {exact}/{len(files)} identical")
+    if diffs:
+        mean = sum(d[0] for d in diffs) / len(diffs)
+        print(f"  {len(diffs)} differ; mean word similarity {mean:.3f}. Least similar:")
+        for ratio, f, old_len, new_len in sorted(diffs, key=lambda d: d[0])[:WORST_SHOWN]:
+            print(f"    {ratio:.3f}  {f}  ({old_len} vs {new_len} chars)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Correctness + cost of the LinkedIn company-page parser (linkedin_parser) over saved pages.
+
+Fixtures live in scripts/fixtures/linkedin/: <name>.html (the page) and <name>.json
+({"header_text": top-card stats text or null, "expected": {"employee_count", "industry"}}), covering
+logged-out About sections, logged-in top cards, face-piles ("Discover all N employees") and authwalls.
+Each fixture is checked against its expected result, then both the parser and the previous
+implementation (kept below as the baseline) are timed on the text stage (after HTML -> text) and end to end.
+
+  python scripts/bench_linkedin_parser.py              # fixtures
+  python scripts/bench_linkedin_parser.py --raw        # plus every LinkedIn page in data/_cache/raw/ (agreement only)
+  python scripts/bench_linkedin_parser.py --repeat 20  # best of 20 passes (default 10)
+"""
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import raw_cache
+from html_text import html_to_text_with_sections
+from linkedin_parser import ABOUT_INDUSTRY, ABOUT_SIZE, parse_company_text
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "linkedin"
+DEFAULT_REPEAT = 10
+
+
+# ---- Previous implementation (inline in batch_extract_metadata), same logic: the baseline for timing and agreement ----
+def _legacy_parse_employee_count(s: str) -> int | None:
+    m = re.search(r"(\d+)[Kk]\s*[-–−―]\s*(\d+)[Kk]?\s+employees?", s, re.I)
+    if m:
+        return int(m.group(1)) * 1000
+    m = re.search(r"(\d+)[Kk]\s+employees?", s, re.I)
+    if m:
+        return int(m.group(1)) * 1000
+    m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*[-–]?\s*(\d{1,3}(?:,\d{3})*)?\s*\+?\s+employees?", s, re.I)
+    if m:
+        return int(m.group(1).replace(",", ""))
+    m = re.search(r"(\d{1,3}(?:,\d{3})*)\s+employees?\s+on\s+LinkedIn", s, re.I)
+    if m:
+        return int(m.group(1).replace(",", ""))
+    return None
+
+
+def _legacy_parse_employee_count_excluding_discover_all(full_text: str) -> int | None:
+    m = re.search(r"(\d+)[Kk]\s*[-–−―]\s*(\d+)[Kk]?\s+employees?", full_text, re.I)
+    if m:
+        return int(m.group(1)) * 1000
+    m = re.search(r"(\d+)[Kk]\s+employees?", full_text, re.I)
+    if m:
+        return int(m.group(1)) * 1000
+    m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*[-–]\s*(\d{1,3}(?:,\d{3})*)\s+employees?", full_text, re.I)
+    if m:
+        return int(m.group(1).replace(",", ""))
+    m = re.search(r"(\d{1,3}(?:,\d{3})*)\s*\+\s+employees?", full_text, re.I)
+    if m:
+        return int(m.group(1).replace(",", ""))
+    discover_all_re = re.compile(r"discover\s+all", re.I)
+
+    def is_face_pile_match(full_text: str, m: re.Match) -> bool:
+        start = max(0, m.start() - 50)
+        return discover_all_re.search(full_text[start : m.start()]) is not None
+
+    for pattern in (r"(\d{1,3}(?:,\d{3})*)\s+employees?", r"(\d{1,3}(?:,\d{3})*)\s+employees?\s+on\s+LinkedIn"):
+        for m in re.finditer(pattern, full_text, re.I):
+            if is_face_pile_match(full_text, m):
+                continue
+            n = int(m.group(1).replace(",", ""))
+            if n < 500 and discover_all_re.search(full_text[max(0, m.start() - 20) : m.end() + 15]):
+                continue
+            return n
+    return None
+
+
+def _legacy_parse_company_text(header_text: str | None, text: str, about: dict[str, str]) -> dict:
+    about_size_text = about.get(ABOUT_SIZE)
+    stats_text = (" ".join(header_text.split())) if header_text else None
+    employee_count = _legacy_parse_employee_count(about_size_text) if about_size_text else None
+    if employee_count is None and stats_text:
+        employee_count = _legacy_parse_employee_count(stats_text)
+    if employee_count is None:
+        employee_count = _legacy_parse_employee_count_excluding_discover_all(text)
+    industry = about.get(ABOUT_INDUSTRY)
+    if not industry:
+        m = re.search(r"Industry\s*[:\s]+([^\n|]+?)(?:\n|\\n|$|\|)", text)
+        if m:
+            industry = m.group(1).strip()
+    if not industry:
+        m = re.search(r"industr[yies]?\s*[:\s]+([^\n|]+?)(?:\n|$|\|)", text, re.I)
+        if m:
+            industry = m.group(1).strip()
+    return {"employee_count": employee_count, "industry": industry}
+
+
+def load_pages(include_raw: bool) -> list[dict]:
+    """[{name, html, header_text, expected (None for raw-cache pages)}]"""
+    pages = []
+    for meta_path in sorted(FIXTURES_DIR.glob("*.json")):
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        pages.append({
+            "name": meta_path.stem,
+            "html": meta_path.with_suffix(".html").read_text(encoding="utf-8"),
+            "header_text": meta.get("header_text"),
+            "expected": meta["expected"],
+        })
+    if include_raw:
+        for url, entry in sorted(raw_cache.latest("linkedin").items()):
+            html = raw_cache.get(entry["sha256"])
+            if html is not None:
+                pages.append({"name": url, "html": html, "header_text": entry["meta"].get("header_text"), "expected": None})
+    return pages
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = DEFAULT_REPEAT
+    if "--repeat" in args:
+        repeat = max(1, int(args[args.index("--repeat") + 1]))
+    pages = load_pages("--raw" in args)
+    if not pages:
+        print(f"No pages found (fixtures in {FIXTURES_DIR}).")
+        raise SystemExit(1)
+    extracted = [html_to_text_with_sections(p["html"], "data-test-id", (ABOUT_SIZE, ABOUT_INDUSTRY)) for p in pages]
+    total_mb = sum(len(p["html"].encode("utf-8")) for p in pages) / 1e6
+    print(f"📚 {len(pages)} page(s), {total_mb:.2f} MB, best of {repeat} pass(es)\n")
+
+    failures = disagree = 0
+    for page, (text, about) in zip(pages, extracted):
+        result = parse_company_text(page["header_text"], text, about)
+        legacy = _legacy_parse_company_text(page["header_text"], text, about)
+        if page["expected"] is not None and result != page["expected"]:
+            failures += 1
+            print(f"  ❌ {page['name']}: got {result}, expected {page['expected']}")
+        elif page["expected"] is not None:
+            print(f"  ✅ {page['name']}: {result['employee_count']} | {result['industry']}")
+        if result["employee_count"] != legacy["employee_count"]:
+            disagree += 1
+            print(f"     ↳ employee_count differs from previous parser: {legacy['employee_count']} → {result['employee_count']}")
+    n_expected = sum(1 for p in pages if p["expected"] is not None)
+    print(f"\n  Fixtures: {n_expected - failures}/{n_expected} as expected; employee_count differs from previous parser on {disagree} page(s)\n")
+
+    def run_text(parse):
+        return lambda: [parse(p["header_text"], text, about) for p, (text, about) in zip(pages, extracted)]
+
+    def run_page(parse):
+        return lambda: [
+            parse(p["header_text"], *html_to_text_with_sections(p["html"], "data-test-id", (ABOUT_SIZE, ABOUT_INDUSTRY)))
+            for p in pages
+        ]
+
+    legacy_text = best_of(run_text(_legacy_parse_company_text), repeat)
+    new_text = best_of(run_text(parse_company_text), repeat)
+    legacy_page = best_of(run_page(_legacy_parse_company_text), max(1, repeat // 2))
+    new_page = best_of(run_page(parse_company_text), max(1, repeat // 2))
+    per_page = 1e6 / len(pages)
+    print(f"  Text stage   previous: {legacy_text * per_page:9.1f} µs/page   parser: {new_text * per_page:9.1f} µs/page  ({legacy_text / new_text:.1f}x)")
+    print(f"  End to end   previous: {legacy_page * per_page:9.1f} µs/page   parser: {new_page * per_page:9.1f} µs/page  ({legacy_page / new_page:.1f}x)\n")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
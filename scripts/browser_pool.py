@@ -0,0 +1,130 @@
+"""
+Long-lived Playwright browser for archiving many postings in one process. Keeps one Chromium
+alive and hands out a fresh context (cookies, storage) per URL, so each row costs one page load
+instead of a Python + Chromium cold start. The browser is relaunched after
+ARCHIVE_BROWSER_MAX_PAGES pages (default 50) or once the Playwright driver and Chromium processes
+use more than ARCHIVE_BROWSER_MAX_RSS_MB of memory (default 1500). Images, fonts, media and tracker
+requests are aborted per request_blocking's policy unless the page is meant for PDF output.
+
+Used by: archive_job_agent (popjobs, archivejobs), render_pdfs.
+"""
+import contextlib
+import os
+import subprocess
+
+from playwright.sync_api import sync_playwright
+
+from request_blocking import install_request_blocking
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_RSS_MB = 1500
+
+
+def _descendant_rss_mb() -> float | None:
+    """Total resident memory (MB) of this process's children and their children, via ps. None if ps is unavailable."""
+    try:
+        out = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    children: dict[int, list[tuple[int, int]]] = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        try:
+            pid, ppid, rss_kb = int(parts[0]), int(parts[1]), int(parts[2])
+        except ValueError:
+            continue
+        children.setdefault(ppid, []).append((pid, rss_kb))
+    total_kb = 0
+    stack = [os.getpid()]
+    while stack:
+        for pid, rss_kb in children.get(stack.pop(), []):
+            total_kb += rss_kb
+            stack.append(pid)
+    return total_kb / 1024
+
+
+class BrowserPool:
+    """One reusable Chromium; use page() for a fresh, isolated page per URL."""
+
+    def __init__(self, max_pages: int | None = None, max_rss_mb: float | None = None):
+        self.max_pages = max_pages or int(os.environ.get("ARCHIVE_BROWSER_MAX_PAGES", DEFAULT_MAX_PAGES))
+        self.max_rss_mb = max_rss_mb or float(os.environ.get("ARCHIVE_BROWSER_MAX_RSS_MB", DEFAULT_MAX_RSS_MB))
+        self._playwright = None
+        self._browser = None
+        self._pages_since_launch = 0
+        self.launches = 0
+        self.pages_served = 0
+        self.requests_blocked = 0
+
+    def _ensure_browser(self):
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = self._playwright.chromium.launch()
+            self._pages_since_launch = 0
+            self.launches += 1
+        return self._browser
+
+    def _close_browser(self) -> None:
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    def _maybe_recycle(self) -> None:
+        if self._browser is None:
+            return
+        reason = None
+        if not self._browser.is_connected():
+            reason = "browser disconnected"
+        elif self._pages_since_launch >= self.max_pages:
+            reason = f"{self._pages_since_launch} pages served"
+        else:
+            rss_mb = _descendant_rss_mb()
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                reason = f"{rss_mb:.0f} MB resident"
+        if reason:
+            print(f"  ♻️ Recycling browser ({reason})")
+            self._close_browser()
+
+    @contextlib.contextmanager
+    def page(self, for_pdf: bool = False, **context_options):
+        """Yield a page in a fresh browser context; the context is closed (and the browser maybe recycled) afterwards.
+        Non-essential requests are blocked; for_pdf=True keeps images so the page prints like the original.
+        context_options are passed to browser.new_context() (e.g. java_script_enabled=False)."""
+        context = self._ensure_browser().new_context(**context_options)
+        blocked = install_request_blocking(context, for_pdf=for_pdf)
+        try:
+            yield context.new_page()
+        finally:
+            try:
+                context.close()
+            except Exception:
+                pass
+            self.requests_blocked += blocked["blocked"]
+            self._pages_since_launch += 1
+            self.pages_served += 1
+            self._maybe_recycle()
+
+    def close(self) -> None:
+        self._close_browser()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,66 @@
+"""
+Offline check of the ATS API fast path (ats_api): starts ats_api_standin on a free port, points
+GREENHOUSE_API_BASE / LEVER_API_BASE / ASHBY_API_BASE at it, and runs fetch_ats_posting for every case in
+scripts/fixtures/ats/cases.json. Each case lists the URL, the expected posting fields (null = the
+fetch must miss, so archiving falls back to the browser) and phrases the archived text must contain
+(posting_to_html -> html_to_text, as archive_job_agent saves it).
+
+  python scripts/check_ats_api.py      # exits 1 on any mismatch
+
+Used by: (manual checks of ats_api).
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import ats_api_standin
+from ats_api import fetch_ats_posting, posting_to_html
+from html_text import html_to_text
+
+CASES_FILE = ats_api_standin.FIXTURES_DIR / "cases.json"
+
+
+def check_case(case: dict) -> list[str]:
+    """Problems found for one case (empty when it passes)."""
+    posting = fetch_ats_posting(case["url"])
+    expected = case["expected"]
+    if expected is None:
+        return [] if posting is None else [f"expected a miss, got {posting.get('source')} posting {posting.get('title')!r}"]
+    if posting is None:
+        return ["fetch returned None"]
+    problems = [
+        f"{key}: expected {value!r}, got {posting.get(key)!r}"
+        for key, value in expected.items()
+        if posting.get(key) != value
+    ]
+    text = html_to_text(posting_to_html(posting))
+    problems += [f"text is missing {phrase!r}" for phrase in case.get("text_contains", []) if phrase not in text]
+    return problems
+
+
+def main():
+    server = ats_api_standin.make_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://%s:%s" % server.server_address[:2]
+    for var in ("GREENHOUSE_API_BASE", "LEVER_API_BASE", "ASHBY_API_BASE"):
+        os.environ[var] = base
+
+    cases = json.loads(Path(CASES_FILE).read_text(encoding="utf-8"))
+    failed = 0
+    try:
+        for case in cases:
+            problems = check_case(case)
+            failed += bool(problems)
+            print(f"  {'❌' if problems else '✅'} {case['url']}")
+            for problem in problems:
+                print(f"      {problem}")
+    finally:
+        server.shutdown()
+    print(f"\n{'❌' if failed else '✅'} ATS API: {len(cases) - failed}/{len(cases)} case(s) passed\n")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
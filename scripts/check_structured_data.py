@@ -0,0 +1,47 @@
+"""
+Offline check of structured_data's OpenGraph trust rules and legal-suffix stripping, against the cases in
+scripts/fixtures/structured_data/cases.json:
+  - open_graph: og:* tags and the (company, title) _from_open_graph must read from them ("" when untrusted);
+  - legal_suffix: company name -> expected strip_legal_suffix() result.
+
+  python scripts/check_structured_data.py      # exits 1 on any mismatch
+
+Used by: (manual checks of structured_data).
+"""
+import json
+from pathlib import Path
+
+from structured_data import _from_open_graph, strip_legal_suffix
+
+CASES_FILE = Path(__file__).resolve().parent / "fixtures" / "structured_data" / "cases.json"
+
+
+def check_open_graph(case: dict) -> list[str]:
+    """Problems found for one OpenGraph case (empty when it passes)."""
+    company, title = _from_open_graph(case["og"])
+    got = {"company": company, "title": title}
+    return [f"{key}: expected {value!r}, got {got[key]!r}" for key, value in case["expected"].items() if got[key] != value]
+
+
+def main():
+    cases = json.loads(CASES_FILE.read_text(encoding="utf-8"))
+    total = failed = 0
+    for case in cases["open_graph"]:
+        problems = check_open_graph(case)
+        total += 1
+        failed += bool(problems)
+        print(f"  {'❌' if problems else '✅'} og:title {case['og'].get('title')!r}")
+        for problem in problems:
+            print(f"      {problem}")
+    for name, expected in cases["legal_suffix"].items():
+        got = strip_legal_suffix(name)
+        total += 1
+        failed += got != expected
+        print(f"  {'❌' if got != expected else '✅'} {name!r} -> {got!r}" + ("" if got == expected else f" (expected {expected!r})"))
+    print(f"\n{'❌' if failed else '✅'} structured data: {total - failed}/{total} case(s) passed\n")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
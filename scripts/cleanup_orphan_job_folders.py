@@ -1,6 +1,7 @@
 """
 Delete data/<company>/<date>/ folders that no longer have a row in the tracker sheet
 (e.g. you deleted the row or didn't apply). Use --dry-run to list would-be-removed folders only.
+Directories starting with "_" or "." (e.g. the data/_cache/ search cache) are never touched.
 
 Alias: cleanup
 """
@@ -14,15 +15,13 @@ from pathlib import Path
 import gspread
 from dotenv import load_dotenv
 
+from company_store import folder_slugs
+
 DATA_DIR = Path("data")
 DATE_APPLIED_HEADER = "date applied"
 DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in (s or "").strip()).strip("-")
-
-
 def parse_date_applied(raw: str) -> str | None:
     raw = (raw or "").strip()
     if not raw:
@@ -81,7 +80,7 @@ def main():
         company = (row[company_col - 1] or "").strip() if company_col <= len(row) else ""
         if not company:
             continue
-        keep.add((slugify(company), date_iso))
+        keep.update((slug, date_iso) for slug in folder_slugs(company))
 
     if not DATA_DIR.exists():
         print("No data/ directory.")
@@ -89,7 +88,7 @@ def main():
 
     removed = 0
     for company_dir in sorted(DATA_DIR.iterdir()):
-        if not company_dir.is_dir():
+        if not company_dir.is_dir() or company_dir.name.startswith(("_", ".")):
             continue
         for date_dir in sorted(company_dir.iterdir()):
             if not date_dir.is_dir() or not DATE_PATTERN.match(date_dir.name):
@@ -105,7 +104,7 @@ def main():
 
     # Remove company directories that are now empty (no date subdirs left).
     for company_dir in sorted(DATA_DIR.iterdir()):
-        if not company_dir.is_dir():
+        if not company_dir.is_dir() or company_dir.name.startswith(("_", ".")):
             continue
         try:
             subs = list(company_dir.iterdir())
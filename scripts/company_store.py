@@ -0,0 +1,255 @@
+"""
+Local company knowledge store (SQLite, data/companies.sqlite3). One row per company, keyed by its
+canonical folder slug (data/<slug>/...), plus:
+  - aliases: every name and slug seen for the company ("Premier, Inc.", "Premier Inc", "premier--inc"),
+    normalized with company_key(), so any spelling resolves to the same company in one lookup;
+  - facts: resolved attributes with their source and when they were recorded: linkedin_url, the LinkedIn
+    profile's own linkedin_employee_count / linkedin_industry, and batchmetadata's resolved employee_count,
+    company_type and company_size_bucket.
+
+Archiving files postings under the known slug for a company name, folder lookups in the batch agents go
+through find_job_dir(), and batchmetadata reads LinkedIn choices and profile facts from here before
+searching or opening LinkedIn.
+
+  python scripts/company_store.py             # list known companies
+  python scripts/company_store.py <name>      # aliases and facts for one company
+  python scripts/company_store.py --import    # register every data/<company>/ folder and legacy LinkedIn choices
+
+Tuning (.env):
+  COMPANY_FACTS_TTL_DAYS  facts older than this are treated as unknown and looked up again (default 90)
+
+Alias: companies
+Used by: archive_job_agent, batch_extract_metadata, batch_archive_from_sheet, populate_jobs,
+cleanup_orphan_job_folders, batch_evaluate_resume_skills_agent, batch_generate_bullets_agent,
+batch_generate_cover_letter_agent.
+"""
+import contextlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DATA_DIR = Path("data")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+COMPANY_DB_FILE = PROJECT_ROOT / "data" / "companies.sqlite3"
+DEFAULT_FACT_TTL_DAYS = 90
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id)
+);
+CREATE TABLE IF NOT EXISTS facts (
+    company_id INTEGER NOT NULL REFERENCES companies(id),
+    key TEXT NOT NULL,
+    value TEXT,
+    source TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (company_id, key)
+);
+"""
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# sqlite3 connections can't be shared across threads; batchmetadata and archiving run several
+_local = threading.local()
+
+
+def slugify(s: str) -> str:
+    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
+
+
+def company_key(name: str) -> str:
+    """Alias key: lowercase words joined by '-', so punctuation and spacing variants of a name (or its slug) match."""
+    return "-".join(_WORD_RE.findall((name or "").lower()))
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != COMPANY_DB_FILE:
+        COMPANY_DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(COMPANY_DB_FILE, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _local.conn, _local.path = conn, COMPANY_DB_FILE
+    return conn
+
+
+@contextlib.contextmanager
+def _write_txn(conn: sqlite3.Connection):
+    """Transaction that takes the write lock up front, so a lookup-then-insert can't race another thread or process."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _company_id(conn: sqlite3.Connection, name: str) -> int | None:
+    key = company_key(name)
+    if not key:
+        return None
+    row = conn.execute("SELECT company_id FROM aliases WHERE alias = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def lookup(name: str) -> str | None:
+    """Canonical slug of the company known by this name or slug, or None if it has never been seen."""
+    conn = _conn()
+    cid = _company_id(conn, name)
+    if cid is None:
+        return None
+    return conn.execute("SELECT slug FROM companies WHERE id = ?", (cid,)).fetchone()[0]
+
+
+def _register(conn: sqlite3.Connection, name: str, slug: str | None) -> int:
+    slug = slug or slugify(name) or "unknown"
+    cid = _company_id(conn, slug)
+    if cid is None:
+        cid = _company_id(conn, name)
+    if cid is None:
+        now = _now()
+        cid = conn.execute(
+            "INSERT INTO companies (slug, name, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (slug, name or slug, now, now),
+        ).lastrowid
+    for alias in {company_key(name), company_key(slug)} - {""}:
+        conn.execute("INSERT OR IGNORE INTO aliases (alias, company_id) VALUES (?, ?)", (alias, cid))
+    return cid
+
+
+def register(name: str, slug: str | None = None) -> str:
+    """Record name (and slug, defaulting to slugify(name)) as aliases of one company, creating it if neither
+    is known. An alias already pointing at another company is left alone. Returns the canonical slug."""
+    conn = _conn()
+    with _write_txn(conn):
+        cid = _register(conn, name, slug)
+        return conn.execute("SELECT slug FROM companies WHERE id = ?", (cid,)).fetchone()[0]
+
+
+def folder_slug(name: str) -> str:
+    """Folder slug to archive this company under: the known canonical slug, else slugify(name)."""
+    return lookup(name) or slugify(name)
+
+
+def folder_slugs(name: str) -> list[str]:
+    """Every folder slug this company name may be archived under, canonical first."""
+    return list(dict.fromkeys(s for s in (lookup(name), slugify(name), company_key(name)) if s))
+
+
+def find_job_dir(company: str, date_iso: str, data_dir: Path = DATA_DIR) -> Path:
+    """data_dir/<slug>/<date_iso> for the first of folder_slugs(company) that has a job.txt, else the
+    canonical path (which may not exist yet)."""
+    slugs = folder_slugs(company) or ["unknown"]
+    for slug in slugs:
+        if (data_dir / slug / date_iso / "job.txt").exists():
+            return data_dir / slug / date_iso
+    return data_dir / slugs[0] / date_iso
+
+
+def get_facts(name: str, max_age_days: float | None = None) -> dict:
+    """{key: value} facts for the company, omitting those older than max_age_days
+    (default COMPANY_FACTS_TTL_DAYS; float("inf") = any age). {} for an unknown company."""
+    if max_age_days is None:
+        max_age_days = float(os.environ.get("COMPANY_FACTS_TTL_DAYS", DEFAULT_FACT_TTL_DAYS))
+    conn = _conn()
+    cid = _company_id(conn, name)
+    if cid is None:
+        return {}
+    cutoff = ""
+    if max_age_days != float("inf"):
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+    rows = conn.execute(
+        "SELECT key, value FROM facts WHERE company_id = ? AND updated_at >= ?", (cid, cutoff)
+    ).fetchall()
+    return {key: json.loads(value) for key, value in rows}
+
+
+def companies_with_fact(key: str, value) -> list[str]:
+    """Slugs of companies whose fact key currently equals value (any age)."""
+    rows = _conn().execute(
+        "SELECT c.slug FROM facts f JOIN companies c ON c.id = f.company_id WHERE f.key = ? AND f.value = ?",
+        (key, json.dumps(value)),
+    ).fetchall()
+    return [slug for (slug,) in rows]
+
+
+def set_facts(name: str, facts: dict, source: str = "") -> None:
+    """Store facts (None values skipped) for the company, registering it if new."""
+    facts = {k: v for k, v in facts.items() if v is not None}
+    if not facts:
+        return
+    conn = _conn()
+    now = _now()
+    with _write_txn(conn):
+        cid = _company_id(conn, name)
+        if cid is None:
+            cid = _register(conn, name, None)
+        conn.executemany(
+            "INSERT OR REPLACE INTO facts (company_id, key, value, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(cid, k, json.dumps(v), source, now) for k, v in facts.items()],
+        )
+        conn.execute("UPDATE companies SET updated_at = ? WHERE id = ?", (now, cid))
+
+
+def _import_existing(data_dir: Path = DATA_DIR) -> None:
+    registered = 0
+    if data_dir.exists():
+        for company_dir in sorted(data_dir.iterdir()):
+            if company_dir.is_dir() and not company_dir.name.startswith(("_", ".")):
+                register(company_dir.name.replace("-", " ").title(), company_dir.name)
+                registered += 1
+    choices_file = PROJECT_ROOT / "data" / "_cache" / "linkedin_choices.json"
+    choices = json.loads(choices_file.read_text(encoding="utf-8")) if choices_file.exists() else {}
+    for slug, entry in choices.items():
+        if (entry or {}).get("url") and "linkedin_url" not in get_facts(slug, max_age_days=float("inf")):
+            set_facts(slug, {"linkedin_url": entry["url"]}, source="linkedin_choices.json")
+    print(f"✅ Registered {registered} company folder(s) and {len(choices)} LinkedIn choice(s) in {COMPANY_DB_FILE}\n")
+
+
+def main():
+    args = sys.argv[1:]
+    if "--import" in args:
+        _import_existing()
+        return
+    conn = _conn()
+    if args:
+        slug = lookup(" ".join(args))
+        if slug is None:
+            raise SystemExit(f"Unknown company: {' '.join(args)!r}")
+        cid, name, updated_at = conn.execute("SELECT id, name, updated_at FROM companies WHERE slug = ?", (slug,)).fetchone()
+        aliases = [a for (a,) in conn.execute("SELECT alias FROM aliases WHERE company_id = ? ORDER BY alias", (cid,))]
+        print(f"{name}  (data/{slug}/, updated {updated_at})")
+        print(f"  aliases: {', '.join(aliases)}")
+        for key, value, source, fact_at in conn.execute(
+            "SELECT key, value, source, updated_at FROM facts WHERE company_id = ? ORDER BY key", (cid,)
+        ):
+            print(f"  {key}: {json.loads(value)}  [{source or '?'}, {fact_at}]")
+        return
+    rows = conn.execute(
+        "SELECT c.slug, c.name, COUNT(f.key) FROM companies c LEFT JOIN facts f ON f.company_id = c.id "
+        "GROUP BY c.id ORDER BY c.slug"
+    ).fetchall()
+    for slug, name, n_facts in rows:
+        print(f"  {slug:<32} {name:<32} {n_facts} fact(s)")
+    print(f"\n{len(rows)} compan{'y' if len(rows) == 1 else 'ies'} in {COMPANY_DB_FILE}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Concurrent archiving for popjobs and archivejobs. Runs up to ARCHIVE_CONCURRENCY postings at once
+(default 4) with at most ARCHIVE_PER_HOST pages in flight per host (default 2), so a backlog of
+Greenhouse / Lever / Workday links fetches in parallel without hammering one board. Results are
+yielded in input order so the caller can write sheet updates row by row.
+
+Playwright's sync API is bound to the thread that started it, so each worker thread owns its own
+BrowserPool. ARCHIVE_CONCURRENCY=1 archives strictly one at a time. Two rows for the same company and date
+share one data/<company>/<date>/ folder; archive_job writes it under a per-folder lock, so their files never mix.
+"""
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from urllib.parse import urlparse
+
+from archive_job_agent import DATA_DIR, archive_job
+from browser_pool import BrowserPool
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PER_HOST = 2
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class _HostScheduler:
+    """Hands out pending jobs whose host is below the per-host limit; blocks until one is available."""
+
+    def __init__(self, jobs: list[tuple[str, str]], per_host: int):
+        self._pending = list(enumerate(jobs))
+        self._active: dict[str, int] = {}
+        self._per_host = per_host
+        self._cond = threading.Condition()
+
+    def take(self) -> tuple[int, tuple[str, str]] | None:
+        with self._cond:
+            while self._pending:
+                for pos, (i, job) in enumerate(self._pending):
+                    host = _host(job[0])
+                    if self._active.get(host, 0) < self._per_host:
+                        self._active[host] = self._active.get(host, 0) + 1
+                        del self._pending[pos]
+                        return i, job
+                self._cond.wait()
+            return None
+
+    def release(self, url: str) -> None:
+        with self._cond:
+            self._active[_host(url)] -= 1
+            self._cond.notify_all()
+
+
+def archive_in_order(
+    jobs: list[tuple[str, str]],
+    data_dir: Path = DATA_DIR,
+    concurrency: int | None = None,
+    per_host: int | None = None,
+    infer=None,
+):
+    """Archive (url, folder_date) jobs concurrently. Yields (job, result, error) in input order,
+    where result is archive_job's return value (None = posting not found) and error is the exception if it failed.
+    infer is passed through to archive_job (popjobs' combined company / title / metadata extraction)."""
+    if not jobs:
+        return
+    concurrency = max(1, concurrency or int(os.environ.get("ARCHIVE_CONCURRENCY", DEFAULT_CONCURRENCY)))
+    per_host = max(1, per_host or int(os.environ.get("ARCHIVE_PER_HOST", DEFAULT_PER_HOST)))
+    futures: list[Future] = [Future() for _ in jobs]
+    scheduler = _HostScheduler(jobs, per_host)
+
+    def worker():
+        with BrowserPool() as pool:
+            while True:
+                taken = scheduler.take()
+                if taken is None:
+                    return
+                i, (url, folder_date) = taken
+                try:
+                    futures[i].set_result(archive_job(url, folder_date, pool, data_dir=data_dir, infer=infer))
+                except Exception as e:
+                    futures[i].set_exception(e)
+                finally:
+                    scheduler.release(url)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(concurrency, len(jobs)))]
+    for t in threads:
+        t.start()
+    for job, fut in zip(jobs, futures):
+        try:
+            yield job, fut.result(), None
+        except Exception as e:
+            yield job, None, e
+    for t in threads:
+        t.join()
@@ -1,9 +1,10 @@
 """
 Evaluate the TECHNICAL SKILLS section of the resume for a specific job. Writes
 <job_folder>/skills_recommendations.json (omit/add recommendations tailored to the JD).
-No args or today/YYYY-MM-DD delegates to batch script.
+No args, today/YYYY-MM-DD or --batch-api delegates to batch script (which reuses skills_request /
+finish_skills / write_skills for --batch-api runs).
 
-Alias: evalskills [today|YYYY-MM-DD] or evalskills data/<company>/<date> or evalskills <company_slug>
+Alias: evalskills [today|YYYY-MM-DD] [--batch-api] or evalskills data/<company>/<date> or evalskills <company_slug>
 """
 import json
 import os
@@ -15,6 +16,9 @@ from pathlib import Path
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from job_text import read_job_text
+from llm_cache import cacheable_system, cached_create, forget, usage_line
+
 OUTPUT_FILE = "skills_recommendations.json"
 
 
@@ -83,13 +87,69 @@ def parse_json(raw: str) -> dict:
         raise ValueError(f"Invalid JSON: {e}. First 500 chars: {json_str[:500]!r}") from e
 
 
+def _skills_system(resume_text: str) -> list[dict]:
+    """Instructions + resume: the same for every job, so it is sent as a cached system prefix."""
+    instructions = f"""
+You are evaluating the candidate's TECHNICAL SKILLS section for the job in the user message. The candidate's base resume is TOO LONG (often by nearly half a page). Your main job is to recommend what to CUT so the skills section is shorter and tightly aligned to THIS role.
+
+**Scope of TECHNICAL SKILLS:** The TECHNICAL SKILLS section is the block that starts with the line "TECHNICAL SKILLS" and ends right before the line "PROFESSIONAL EXPERIENCE". It includes every subsection and line in between: AI-Augmented Development, Programming Languages, Frameworks & Libraries, Databases (if present), Tools & Cloud Services, Development Practices, and any other lines. You MUST review every one of these lines—do not skip Development Practices or any subsection.
+
+Your tasks:
+1. **Skills to consider omitting** — Consider ONLY the TECHNICAL SKILLS block (as defined above). List every skill or phrase from that block that is low relevance for THIS job, redundant, or dilutes focus. CRITICAL: Only list items that actually appear in the TECHNICAL SKILLS block. Use the exact phrase as it appears there (e.g. "PHP", "Kibana", "REST APIs"). Do NOT recommend omitting anything that appears only in the rest of the resume (e.g. in experience bullets)—if a tech appears in bullets but not in TECHNICAL SKILLS, do not list it under omit. Aim for 8–18 items. For each item include:
+   - "skill": exact phrase as it appears in the TECHNICAL SKILLS block.
+   - "reason": one sentence tied to the job description (why it's safe to cut for this role).
+   - "priority": one of "cut_first", "recommended", or "optional".
+2. **Skills to consider adding** — Skills the JD explicitly or strongly implies that the candidate clearly has (from experience/projects on the resume) but did NOT list in the TECHNICAL SKILLS block. CRITICAL: Before suggesting any add, verify that the skill does NOT already appear anywhere in the TECHNICAL SKILLS block—check every line including Programming Languages, Tools & Cloud Services, Development Practices, etc. (e.g. if SQL or AWS already appear there, do not suggest adding them). Only suggest skills they can honestly claim. 2–6 items, or empty array if none.
+
+Return ONLY valid JSON with this schema (no markdown, no code fences). Escape double quotes in strings with backslash; do not escape apostrophes (e.g. write "candidate's" not "candidate\'s"). Do not use double quotes inside string values—rephrase or use apostrophes (e.g. "the candidate's experience" not "the \"best\" option"). Do not include literal newlines inside any string value; use a space or keep the sentence on one line.
+
+{{
+  "skills_to_consider_omitting": [
+    {{ "skill": "<exact phrase from resume>", "reason": "<why for this job>", "priority": "cut_first" or "recommended" or "optional" }}
+  ],
+  "skills_to_consider_adding": [
+    {{ "skill": "<skill name>", "reason": "<why for this job / where on resume>" }}
+  ]
+}}
+
+If there are no suggestions for adding, use an empty array. For omitting, be THOROUGH but only from the TECHNICAL SKILLS block: list every skill in that block that is not clearly relevant to this job. Do not list skills that appear only in experience bullets.
+""".strip()
+
+    return cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text[:20000]}")
+
+
+def skills_request(job_text: str, resume_text: str) -> dict:
+    """messages.create kwargs for one job's skills evaluation."""
+    return {
+        "model": "claude-3-haiku-20240307",
+        "max_tokens": 4096,
+        "system": _skills_system(resume_text),
+        "messages": [{"role": "user", "content": f"JOB DESCRIPTION:\n{job_text[:30000]}"}],
+    }
+
+
+def finish_skills(raw: str) -> dict:
+    """Parsed evaluation with both lists present; ValueError if the output isn't JSON."""
+    data = parse_json(raw)
+    for key in ("skills_to_consider_omitting", "skills_to_consider_adding"):
+        if key not in data or not isinstance(data[key], list):
+            data[key] = []
+    return data
+
+
+def write_skills(job_dir: Path, data: dict) -> Path:
+    out_path = job_dir / OUTPUT_FILE
+    out_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return out_path
+
+
 def main():
     script_dir = Path(__file__).resolve().parent
     batch_script = script_dir / "batch_evaluate_resume_skills_agent.py"
 
-    # No args → batch for today (so "evalskills" works whether alias points here or at batch script)
-    if len(sys.argv) == 1:
-        subprocess.run([sys.executable, str(batch_script)], check=True)
+    # No args (or --batch-api) → batch script (so "evalskills" works whether alias points here or at batch script)
+    if len(sys.argv) == 1 or "--batch-api" in sys.argv:
+        subprocess.run([sys.executable, str(batch_script), *sys.argv[1:]], check=True)
         return
     if len(sys.argv) != 2:
         print(
@@ -119,7 +179,6 @@ def main():
         raise SystemExit(1)
 
     load_dotenv()
-    job_txt = job_dir / "job.txt"
     from resume_loader import get_resume_text
     try:
         resume_text = get_resume_text()
@@ -127,61 +186,21 @@ def main():
         print(str(e), file=sys.stderr)
         raise SystemExit(1)
 
-    job_text = job_txt.read_text(encoding="utf-8")
+    job_text = read_job_text(job_dir)
 
     client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    request = skills_request(job_text, resume_text)
+    msg = cached_create(client, **request)
+    print(usage_line(msg), file=sys.stderr)
 
-    prompt = f"""
-You are evaluating the candidate's TECHNICAL SKILLS section for a specific job. The candidate's base resume is TOO LONG (often by nearly half a page). Your main job is to recommend what to CUT so the skills section is shorter and tightly aligned to THIS role.
-
-**Scope of TECHNICAL SKILLS:** The TECHNICAL SKILLS section is the block that starts with the line "TECHNICAL SKILLS" and ends right before the line "PROFESSIONAL EXPERIENCE". It includes every subsection and line in between: AI-Augmented Development, Programming Languages, Frameworks & Libraries, Databases (if present), Tools & Cloud Services, Development Practices, and any other lines. You MUST review every one of these lines—do not skip Development Practices or any subsection.
-
-Your tasks:
-1. **Skills to consider omitting** — Consider ONLY the TECHNICAL SKILLS block (as defined above). List every skill or phrase from that block that is low relevance for THIS job, redundant, or dilutes focus. CRITICAL: Only list items that actually appear in the TECHNICAL SKILLS block. Use the exact phrase as it appears there (e.g. "PHP", "Kibana", "REST APIs"). Do NOT recommend omitting anything that appears only in the rest of the resume (e.g. in experience bullets)—if a tech appears in bullets but not in TECHNICAL SKILLS, do not list it under omit. Aim for 8–18 items. For each item include:
-   - "skill": exact phrase as it appears in the TECHNICAL SKILLS block.
-   - "reason": one sentence tied to the job description (why it's safe to cut for this role).
-   - "priority": one of "cut_first", "recommended", or "optional".
-2. **Skills to consider adding** — Skills the JD explicitly or strongly implies that the candidate clearly has (from experience/projects on the resume) but did NOT list in the TECHNICAL SKILLS block. CRITICAL: Before suggesting any add, verify that the skill does NOT already appear anywhere in the TECHNICAL SKILLS block—check every line including Programming Languages, Tools & Cloud Services, Development Practices, etc. (e.g. if SQL or AWS already appear there, do not suggest adding them). Only suggest skills they can honestly claim. 2–6 items, or empty array if none.
-
-Return ONLY valid JSON with this schema (no markdown, no code fences). Escape double quotes in strings with backslash; do not escape apostrophes (e.g. write "candidate's" not "candidate\'s"). Do not use double quotes inside string values—rephrase or use apostrophes (e.g. "the candidate's experience" not "the \"best\" option"). Do not include literal newlines inside any string value; use a space or keep the sentence on one line.
-
-{{
-  "skills_to_consider_omitting": [
-    {{ "skill": "<exact phrase from resume>", "reason": "<why for this job>", "priority": "cut_first" or "recommended" or "optional" }}
-  ],
-  "skills_to_consider_adding": [
-    {{ "skill": "<skill name>", "reason": "<why for this job / where on resume>" }}
-  ]
-}}
-
-If there are no suggestions for adding, use an empty array. For omitting, be THOROUGH but only from the TECHNICAL SKILLS block: list every skill in that block that is not clearly relevant to this job. Do not list skills that appear only in experience bullets.
-
-JOB DESCRIPTION:
-{job_text[:30000]}
-
-RESUME:
-{resume_text[:20000]}
-""".strip()
-
-    msg = client.messages.create(
-        model="claude-3-haiku-20240307",
-        max_tokens=4096,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    raw = (msg.content[0].text or "").strip()
     try:
-        data = parse_json(raw)
+        data = finish_skills((msg.content[0].text or "").strip())
     except ValueError as e:
+        forget(request)
         print(f"Parse error: {e}", file=sys.stderr)
         raise SystemExit(1)
 
-    for key in ("skills_to_consider_omitting", "skills_to_consider_adding"):
-        if key not in data or not isinstance(data[key], list):
-            data[key] = []
-
-    out_path = job_dir / OUTPUT_FILE
-    out_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    out_path = write_skills(job_dir, data)
     print(f"\n📋 Wrote {out_path}\n")
 
 
@@ -4,7 +4,7 @@ Uses neutral web search (employee count / headcount); derives company_type and c
 employee count when available, else LLM fallback. Outputs JSON only (no sheet write). Sheet dropdowns
 should include UNKNOWN.
 
-Invoked by: popjobs, batchmetadata.
+Invoked by: batchmetadata (popjobs calls extract_metadata_for_job_dir in-process).
 """
 import json
 import sys
@@ -13,7 +13,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 # Extraction logic lives in batch_extract_metadata; this script is the single-job entry point.
-from batch_extract_metadata import extract_metadata_for_job_dir
+from batch_extract_metadata import close_linkedin_fetcher, extract_metadata_for_job_dir
 
 
 def main():
@@ -28,7 +28,10 @@ def main():
         print(f"No job.txt at {job_dir}", file=sys.stderr)
         raise SystemExit(2)
 
-    data, _ = extract_metadata_for_job_dir(job_dir)
+    try:
+        data, _, _ = extract_metadata_for_job_dir(job_dir)
+    finally:
+        close_linkedin_fetcher()
     print(json.dumps(data))
 
 
@@ -1,7 +1,8 @@
 """
 Generate tailored resume bullets for a single job folder. Writes resume_bullets.json with placement
 (section, role, replace/append) and bullets to add/remove. Two-pass: (1) draft JSON, (2) validate
-and clean against resume + JD. Single-job entry point; no args or date delegates to batch script.
+and clean against resume + JD. Single-job entry point; no args or date delegates to batch script. The request builders and parsers
+(draft_request / finish_draft, validation_request / finish_validation) are shared with genbullets --batch-api.
 
 Invoked by: genbullets (batch). Single job: genbullets data/<company>/<date>
 """
@@ -15,6 +16,16 @@ from pathlib import Path
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from job_text import read_job_text
+from llm_cache import cacheable_system, cached_create, forget, usage_line
+
+MODEL = "claude-sonnet-4-6"
+MAX_TOKENS_DRAFT = 4000
+MAX_TOKENS_VALIDATION = 6000
+OUTPUT_FILE = "resume_bullets.json"
+DRAFT_RETRY_NOTE = "Important: Return only valid JSON. Inside every string value, escape double quotes with \\ and do not include literal newlines; use \\n for line breaks if needed."
+VALIDATION_RETRY_NOTE = "Important: Return only valid JSON. Escape quotes in strings; no literal newlines in string values."
+
 
 def strip_markdown_code_fences(text: str) -> str:
     """Remove ```json ... ``` or ``` ... ``` wrappers."""
@@ -115,11 +126,12 @@ def resolve_job_dir(arg: str) -> Path:
     )
 
 
-def _validation_prompt(job_text: str, resume_text: str, first_pass_json: str) -> str:
-    return f"""
+def _validation_system(resume_text: str) -> list[dict]:
+    """Validation-pass instructions + resume: the same for every job, so it is sent as a cached system prefix."""
+    instructions = f"""
 You are a strict editor validating resume bullet recommendations from a first-pass model.
 
-You have the JOB DESCRIPTION, the full RESUME (verbatim), and the FIRST-PASS JSON output below.
+You have the full RESUME (verbatim) below, and the JOB DESCRIPTION and FIRST-PASS JSON output in the user message.
 
 Your job: produce a CLEANED version that applies ALL rules. Remove invalid entries, fix replace_bullet_index when you can find the exact resume line, and collect every issue in "warnings".
 
@@ -158,90 +170,13 @@ Return ONLY valid JSON with this exact shape (no markdown, no code fences):
 }}
 
 Escape double quotes inside strings with backslash. No literal newlines inside JSON string values.
-
-JOB DESCRIPTION:
-{job_text}
-
-RESUME:
-{resume_text}
-
-FIRST-PASS JSON:
-{first_pass_json}
 """.strip()
+    return cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text}")
 
 
-def run_validation_pass(
-    client: Anthropic,
-    job_text: str,
-    resume_text: str,
-    first_pass_data: dict,
-    model: str,
-    max_tokens: int,
-) -> dict:
-    first_pass_json = json.dumps(first_pass_data, indent=2, ensure_ascii=False)
-    prompt = _validation_prompt(job_text, resume_text, first_pass_json)
-    for attempt in range(2):
-        msg = client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw = (msg.content[0].text or "").strip()
-        try:
-            out = parse_bullets_json(raw)
-            break
-        except ValueError as e:
-            if attempt == 0:
-                print("  Validation pass: parse failed, retrying once…", file=sys.stderr)
-                prompt = prompt + "\n\nImportant: Return only valid JSON. Escape quotes in strings; no literal newlines in string values."
-            else:
-                print(f"Validation pass parse error: {e}", file=sys.stderr)
-                raise SystemExit(1)
-    if "tailored_bullets" not in out or not isinstance(out["tailored_bullets"], list):
-        print("Validation pass did not return tailored_bullets array.", file=sys.stderr)
-        raise SystemExit(1)
-    if "bullets_to_remove" not in out or not isinstance(out["bullets_to_remove"], list):
-        out["bullets_to_remove"] = []
-    if "warnings" not in out or not isinstance(out["warnings"], list):
-        out["warnings"] = []
-    else:
-        normalized: list[dict] = []
-        for w in out["warnings"]:
-            if isinstance(w, str) and w.strip():
-                normalized.append({"message": w.strip()})
-            elif isinstance(w, dict) and isinstance(w.get("message"), str) and w["message"].strip():
-                normalized.append({"message": w["message"].strip()})
-        out["warnings"] = normalized
-    if "append_skipped_reason" not in out:
-        out["append_skipped_reason"] = first_pass_data.get("append_skipped_reason", "")
-    return out
-
-
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scripts/generate_bullets_agent.py <job_folder_path|company_slug>")
-        raise SystemExit(1)
-
-    load_dotenv()
-
-    try:
-        job_dir = resolve_job_dir(sys.argv[1])
-    except FileNotFoundError as e:
-        print(str(e), file=sys.stderr)
-        raise SystemExit(1)
-
-    sys.path.insert(0, str(Path(__file__).resolve().parent))
-    from resume_loader import get_resume_text
-
-    job_text = (job_dir / "job.txt").read_text(encoding="utf-8")
-    resume_text = get_resume_text()
-
-    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
-    model = "claude-sonnet-4-6"
-    max_tokens_draft = 4000
-    max_tokens_validation = 6000
-
-    prompt = f"""
+def _draft_system(resume_text: str) -> list[dict]:
+    """Draft-pass instructions + resume: the same for every job, so it is sent as a cached system prefix."""
+    instructions = f"""
         You are tailoring resume bullets for a specific job. The candidate's base resume is TOO LONG (often by nearly half a page). Your output must help them both add/rewrite high-impact bullets AND cut enough content so the tailored resume fits.
 
         CRITICAL — Do NOT invent experience. Every tailored bullet MUST describe work that is explicitly or clearly implied on the resume. Do not add bullets about technologies, tools, or responsibilities the candidate has not used or done (e.g. do not add ASP.NET, C#, Windows Server, or similar if they do not appear on the resume). Never assume or invent that the candidate worked with the hiring company's products, internal teams, or JD-mentioned tools (e.g. "internal teams", "Claude Desktop", "Cowork", "Agent SDK") unless that experience is explicitly on the resume—do not infer collaboration or usage from the job description or company name. If the job description asks for something the resume does not support, do not invent a bullet for it; omit it or replace a less relevant bullet with one that reframes the candidate's actual experience. Each bullet must be grounded in specific resume content: same role/project, same or closely related technologies, same type of work.
@@ -285,55 +220,137 @@ def main():
         - Use "replace" when a tailored bullet is a better fit than an existing bullet; use "append" when adding to a role/project that has few bullets. You must include at least 2–4 "replace" actions (not only append): identify existing bullets that are weak for this JD and replace them with tailored ones. replace_bullet_index: when action is "replace", use the full bullet text exactly as it appears on the resume (copy the whole line).
         - bullets_to_remove: List only 3–6 existing resume bullets that are clearly redundant or off-focus. Do not remove more than you replace. bullet_index: use the full bullet text exactly as it appears on the resume (copy the whole line). Reference each by section, role_or_project (exact match), bullet_index (full bullet text), and reason.
 
-        JOB DESCRIPTION:
-        {job_text}
-
-        RESUME:
-        {resume_text}
+        The JOB DESCRIPTION is in the user message.
         """.strip()
+    return cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text}")
+
+
+def _with_note(request: dict, note: str) -> dict:
+    """request with note appended to its user message (the parse-failure retry)."""
+    content = request["messages"][0]["content"] + "\n\n" + note
+    return {**request, "messages": [{"role": "user", "content": content}]}
+
+
+def draft_request(job_text: str, resume_text: str) -> dict:
+    """messages.create kwargs for the first (draft) pass."""
+    return {
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS_DRAFT,
+        "system": _draft_system(resume_text),
+        "messages": [{"role": "user", "content": f"JOB DESCRIPTION:\n{job_text}"}],
+    }
+
+
+def finish_draft(raw: str) -> dict:
+    """Parsed draft-pass output; ValueError if it isn't JSON or has no tailored_bullets array."""
+    data = parse_bullets_json(raw)
+    if "tailored_bullets" not in data or not isinstance(data["tailored_bullets"], list):
+        raise ValueError("Model did not return tailored_bullets array.")
+    # Ensure bullets_to_remove exists (default to empty array if missing)
+    if "bullets_to_remove" not in data:
+        data["bullets_to_remove"] = []
+    elif not isinstance(data["bullets_to_remove"], list):
+        print("Warning: bullets_to_remove should be an array, defaulting to empty.", file=sys.stderr)
+        data["bullets_to_remove"] = []
+    return data
+
+
+def validation_request(job_text: str, resume_text: str, first_pass_data: dict) -> dict:
+    """messages.create kwargs for the validation pass over a parsed draft."""
+    first_pass_json = json.dumps(first_pass_data, indent=2, ensure_ascii=False)
+    return {
+        "model": MODEL,
+        "max_tokens": MAX_TOKENS_VALIDATION,
+        "system": _validation_system(resume_text),
+        "messages": [{"role": "user", "content": f"JOB DESCRIPTION:\n{job_text}\n\nFIRST-PASS JSON:\n{first_pass_json}"}],
+    }
+
 
+def finish_validation(raw: str, first_pass_data: dict) -> dict:
+    """Parsed, normalized validation-pass output; ValueError if it isn't JSON or has no tailored_bullets array."""
+    out = parse_bullets_json(raw)
+    if "tailored_bullets" not in out or not isinstance(out["tailored_bullets"], list):
+        raise ValueError("Validation pass did not return tailored_bullets array.")
+    if "bullets_to_remove" not in out or not isinstance(out["bullets_to_remove"], list):
+        out["bullets_to_remove"] = []
+    if "warnings" not in out or not isinstance(out["warnings"], list):
+        out["warnings"] = []
+    else:
+        normalized: list[dict] = []
+        for w in out["warnings"]:
+            if isinstance(w, str) and w.strip():
+                normalized.append({"message": w.strip()})
+            elif isinstance(w, dict) and isinstance(w.get("message"), str) and w["message"].strip():
+                normalized.append({"message": w["message"].strip()})
+        out["warnings"] = normalized
+    if "append_skipped_reason" not in out:
+        out["append_skipped_reason"] = first_pass_data.get("append_skipped_reason", "")
+    return out
+
+
+def run_validation_pass(client: Anthropic, job_text: str, resume_text: str, first_pass_data: dict) -> dict:
+    request = validation_request(job_text, resume_text, first_pass_data)
     for attempt in range(2):
-        msg = client.messages.create(
-            model=model,
-            max_tokens=max_tokens_draft,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        raw = (msg.content[0].text or "").strip()
+        msg = cached_create(client, **request)
+        print(usage_line(msg, "Validation"), file=sys.stderr)
         try:
-            data = parse_bullets_json(raw)
-            print(f"🪙 Output tokens used: {msg.usage.output_tokens}", file=sys.stderr)
-            break
+            return finish_validation((msg.content[0].text or "").strip(), first_pass_data)
         except ValueError as e:
+            forget(request)
             if attempt == 0:
-                print("  Parse failed, retrying once…", file=sys.stderr)
-                prompt = prompt + "\n\nImportant: Return only valid JSON. Inside every string value, escape double quotes with \\ and do not include literal newlines; use \\n for line breaks if needed."
+                print("  Validation pass: parse failed, retrying once…", file=sys.stderr)
+                request = _with_note(request, VALIDATION_RETRY_NOTE)
             else:
-                print(f"Parse error: {e}", file=sys.stderr)
+                print(f"Validation pass error: {e}", file=sys.stderr)
                 raise SystemExit(1)
 
-    if "tailored_bullets" not in data or not isinstance(data["tailored_bullets"], list):
-        print("Model did not return tailored_bullets array.", file=sys.stderr)
+
+def write_bullets(job_dir: Path, data: dict) -> Path:
+    out_path = job_dir / OUTPUT_FILE
+    out_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return out_path
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/generate_bullets_agent.py <job_folder_path|company_slug>")
         raise SystemExit(1)
 
-    # Ensure bullets_to_remove exists (default to empty array if missing)
-    if "bullets_to_remove" not in data:
-        data["bullets_to_remove"] = []
-    elif not isinstance(data["bullets_to_remove"], list):
-        print("Warning: bullets_to_remove should be an array, defaulting to empty.", file=sys.stderr)
-        data["bullets_to_remove"] = []
+    load_dotenv()
+
+    try:
+        job_dir = resolve_job_dir(sys.argv[1])
+    except FileNotFoundError as e:
+        print(str(e), file=sys.stderr)
+        raise SystemExit(1)
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from resume_loader import get_resume_text
+
+    job_text = read_job_text(job_dir)
+    resume_text = get_resume_text()
+
+    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    request = draft_request(job_text, resume_text)
+    for attempt in range(2):
+        msg = cached_create(client, **request)
+        try:
+            data = finish_draft((msg.content[0].text or "").strip())
+            print(usage_line(msg, "Draft"), file=sys.stderr)
+            break
+        except ValueError as e:
+            forget(request)
+            if attempt == 0:
+                print("  Parse failed, retrying once…", file=sys.stderr)
+                request = _with_note(request, DRAFT_RETRY_NOTE)
+            else:
+                print(f"Parse error: {e}", file=sys.stderr)
+                raise SystemExit(1)
 
     print("  Running validation pass…", file=sys.stderr)
-    data = run_validation_pass(
-        client,
-        job_text,
-        resume_text,
-        data,
-        model=model,
-        max_tokens=max_tokens_validation,
-    )
+    data = run_validation_pass(client, job_text, resume_text, data)
 
-    out_path = job_dir / "resume_bullets.json"
-    out_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    out_path = write_bullets(job_dir, data)
     print(f"\n📝 Wrote {out_path}\n")
 
 
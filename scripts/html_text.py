@@ -0,0 +1,127 @@
+"""
+Fast HTML -> plain text for archived postings and LinkedIn company pages. Streams the document
+through lxml's parser-target interface: text is collected as it is parsed and script / style /
+noscript content is dropped, without building a tree (BeautifulSoup + html.parser was the slowest
+part of archiving multi-megabyte Workday and LinkedIn DOMs). Output matches the old
+BeautifulSoup get_text() path: text nodes joined by spaces, whitespace collapsed. lxml reports a text
+node in several data() chunks (entities such as &amp; arrive on their own), so chunks are joined into one
+run and a separator is only added at tag and comment boundaries: "AT&amp;T" stays "AT&T".
+
+Falls back to BeautifulSoup when lxml is not installed. bench_html_text compares the two.
+
+Used by: archive_job_agent, linkedin_parser (LinkedIn company pages), bench_html_text.
+"""
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional speedup
+    etree = None
+
+SKIP_TAGS = frozenset(("script", "style", "noscript"))
+
+
+class _TextTarget:
+    """lxml parser target: collects text outside SKIP_TAGS, plus the text of elements whose
+    capture_attr is one of capture_values (first match per value)."""
+
+    def __init__(self, capture_attr: str | None = None, capture_values: frozenset = frozenset()):
+        self.parts: list[str] = []
+        self.capture_attr = capture_attr
+        self.capture_values = capture_values
+        self.sections: dict[str, list[str]] = {}
+        self._skip_depth = 0
+        self._open: list[tuple[str, int]] = []  # (captured value, element depth) currently open
+        self._depth = 0
+        self._run: list[str] = []  # data() chunks of the current text node
+
+    def _end_run(self):
+        if not self._run:
+            return
+        text = "".join(self._run)
+        self._run = []
+        self.parts.append(text)
+        for value, _ in self._open:
+            self.sections[value].append(text)
+
+    def start(self, tag, attrib):
+        self._end_run()
+        self._depth += 1
+        if self._skip_depth or tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self.capture_attr:
+            value = attrib.get(self.capture_attr)
+            if value in self.capture_values and value not in self.sections:
+                self.sections[value] = []
+                self._open.append((value, self._depth))
+
+    def end(self, tag):
+        self._end_run()
+        if self._skip_depth:
+            self._skip_depth -= 1
+        while self._open and self._open[-1][1] >= self._depth:
+            self._open.pop()
+        self._depth -= 1
+
+    def data(self, text):
+        if self._skip_depth:
+            return
+        self._run.append(text)
+
+    def comment(self, text):
+        self._end_run()
+
+    def close(self):
+        self._end_run()
+        return self
+
+
+def _collapse(parts: list[str]) -> str:
+    return " ".join(" ".join(parts).split())
+
+
+def html_to_text_bs4(html: str) -> str:
+    """Reference implementation (BeautifulSoup + html.parser); used when lxml is missing and by the benchmark."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+    return " ".join(soup.get_text(separator=" ").split())
+
+
+def _sections_bs4(html: str, capture_attr: str, capture_values) -> tuple[str, dict[str, str]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+    sections = {}
+    for value in capture_values:
+        el = soup.find(attrs={capture_attr: value})
+        if el is not None:
+            sections[value] = " ".join(el.get_text(separator=" ").split())
+    return " ".join(soup.get_text(separator=" ").split()), sections
+
+
+def _parse(html: str, target: _TextTarget) -> _TextTarget:
+    if not html:
+        return target
+    parser = etree.HTMLParser(target=target, huge_tree=True, recover=True)
+    parser.feed(html)
+    return parser.close()
+
+
+def html_to_text(html: str) -> str:
+    """Visible text of an HTML document (script / style / noscript removed), whitespace collapsed."""
+    if etree is None:
+        return html_to_text_bs4(html)
+    return _collapse(_parse(html, _TextTarget()).parts)
+
+
+def html_to_text_with_sections(html: str, capture_attr: str, capture_values) -> tuple[str, dict[str, str]]:
+    """Like html_to_text, plus {value: text} for the first element whose capture_attr equals each value
+    (e.g. LinkedIn's data-test-id="about-us__size"). Values with no matching element are omitted."""
+    if etree is None:
+        return _sections_bs4(html, capture_attr, capture_values)
+    target = _parse(html, _TextTarget(capture_attr, frozenset(capture_values)))
+    return _collapse(target.parts), {k: _collapse(v) for k, v in target.sections.items()}
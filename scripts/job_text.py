@@ -0,0 +1,60 @@
+"""
+Job description text for prompts. Prefers job_main.txt (posting body only, written at archive time
+by main_content) and falls back to job.txt (whole page text) for older folders or pages where no
+main block was found.
+
+Run directly to backfill job_main.txt for folders archived before it existed:
+  python scripts/job_text.py            # every data/<company>/<date>/ with raw.html but no job_main.txt
+  python scripts/job_text.py --force    # rewrite existing job_main.txt too
+
+Used by: archive_job_agent, batch_extract_metadata, extract_job_metadata_agent, generate_bullets_agent,
+evaluate_resume_skills_agent, populate_cover_letter_agent, batch_generate_cover_letter_agent,
+batch_generate_hm_outreach_agent.
+"""
+import sys
+from pathlib import Path
+
+JOB_TEXT_FILE = "job.txt"
+JOB_MAIN_FILE = "job_main.txt"
+DATA_DIR = Path("data")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def job_text_path(job_dir: Path) -> Path:
+    """job_main.txt if present and non-empty, else job.txt (which may not exist)."""
+    job_dir = Path(job_dir)
+    main = job_dir / JOB_MAIN_FILE
+    if main.exists() and main.stat().st_size > 0:
+        return main
+    return job_dir / JOB_TEXT_FILE
+
+
+def read_job_text(job_dir: Path) -> str:
+    """Posting text for prompts (job_main.txt, else job.txt). Raises FileNotFoundError if neither exists."""
+    return job_text_path(job_dir).read_text(encoding="utf-8")
+
+
+def main():
+    from main_content import extract_main_text
+
+    force = "--force" in sys.argv[1:]
+    written = skipped = 0
+    saved_chars = 0
+    for raw in sorted((PROJECT_ROOT / DATA_DIR).glob("*/*/raw.html")):
+        job_dir = raw.parent
+        if (job_dir / JOB_MAIN_FILE).exists() and not force:
+            continue
+        main_text = extract_main_text(raw.read_text(encoding="utf-8", errors="replace"))
+        if not main_text:
+            skipped += 1
+            continue
+        (job_dir / JOB_MAIN_FILE).write_text(main_text, encoding="utf-8")
+        written += 1
+        if (job_dir / JOB_TEXT_FILE).exists():
+            saved_chars += len((job_dir / JOB_TEXT_FILE).read_text(encoding="utf-8")) - len(main_text)
+        print(f"✂️ {job_dir / JOB_MAIN_FILE}")
+    print(f"\n✅ Wrote {written} job_main.txt ({skipped} page(s) had no main block); {saved_chars:,} fewer chars than job.txt\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Employee count and industry from a LinkedIn company page (HTML plus the top-card stats text captured by
+the browser). Pure functions, so saved pages can be re-parsed offline (batchmetadata --reparse) and
+benchmarked against fixtures (bench_linkedin_parser, scripts/fixtures/linkedin/).
+
+Employee count, in order of trust:
+  1. About section (logged-out view): [data-test-id="about-us__size"], e.g. "1,001-5,000 employees"
+  2. Top card (logged-in view): "12K followers · 1K-5K employees"
+  3. Whole page text, ignoring the face-pile "Discover all 110 employees" (LinkedIn members, not headcount)
+Step 3 makes one pass over the page: it finds each "employees" mention once and only tries the count
+patterns on the digits / separators directly before it, keeping the best-ranked hit so far.
+
+Industry: [data-test-id="about-us__industry"] (without its "Industry" label), else the text after an
+"Industry" label up to the next About-section label or separator.
+
+Used by: batch_extract_metadata, bench_linkedin_parser.
+"""
+import re
+
+from html_text import html_to_text_with_sections
+
+ABOUT_SIZE = "about-us__size"
+ABOUT_INDUSTRY = "about-us__industry"
+
+# "1K-5K employees", "1K - 5K employees" (hyphen, en-dash, unicode minus, horizontal bar)
+K_RANGE_RE = re.compile(r"(\d+)[Kk]\s*[-–−―]\s*(\d+)[Kk]?\s+employees?", re.I)
+# "5K employees", "10K+ employees" (top card for large companies)
+K_RE = re.compile(r"(\d+)[Kk]\+?\s+employees?", re.I)
+# "1,001-5,000 employees", "10,001+ employees", "51 employees", "2,500 employees on LinkedIn" (About section / top card)
+SIZE_RE = re.compile(r"(\d{1,3}(?:,\d{3})*)\s*[-–]?\s*(\d{1,3}(?:,\d{3})*)?\s*\+?\s+employees?", re.I)
+# Whole-page patterns, most trusted first; the face-pile only ever shows a bare number (BARE_RE)
+RANGE_RE = re.compile(r"(\d{1,3}(?:,\d{3})*)\s*[-–]\s*(\d{1,3}(?:,\d{3})*)\s+employees?", re.I)
+PLUS_RE = re.compile(r"(\d{1,3}(?:,\d{3})*)\s*\+\s+employees?", re.I)
+BARE_RE = re.compile(r"(\d{1,3}(?:,\d{3})*)\s+employees?", re.I)
+PAGE_PATTERNS = (K_RANGE_RE, K_RE, RANGE_RE, PLUS_RE, BARE_RE)
+THOUSANDS_PATTERNS = (K_RANGE_RE, K_RE)
+
+EMPLOYEES_RE = re.compile(r"employees?", re.I)
+DISCOVER_ALL_RE = re.compile(r"discover\s+all", re.I)
+FACE_PILE_LOOKBEHIND = 50
+FACE_PILE_SMALL_COUNT = 500
+# Characters a count phrase can contain before "employees" (besides digits and whitespace)
+COUNT_PUNCTUATION = frozenset(",Kk+-–−―")
+
+INDUSTRY_LABEL_RE = re.compile(r"^\s*Industry\b\s*:?\s*", re.I)
+_INDUSTRY_END = (
+    r"\s*(?=\s(?:Company size|Headquarters|Founded|Website|Specialties|Type|Locations?|Discover all|See all)\b"
+    r"|\s*[|·•]|\s*$)"
+)
+INDUSTRY_RE = re.compile(r"\bIndustry\b\s*:?\s+([^|·•]{2,80}?)" + _INDUSTRY_END)
+INDUSTRY_ANY_CASE_RE = re.compile(r"\bindustr(?:y|ies)\b\s*:?\s+([^|·•]{2,80}?)" + _INDUSTRY_END, re.I)
+
+
+def _count(m: re.Match, pattern: re.Pattern) -> int:
+    if pattern in THOUSANDS_PATTERNS:
+        return int(m.group(1)) * 1000
+    return int(m.group(1).replace(",", ""))
+
+
+def parse_employee_count(s: str) -> int | None:
+    """Employee count from a short, trusted snippet (About "Company size" value or the top-card stats)."""
+    for pattern in (K_RANGE_RE, K_RE, SIZE_RE):
+        m = pattern.search(s)
+        if m:
+            return _count(m, pattern)
+    return None
+
+
+def _is_face_pile(text: str, m: re.Match) -> bool:
+    """True for "Discover all N employees" (the members face-pile), judged from the text around a bare count."""
+    if DISCOVER_ALL_RE.search(text, max(0, m.start() - FACE_PILE_LOOKBEHIND), m.start()):
+        return True
+    n = int(m.group(1).replace(",", ""))
+    return n < FACE_PILE_SMALL_COUNT and DISCOVER_ALL_RE.search(text, max(0, m.start() - 20), m.end() + 15) is not None
+
+
+def parse_employee_count_from_page(text: str) -> int | None:
+    """Employee count from the whole page text: the first match of the most trusted PAGE_PATTERNS entry
+    that matches anywhere, skipping face-pile counts. One pass over the "employees" mentions."""
+    best_rank, best = len(PAGE_PATTERNS), None
+    for mention in EMPLOYEES_RE.finditer(text):
+        # Every pattern ends in "employees?", so a match ending here lies within the run of count characters before it
+        start = mention.start()
+        while start > 0 and (text[start - 1].isdecimal() or text[start - 1].isspace() or text[start - 1] in COUNT_PUNCTUATION):
+            start -= 1
+        if start == mention.start():
+            continue
+        for rank in range(best_rank):
+            pattern = PAGE_PATTERNS[rank]
+            m = pattern.search(text, start, mention.end())
+            if m is None or (pattern is BARE_RE and _is_face_pile(text, m)):
+                continue
+            best_rank, best = rank, _count(m, pattern)
+            break
+        if best_rank == 0:
+            break
+    return best
+
+
+def parse_industry(about_industry_text: str | None, text: str) -> str | None:
+    if about_industry_text:
+        industry = INDUSTRY_LABEL_RE.sub("", about_industry_text).strip()
+        if industry:
+            return industry
+    for pattern in (INDUSTRY_RE, INDUSTRY_ANY_CASE_RE):
+        m = pattern.search(text)
+        if m:
+            return m.group(1).strip()
+    return None
+
+
+def parse_company_page(header_text: str | None, html: str) -> dict:
+    """{"employee_count": int | None, "industry": str | None} from a company page's top-card stats text
+    (None if the browser didn't find it) and its HTML, as returned by LinkedInFetcher.fetch_page()."""
+    text, about = html_to_text_with_sections(html, "data-test-id", (ABOUT_SIZE, ABOUT_INDUSTRY))
+    return parse_company_text(header_text, text, about)
+
+
+def parse_company_text(header_text: str | None, text: str, about: dict[str, str]) -> dict:
+    """parse_company_page after HTML -> text: text is the page text, about the {data-test-id: text} About sections."""
+    employee_count = parse_employee_count(about[ABOUT_SIZE]) if about.get(ABOUT_SIZE) else None
+    if employee_count is None and header_text:
+        employee_count = parse_employee_count(" ".join(header_text.split()))
+    if employee_count is None:
+        employee_count = parse_employee_count_from_page(text)
+    return {"employee_count": employee_count, "industry": parse_industry(about.get(ABOUT_INDUSTRY), text)}
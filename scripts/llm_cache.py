@@ -0,0 +1,165 @@
+"""
+Disk cache of Claude responses shared by every agent. cached_create(client, **kwargs) stands in for
+client.messages.create(**kwargs): the response is stored under data/_cache/llm/ keyed by the sha256 of
+the request (model, messages, system, max_tokens and every other parameter), so re-running genbullets,
+evalskills, popcl or batchmetadata on an unchanged job (after a crash or a sheet fix) returns the earlier
+answer in milliseconds without a new API call. Any change to the prompt, the job text, the resume or the
+model is a different key.
+
+Entries are read back as anthropic Message objects (content, usage, stop_reason), so callers don't change.
+Only complete answers are stored (stop_reason "end_turn": not empty, not cut off at max_tokens), and a caller
+that can't use an answer (e.g. unparseable JSON) calls forget(kwargs), so the next run asks Claude again
+instead of replaying the same bad reply.
+Each hit refreshes the entry's mtime; the least recently used entries are evicted beyond LLM_CACHE_MAX_MB.
+
+Provider-side prompt caching is separate: the generation agents send the static instructions and the resume
+as a system prefix built by cacheable_system(), which Anthropic caches for a few minutes, so every call after
+the first in a batch re-reads that prefix from cache (cheaper input, faster first token) and only the job
+text is new. usage_line() reports cache writes / reads per call. Prefixes shorter than the model's minimum
+(1024 tokens for Sonnet, 2048 for Haiku) are simply not cached.
+
+Tuning (.env):
+  LLM_CACHE=0           bypass the cache (always call Claude; nothing is stored)
+  LLM_CACHE=refresh     always call Claude and overwrite stored answers (e.g. to get fresh drafts)
+  LLM_CACHE_MAX_MB      least recently used responses are evicted beyond this total size (default 200)
+
+Used by: archive_job_agent, batch_extract_metadata, generate_bullets_agent, evaluate_resume_skills_agent,
+populate_cover_letter_agent, batch_generate_cover_letter_agent, batch_generate_hm_outreach_agent, message_batches.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from anthropic.types import Message
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LLM_CACHE_DIR = PROJECT_ROOT / "data" / "_cache" / "llm"
+DEFAULT_MAX_MB = 200
+
+_stats_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "input_tokens": 0, "cache_write_tokens": 0, "cache_read_tokens": 0}
+
+
+def _mode() -> str:
+    return os.environ.get("LLM_CACHE", "1").strip().lower()
+
+
+def request_key(kwargs: dict) -> str:
+    """sha256 of the request parameters (JSON with sorted keys, so argument order doesn't matter)."""
+    payload = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return LLM_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _read(key: str) -> Message | None:
+    path = _entry_path(key)
+    try:
+        message = Message.model_validate(json.loads(path.read_text(encoding="utf-8"))["response"])
+        os.utime(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return message
+
+
+def _evict(max_bytes: int) -> None:
+    try:
+        entries = sorted(LLM_CACHE_DIR.glob("*/*.json"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+    except OSError:
+        return
+    for path in entries:
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            total -= path.stat().st_size
+            path.unlink()
+
+
+def _write(key: str, kwargs: dict, message: Message) -> None:
+    path = _entry_path(key)
+    entry = {"model": kwargs.get("model"), "response": message.model_dump(mode="json")}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        return
+    _evict(int(float(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1e6))
+
+
+def lookup(kwargs: dict) -> Message | None:
+    """The stored response for this request (marked from_llm_cache), or None on a miss or when the cache is off /
+    refreshing. message_batches uses this to leave already-answered requests out of a batch."""
+    if _mode() in ("0", "refresh"):
+        return None
+    message = _read(request_key(kwargs))
+    if message is None:
+        return None
+    with _stats_lock:
+        stats["hits"] += 1
+    message.from_llm_cache = True
+    return message
+
+
+def store(kwargs: dict, message: Message) -> None:
+    """Record a response fetched outside cached_create (e.g. a Message Batches result) and count its usage.
+    Incomplete responses (stop_reason other than end_turn, or no text) are counted but not stored."""
+    usage = message.usage
+    with _stats_lock:
+        stats["misses"] += 1
+        stats["input_tokens"] += usage.input_tokens or 0
+        stats["cache_write_tokens"] += getattr(usage, "cache_creation_input_tokens", None) or 0
+        stats["cache_read_tokens"] += getattr(usage, "cache_read_input_tokens", None) or 0
+    if _mode() == "0" or message.stop_reason != "end_turn":
+        return
+    if any(getattr(block, "text", None) for block in message.content):
+        _write(request_key(kwargs), kwargs, message)
+
+
+def forget(kwargs: dict) -> None:
+    """Drop the stored response for this request: call it when the answer was rejected (unparseable, wrong shape)
+    so a re-run asks Claude again."""
+    with contextlib.suppress(OSError):
+        _entry_path(request_key(kwargs)).unlink()
+
+
+def cached_create(client, **kwargs) -> Message:
+    """client.messages.create(**kwargs), answered from the cache when the same request was made before.
+    Empty or truncated responses are not stored."""
+    message = lookup(kwargs)
+    if message is None:
+        message = client.messages.create(**kwargs)
+        store(kwargs, message)
+    return message
+
+
+def cacheable_system(text: str) -> list[dict]:
+    """System prompt for messages.create whose text (static instructions + resume) is marked for prompt caching.
+    Keep anything that varies per job out of it, so consecutive calls share the prefix."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def usage_line(message: Message, label: str = "Tokens") -> str:
+    """"🪙 <label>: ..." token usage of one response, including prompt-cache writes / reads (or a note that it came from disk)."""
+    if getattr(message, "from_llm_cache", False):
+        return f"🪙 {label}: answer from local LLM cache (nothing billed)"
+    usage = message.usage
+    write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    read = getattr(usage, "cache_read_input_tokens", None) or 0
+    return f"🪙 {label}: {usage.input_tokens} input ({read} cache read, {write} cache write), {usage.output_tokens} output"
+
+
+def cache_summary() -> str:
+    calls = stats["hits"] + stats["misses"]
+    line = f"🧠 Claude: {calls} request(s), {stats['hits']} from cache"
+    if stats["cache_read_tokens"] or stats["cache_write_tokens"]:
+        line += (f"; prompt cache: {stats['cache_read_tokens']} token(s) read, {stats['cache_write_tokens']} written,"
+                 f" {stats['input_tokens']} uncached input")
+    return line
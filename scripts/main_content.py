@@ -0,0 +1,174 @@
+"""
+Boilerplate removal for archived postings: reduce a rendered job page to the posting body
+(title + description) so agents don't send nav bars, cookie banners, "similar jobs" lists and
+footers to Claude. Written next to job.txt as job_main.txt at archive time; read it with
+job_text.read_job_text().
+
+Heuristics, in order:
+  1. Drop nav / header / footer / aside / form / dialog elements and anything whose id, class,
+     role or aria-label looks like navigation, cookie consent, sharing or related-job lists.
+  2. Use the largest element that is marked as a job description (itemprop="description",
+     class/id containing job-description, posting, descriptionText, ...) if it has enough text.
+  3. Otherwise score block containers readability-style (paragraph / list-item text credited to
+     the parent and, half, to the grandparent, discounted by link density) and take the best one.
+The page <title> and first <h1> are kept as a header when they are outside the chosen block.
+Returns None when nothing convincing is found (callers keep using job.txt).
+
+Used by: archive_job_agent.
+"""
+import re
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - job.txt is used as-is without lxml
+    lxml = None
+
+MIN_MAIN_CHARS = 400
+
+DROP_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer",
+             "aside", "form", "button", "select", "dialog")
+DROP_ROLES = {"navigation", "banner", "contentinfo", "dialog", "alertdialog", "complementary", "search"}
+BOILERPLATE_RE = re.compile(
+    r"cookie|consent|gdpr|onetrust|banner|navbar|nav-|-nav\b|\bnav\b|menu|breadcrumb|footer|header|"
+    r"share|social|sidebar|similar|related|recommend|more-jobs|other-jobs|job-alert|newsletter|"
+    r"subscribe|modal|popup|skip-link|signin|sign-in|login|apply-button",
+    re.IGNORECASE,
+)
+# Description containers used by common ATSs and schema.org markup
+DESCRIPTION_HINT_RE = re.compile(
+    r"job[-_]?description|jobdescription|description__text|descriptiontext|_description_|"
+    r"job[-_]?details|jobdetails|posting-page|job-post|jobposting|show-more-less-html|"
+    r"iCIMS_JobContent|jobPostingDescription",
+    re.IGNORECASE,
+)
+PARAGRAPH_TAGS = ("p", "li", "pre", "td", "dd", "blockquote", "h2", "h3", "h4")
+BLOCK_TAGS = ("p", "div", "section", "article", "main", "li", "ul", "ol", "h1", "h2", "h3", "h4",
+              "h5", "h6", "tr", "dd", "dt", "pre", "blockquote", "br", "table")
+
+
+def _collapse(s: str) -> str:
+    return " ".join(s.split())
+
+
+def _attr_blob(el) -> str:
+    return " ".join(el.get(a, "") for a in ("id", "class", "aria-label", "data-testid", "data-test-id"))
+
+
+def _strip_boilerplate(root) -> None:
+    for el in list(root.iter(*DROP_TAGS)):
+        el.drop_tree()
+    # A page-level wrapper can carry a class like "has-sidebar"; never drop most of the page
+    max_drop_chars = max(2000, _text_len(root) * 0.3)
+    for el in list(root.iter(etree.Element)):
+        if el.getparent() is None or el.tag in ("html", "body", "main", "article"):
+            continue
+        blob = _attr_blob(el)
+        if (el.get("role") or "").lower() in DROP_ROLES or (
+            blob and BOILERPLATE_RE.search(blob) and not DESCRIPTION_HINT_RE.search(blob)
+        ):
+            if _text_len(el) <= max_drop_chars:
+                el.drop_tree()
+
+
+def _text_len(el) -> int:
+    return len(_collapse(el.text_content()))
+
+
+def _link_density(el, total: int) -> float:
+    if total == 0:
+        return 1.0
+    link_chars = sum(len(_collapse(a.text_content())) for a in el.iter("a"))
+    return link_chars / total
+
+
+def _hinted_candidate(root):
+    best, best_len = None, 0
+    for el in root.iter(etree.Element):
+        if el.get("itemprop") == "description" or DESCRIPTION_HINT_RE.search(_attr_blob(el)):
+            n = _text_len(el)
+            if n > best_len and _link_density(el, n) < 0.5:
+                best, best_len = el, n
+    return best if best_len >= MIN_MAIN_CHARS else None
+
+
+def _scored_candidate(root):
+    scores: dict = {}
+    for p in root.iter(*PARAGRAPH_TAGS):
+        n = len(_collapse(p.text_content()))
+        if n < 25:
+            continue
+        score = 1 + n / 100 + p.text_content().count(",")
+        parent = p.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0) + score / 2
+    best, best_score = None, 0.0
+    for el, score in scores.items():
+        score *= 1 - _link_density(el, _text_len(el))
+        if score > best_score:
+            best, best_score = el, score
+    return best if best is not None and _text_len(best) >= MIN_MAIN_CHARS else None
+
+
+def _block_text(el) -> str:
+    """Text of el with one line per block element (lists and paragraphs stay readable)."""
+    lines: list[str] = []
+    current: list[str] = []
+
+    def flush():
+        line = _collapse(" ".join(current))
+        if line:
+            lines.append(line)
+        current.clear()
+
+    def walk(node):
+        if not isinstance(node.tag, str):  # comments, processing instructions
+            if node.tail:
+                current.append(node.tail)
+            return
+        block = node.tag in BLOCK_TAGS
+        if block:
+            flush()
+        if node.tag == "li":
+            current.append("-")
+        if node.text:
+            current.append(node.text)
+        for child in node:
+            walk(child)
+        if block:
+            flush()
+        if node.tail:
+            current.append(node.tail)
+
+    tail, el.tail = el.tail, None
+    walk(el)
+    el.tail = tail
+    flush()
+    return "\n".join(lines)
+
+
+def extract_main_text(html: str) -> str | None:
+    """Posting body of a rendered job page as compact text (one line per block), or None if not found."""
+    if lxml is None or not html or not html.strip():
+        return None
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+    title_el = root.find(".//title")
+    title = _collapse(title_el.text_content()) if title_el is not None else ""
+    h1 = next((_collapse(h.text_content()) for h in root.iter("h1") if _collapse(h.text_content())), "")
+
+    _strip_boilerplate(root)
+    main = _hinted_candidate(root)
+    if main is None:
+        main = _scored_candidate(root)
+    if main is None:
+        return None
+    body = _block_text(main)
+    header = [t for t in dict.fromkeys((title, h1)) if t and t not in body[:500]]
+    return "\n".join(header + [body])
@@ -0,0 +1,128 @@
+"""
+Run many Claude requests as one Message Batches job (client.messages.batches) instead of one synchronous
+call at a time: `genbullets --batch-api`, `evalskills --batch-api` and `popcl --batch-api` build every
+request for the day, submit them together, poll until the batch has ended, then fan the answers out.
+Batches cost half as much per token and are not rate-limited per call, so they suit overnight runs;
+results usually arrive within minutes, at most 24 hours.
+
+Requests already answered in the LLM cache (llm_cache) are not submitted again, and every batch result is
+stored there, so a re-run after a crash or a fix is free. The batch id is kept in
+data/_cache/batches/<label>.json while it runs: re-running the same command with the same requests
+re-attaches to the running batch instead of submitting a second one.
+
+The client honours ANTHROPIC_BASE_URL, so a run can be pointed at a local stand-in for the batch endpoint
+(scripts/batch_api_standin.py) to check the whole flow without calling the API.
+
+Tuning (.env):
+  BATCH_POLL_INITIAL_S   first wait between status checks (default 15)
+  BATCH_POLL_MAX_S       longest wait between status checks; waits grow 1.5x each poll (default 300)
+
+Used by: batch_generate_bullets_agent, batch_evaluate_resume_skills_agent, batch_generate_cover_letter_agent.
+"""
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+
+import llm_cache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BATCH_STATE_DIR = PROJECT_ROOT / "data" / "_cache" / "batches"
+DEFAULT_POLL_INITIAL_S = 15
+DEFAULT_POLL_MAX_S = 300
+POLL_BACKOFF = 1.5
+
+
+def _state_path(label: str) -> Path:
+    return BATCH_STATE_DIR / f"{label}.json"
+
+
+def _request_keys(requests: dict[str, dict]) -> dict[str, str]:
+    return {custom_id: llm_cache.request_key(params) for custom_id, params in requests.items()}
+
+
+def _submit_or_resume(client, label: str, requests: dict[str, dict]) -> str:
+    """Id of the batch answering these requests: the one recorded for label if it was submitted for exactly
+    the same requests, else a newly created batch."""
+    keys = _request_keys(requests)
+    path = _state_path(label)
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("requests") == keys:
+            print(f"  ↩️ Re-attaching to batch {state['batch_id']} ({len(requests)} request(s))")
+            return state["batch_id"]
+    except (OSError, ValueError):
+        pass
+    batch = client.messages.batches.create(
+        requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests.items()]
+    )
+    BATCH_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"batch_id": batch.id, "requests": keys}, indent=2), encoding="utf-8")
+    print(f"  📦 Submitted batch {batch.id} ({len(requests)} request(s))")
+    return batch.id
+
+
+def _wait_until_ended(client, batch_id: str) -> None:
+    delay = float(os.environ.get("BATCH_POLL_INITIAL_S", DEFAULT_POLL_INITIAL_S))
+    max_delay = float(os.environ.get("BATCH_POLL_MAX_S", DEFAULT_POLL_MAX_S))
+    started = time.monotonic()
+    while True:
+        batch = client.messages.batches.retrieve(batch_id)
+        if batch.processing_status == "ended":
+            return
+        counts = batch.request_counts
+        print(f"  ⏳ Batch {batch_id}: {counts.processing} processing, {counts.succeeded} done, "
+              f"{counts.errored} errored ({int(time.monotonic() - started)}s); next check in {int(delay)}s")
+        time.sleep(delay)
+        delay = min(delay * POLL_BACKOFF, max_delay)
+
+
+def _failure(result) -> str:
+    """Short description of a non-succeeded batch result (errored / canceled / expired)."""
+    error = getattr(getattr(result, "error", None), "error", None)
+    message = getattr(error, "message", None)
+    return f"{result.type}: {message}" if message else result.type
+
+
+def run_batch(client, label: str, requests: dict[str, dict]) -> dict:
+    """Answer requests ({custom_id: messages.create kwargs}; ids of letters, digits, "_" and "-") with one
+    Message Batches job. label names the run (e.g. "genbullets-draft-2026-03-02") for re-attaching.
+    Returns {custom_id: Message} for succeeded requests and {custom_id: "errored: ..." | "expired" | ...}
+    for the rest; cached answers are returned without submitting them."""
+    results: dict = {}
+    pending: dict[str, dict] = {}
+    for custom_id, params in requests.items():
+        cached = llm_cache.lookup(params)
+        if cached is not None:
+            results[custom_id] = cached
+        else:
+            pending[custom_id] = params
+    if results:
+        print(f"  💾 {len(results)} request(s) answered from the LLM cache")
+    if not pending:
+        return results
+
+    batch_id = _submit_or_resume(client, label, pending)
+    _wait_until_ended(client, batch_id)
+    for entry in client.messages.batches.results(batch_id):
+        params = pending.get(entry.custom_id)
+        if params is None:
+            continue
+        if entry.result.type == "succeeded":
+            llm_cache.store(params, entry.result.message)
+            results[entry.custom_id] = entry.result.message
+        else:
+            results[entry.custom_id] = _failure(entry.result)
+    for custom_id in pending.keys() - results.keys():
+        results[custom_id] = "missing from batch results"
+    with contextlib.suppress(OSError):
+        _state_path(label).unlink()
+    return results
+
+
+def reply_text(result) -> str:
+    """Text of a run_batch result; raises ValueError for a failed request."""
+    if isinstance(result, str):
+        raise ValueError(f"batch request failed ({result})")
+    return (result.content[0].text or "").strip()
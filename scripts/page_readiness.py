@@ -0,0 +1,102 @@
+"""
+Adaptive "is the posting rendered yet?" wait for Playwright archiving. Replaces a fixed sleep after
+domcontentloaded: known ATS boards wait for their job-description selector; other pages are polled
+until the visible text stops growing (sooner once the network is idle). The selector gets at most half
+the budget, so a board whose markup changed (or a "job closed" page) still has time for text polling.
+Short pages (closed postings, "no longer available") count as ready once the network is idle and their
+text is stable, and error responses (status >= 400) are not waited on at all. Never waits longer than
+ARCHIVE_READY_MAX_MS (default 10000).
+
+Used by: archive_job_agent. The strategy and wait time are returned so they can be logged.
+"""
+import os
+import time
+from urllib.parse import urlparse
+
+# (profile name, host suffix, CSS selector for the job description once rendered)
+ATS_PROFILES = [
+    ("greenhouse", "greenhouse.io", "#content, .job__description, .job-post"),
+    ("lever", "lever.co", ".posting-page .section-wrapper, [data-qa='job-description']"),
+    ("ashby", "ashbyhq.com", "[class*='descriptionText'], [class*='_description_']"),
+    ("workday", "myworkdayjobs.com", "[data-automation-id='jobPostingDescription']"),
+    ("linkedin", "linkedin.com", ".description__text, .jobs-description__content, .show-more-less-html__markup"),
+    ("smartrecruiters", "smartrecruiters.com", ".job-sections, [itemprop='description']"),
+    ("icims", "icims.com", ".iCIMS_JobContent, #iCIMS_Content"),
+    ("workable", "workable.com", "[data-ui='job-description']"),
+    ("jobvite", "jobvite.com", ".jv-job-detail-description"),
+    ("bamboohr", "bamboohr.com", "[class*='jobDescription'], .BambooRich"),
+]
+
+DEFAULT_MAX_WAIT_MS = 10000
+POLL_MS = 250
+MIN_TEXT_CHARS = 500
+SELECTOR_BUDGET_SHARE = 0.5
+# Text must be unchanged this many polls in a row (fewer once the network is idle)
+STABLE_POLLS = 3
+STABLE_POLLS_WHEN_IDLE = 1
+
+TEXT_LENGTH_JS = "() => document.body ? document.body.innerText.length : 0"
+
+
+def profile_for_url(url: str) -> tuple[str, str] | None:
+    """Return (profile_name, content_selector) for known ATS hosts, else None."""
+    host = (urlparse(url).hostname or "").lower()
+    for name, suffix, selector in ATS_PROFILES:
+        if host == suffix or host.endswith("." + suffix):
+            return name, selector
+    return None
+
+
+def wait_until_ready(page, url: str, max_wait_ms: int | None = None, status: int | None = None) -> dict:
+    """Wait until the posting looks fully rendered. status is the navigation response's HTTP status, if known.
+    Returns {"strategy", "waited_ms", "text_chars"}; strategy is "http-error", "selector:<ats>",
+    "network-idle", "text-stable" or "timeout"."""
+    budget_ms = max_wait_ms or int(os.environ.get("ARCHIVE_READY_MAX_MS", DEFAULT_MAX_WAIT_MS))
+    start = time.monotonic()
+
+    def elapsed_ms() -> int:
+        return int((time.monotonic() - start) * 1000)
+
+    def text_chars() -> int:
+        try:
+            return int(page.evaluate(TEXT_LENGTH_JS))
+        except Exception:
+            return 0
+
+    if status is not None and status >= 400:
+        return {"strategy": "http-error", "waited_ms": 0, "text_chars": text_chars()}
+
+    profile = profile_for_url(url)
+    if profile:
+        name, selector = profile
+        try:
+            page.wait_for_selector(selector, state="visible", timeout=int(budget_ms * SELECTOR_BUDGET_SHARE))
+            return {"strategy": f"selector:{name}", "waited_ms": elapsed_ms(), "text_chars": text_chars()}
+        except Exception:
+            pass  # selector changed or page differs; fall back to text polling with what's left
+
+    last_chars = -1
+    stable = 0
+    idle = False
+    while True:
+        remaining = budget_ms - elapsed_ms()
+        if remaining <= 0:
+            return {"strategy": "timeout", "waited_ms": elapsed_ms(), "text_chars": max(last_chars, 0)}
+        if idle:
+            page.wait_for_timeout(min(POLL_MS, remaining))
+        else:
+            try:
+                page.wait_for_load_state("networkidle", timeout=min(POLL_MS, remaining))
+                idle = True
+            except Exception:
+                pass  # not idle yet; the timeout doubled as the poll interval
+        chars = text_chars()
+        # Below MIN_TEXT_CHARS the page may still be rendering, unless the network has gone idle
+        if chars == last_chars and (chars >= MIN_TEXT_CHARS or (idle and chars > 0)):
+            stable += 1
+            if stable >= (STABLE_POLLS_WHEN_IDLE if idle else STABLE_POLLS):
+                strategy = "network-idle" if idle else "text-stable"
+                return {"strategy": strategy, "waited_ms": elapsed_ms(), "text_chars": chars}
+        else:
+            stable = 0
+        last_chars = chars
@@ -11,6 +11,9 @@ from pathlib import Path
 from anthropic import Anthropic, AnthropicError
 from dotenv import load_dotenv
 
+from job_text import read_job_text
+from llm_cache import cacheable_system, cached_create, forget, usage_line
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 
 COVER_LETTER_MODEL = "claude-sonnet-4-6"
@@ -39,11 +42,12 @@ def _parse_validated_letter(raw: str) -> str:
     return text
 
 
-def _cover_letter_validation_prompt(job_text: str, resume_text: str, draft_letter: str) -> str:
-    return f"""
+def _cover_letter_validation_system(resume_text: str) -> list[dict]:
+    """Validation-pass instructions + resume: the same for every job, so it is sent as a cached system prefix."""
+    instructions = """
 You are a strict editor validating a cover letter draft against the candidate's resume only.
 
-You have the JOB DESCRIPTION (context only — do not add claims from it unless the same fact appears on the resume), the full RESUME (verbatim — sole source of truth), and the DRAFT LETTER.
+You have the full RESUME below (verbatim — sole source of truth), and in the user message the JOB DESCRIPTION (context only — do not add claims from it unless the same fact appears on the resume) and the DRAFT LETTER.
 
 Your job: return a CORRECTED version of the letter in plain text. Preserve tone, length (roughly 220–320 words), and at most 3 paragraphs unless the draft must be split to fix duplication. Apply ALL rules below. If the draft is already compliant, return it unchanged.
 
@@ -57,16 +61,8 @@ Output rules:
 - Plain text only: the full corrected letter, nothing else.
 - No preamble or meta (e.g. do not start with "Here is…" or "Below is…").
 - Start directly with the first sentence of the letter.
-
-JOB DESCRIPTION (context):
-{job_text}
-
-RESUME:
-{resume_text}
-
-DRAFT LETTER:
-{draft_letter}
 """.strip()
+    return cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text}")
 
 
 def run_cover_letter_validation_pass(
@@ -78,20 +74,25 @@ def run_cover_letter_validation_pass(
     max_tokens: int,
 ) -> tuple[str, int]:
     """Returns (validated_letter, output_tokens). Retries once on parse failure."""
-    prompt = _cover_letter_validation_prompt(job_text, resume_text, draft_letter)
+    system = _cover_letter_validation_system(resume_text)
+    prompt = f"JOB DESCRIPTION (context):\n{job_text}\n\nDRAFT LETTER:\n{draft_letter}"
     output_tokens = 0
     for attempt in range(2):
-        msg = client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        request = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        msg = cached_create(client, **request)
+        print(usage_line(msg, "Validation"), file=sys.stderr)
         output_tokens = msg.usage.output_tokens
         raw = (msg.content[0].text or "").strip()
         try:
             letter = _parse_validated_letter(raw)
             break
         except ValueError as e:
+            forget(request)
             if attempt == 0:
                 print("  Validation pass: parse failed, retrying once…", file=sys.stderr)
                 prompt = prompt + "\n\nImportant: Reply with ONLY the final cover letter as plain text. No markdown fences, no title, no commentary."
@@ -139,11 +140,12 @@ def main():
 
     client = Anthropic(api_key=api_key)
 
-    job_text = job_txt.read_text(encoding="utf-8")
+    job_text = read_job_text(job_dir)
     url = url_txt.read_text(encoding="utf-8").strip() if url_txt.exists() else ""
 
-    prompt = f"""
-        Write a concise, confident cover letter tailored to this job.
+    # Instructions + resume form a system prefix shared by every job (prompt-cached); the URL and job text vary
+    instructions = """
+        Write a concise, confident cover letter tailored to the job in the user message.
 
         CRITICAL — Only reference experience and technologies that appear on the resume. Do not mention any technologies, tools, or responsibilities from the job description unless they explicitly appear on the resume. If the JD asks for something the resume does not show, do not claim it—emphasize the candidate's actual skills and experience instead.
 
@@ -155,24 +157,19 @@ def main():
         - Reference the company/role naturally (if the JD provides it)
         - End with a simple call to action
         - Output plain text ONLY. Do not include any introductory or meta sentence (e.g. "Here is a cover letter tailored to..."); start directly with the first paragraph of the letter.
-
-        JOB POSTING URL (if available):
-        {url}
-
-        JOB DESCRIPTION:
-        {job_text}
-
-        RESUME:
-        {resume_text}
         """.strip()
+    system = cacheable_system(f"{instructions}\n\nRESUME:\n{resume_text}")
+    prompt = f"JOB POSTING URL (if available):\n{url}\n\nJOB DESCRIPTION:\n{job_text}"
 
     try:
-        msg = client.messages.create(
+        msg = cached_create(
+            client,
             model=COVER_LETTER_MODEL,
             max_tokens=MAX_TOKENS_DRAFT,
+            system=system,
             messages=[{"role": "user", "content": prompt}],
         )
-        print(f"🪙 Draft output tokens: {msg.usage.output_tokens}", file=sys.stderr)
+        print(usage_line(msg, "Draft"), file=sys.stderr)
     except AnthropicError as e:
         print(f"Anthropic API error: {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -189,7 +186,7 @@ def main():
     ).strip()
 
     try:
-        letter, val_tokens = run_cover_letter_validation_pass(
+        letter, _ = run_cover_letter_validation_pass(
             client,
             job_text,
             resume_text,
@@ -197,7 +194,6 @@ def main():
             model=COVER_LETTER_MODEL,
             max_tokens=MAX_TOKENS_VALIDATION,
         )
-        print(f"🪙 Validation output tokens: {val_tokens}", file=sys.stderr)
     except AnthropicError as e:
         print(f"Anthropic API error (validation): {e}", file=sys.stderr)
         raise SystemExit(1)
@@ -3,25 +3,34 @@ Single command: for each new row (no archived_at), archive job, extract metadata
 and write COMPANY, ROLE TITLE, COMPANY TYPE, COMPANY SIZE BUCKET, ROLE FOCUS, ROLE LEVEL
 to the sheet.
 
+Combined extraction (default): the archive step makes one Claude call per posting that returns company, role
+title, role focus, role level and company-type hints (saved as posting_extract.json), and metadata extraction
+runs in-process on that answer plus web / LinkedIn research. Company type and size still get a short Claude call
+over the company name, search snippets and a 2k-character posting excerpt unless the LinkedIn profile settles both.
+POPJOBS_COMBINED_EXTRACT=0 restores the separate archive-time and metadata calls.
+
 Alias: popjobs
 """
-import json
 import os
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
 import gspread
 from dotenv import load_dotenv
 
+from batch_extract_metadata import close_linkedin_fetcher, extract_metadata_for_job_dir, extract_posting_fields
+from company_store import find_job_dir
+from concurrent_archive import archive_in_order
+from llm_cache import cache_summary
+from render_pdfs import start_background_render
+from sheet_writer import SheetWriter
+
 SCRIPT_DIR = Path(__file__).resolve().parent
-ARCHIVE_SCRIPT = SCRIPT_DIR / "archive_job_agent.py"
-EXTRACT_METADATA_SCRIPT = SCRIPT_DIR / "extract_job_metadata_agent.py"
 DATA_DIR = Path("data")
 
 DATE_APPLIED_HEADER = "date applied"
 
-# Sheet column headers (case-insensitive) -> JSON key from extract_job_metadata_agent
+# Sheet column headers (case-insensitive) -> key in extract_metadata_for_job_dir's result
 METADATA_COLUMNS = {
     "role title": "role_title",
     "company type": "company_type",
@@ -31,10 +40,6 @@ METADATA_COLUMNS = {
 }
 
 
-def slugify(s: str) -> str:
-    return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
-
-
 def parse_date_applied(raw: str) -> str | None:
     raw = (raw or "").strip()
     if not raw:
@@ -94,11 +99,11 @@ def main():
 
     rows = ws.get_all_values()[1:]
 
+    pending = []  # (sheet row, url, date applied)
     for idx, row in enumerate(rows, start=2):
         archived_at = (row[archived_at_col - 1] or "").strip()
         url = (row[url_col - 1] or "").strip()
         date_applied_raw = (row[date_applied_col - 1] or "").strip() if date_applied_col <= len(row) else ""
-        company_from_sheet = (row[company_col - 1] or "").strip() if company_col and company_col <= len(row) else ""
 
         if not url or archived_at:
             continue
@@ -107,87 +112,90 @@ def main():
         if not date_applied_iso:
             print(f"\n⏭️ Skipping row {idx}: no valid '{DATE_APPLIED_HEADER}' (got: {date_applied_raw!r})")
             continue
-
-        # --- 1. Archive (always infer company + role title from job page for consistent folder names) ---
-        print(f"\n⬇️  Row {idx}: populating (inferring company + role title) | {url}")
-        result = subprocess.run(
-            ["python", str(ARCHIVE_SCRIPT), url, date_applied_iso],
-            capture_output=True,
-            text=True,
-            cwd=SCRIPT_DIR.parent,
-        )
-        if result.returncode == 2 or "POSTING_NOT_FOUND" in (result.stdout or "") + (result.stderr or ""):
-            print(f"  ⚠️ Row {idx} skipped: posting not found.")
-            continue
-        if result.returncode != 0:
-            print(f"  ⚠️ Row {idx} archive failed: {result.stderr or result.stdout}")
-            continue
-
-        company_display = "Unknown"
-        role_title_from_archive = None
-        for line in (result.stdout or "").splitlines():
-            line = line.strip()
-            if line.upper().startswith("COMPANY:"):
-                company_display = line.split(":", 1)[1].strip() or "Unknown"
-            elif line.upper().startswith("ROLE_TITLE:"):
-                role_title_from_archive = line.split(":", 1)[1].strip()
-
-        if company_col and company_display:
-            ws.update_cell(idx, company_col, company_display)
-        role_title_col = meta_cols.get("role title") if meta_cols else None
-        if role_title_col and role_title_from_archive:
-            ws.update_cell(idx, role_title_col, role_title_from_archive)
-
-        if (company_display or "").strip() in ("", "Unknown"):
-            manual = input(f"  Row {idx}: Could not identify company. Enter company name (or Enter to keep 'Unknown'): ").strip()
-            if manual:
-                company_display = manual
-                if company_col:
-                    ws.update_cell(idx, company_col, company_display)
-
-        job_dir = DATA_DIR / slugify(company_display or "unknown") / date_applied_iso
-        if job_dir_col:
-            ws.update_cell(idx, job_dir_col, str(job_dir))
-        if not (job_dir / "job.txt").exists():
-            print(f"  ⚠️ No job.txt at {job_dir}; skipping metadata.")
-            ws.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
-            continue
-
-        # --- 2. Extract metadata ---
-        print(f"  📋 Extracting metadata…")
-        result = subprocess.run(
-            ["python", str(EXTRACT_METADATA_SCRIPT), str(job_dir)],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode != 0:
-            print(f"  ⚠️ Metadata extraction failed: {result.stderr or result.stdout}")
-        else:
-            try:
-                meta = json.loads(result.stdout.strip())
-                role_title = (meta.get("role_title") or "").strip()
-                if role_title in ("", "Unknown"):
-                    manual = input(f"  Row {idx}: Could not identify role title. Enter role title (or Enter to keep 'Unknown'): ").strip()
+        pending.append((idx, url, date_applied_iso))
+
+    # --- 1. Archive (always infer company + role title from job page for consistent folder names) ---
+    # Postings are fetched concurrently; rows are handled below in sheet order as each archive completes.
+    jobs = [(url, date_applied_iso) for _, url, date_applied_iso in pending]
+    combined = os.environ.get("POPJOBS_COMBINED_EXTRACT", "1") != "0"
+    results = archive_in_order(
+        jobs, data_dir=SCRIPT_DIR.parent / DATA_DIR, infer=extract_posting_fields if combined else None
+    )
+
+    archived_dirs = []
+    try:
+        with SheetWriter(ws) as writer:
+            for (idx, url, date_applied_iso), (_, result, error) in zip(pending, results):
+                print(f"\n⬇️  Row {idx}: populating (inferring company + role title) | {url}")
+                if error is not None:
+                    print(f"  ⚠️ Row {idx} archive failed: {error}")
+                    continue
+                if result is None:
+                    print(f"  ⚠️ Row {idx} skipped: posting not found.")
+                    continue
+
+                archived_dirs.append(result["out_dir"])
+                company_display = result["company"] or "Unknown"
+                role_title_from_archive = result["role_title"]
+
+                if company_col and company_display:
+                    writer.update_cell(idx, company_col, company_display)
+                role_title_col = meta_cols.get("role title") if meta_cols else None
+                if role_title_col and role_title_from_archive:
+                    writer.update_cell(idx, role_title_col, role_title_from_archive)
+
+                if (company_display or "").strip() in ("", "Unknown"):
+                    manual = input(f"  Row {idx}: Could not identify company. Enter company name (or Enter to keep 'Unknown'): ").strip()
                     if manual:
-                        meta["role_title"] = manual
-                # Coerce role_level to sheet dropdown: MID | SENIOR (map others)
-                if "role_level" in meta:
-                    rl = meta["role_level"].upper()
-                    if rl in ("JUNIOR",):
-                        meta["role_level"] = "MID"
-                    elif rl in ("STAFF", "PRINCIPAL"):
-                        meta["role_level"] = "SENIOR"
-                for header, json_key in METADATA_COLUMNS.items():
-                    c = meta_cols.get(header)
-                    if c and json_key in meta:
-                        ws.update_cell(idx, c, meta[json_key])
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"  ⚠️ Could not parse metadata: {e}")
-
-        ws.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
-        print(f"  ✅ Row {idx} done.")
-
+                        company_display = manual
+                        if company_col:
+                            writer.update_cell(idx, company_col, company_display)
+
+                job_dir = find_job_dir(company_display or "unknown", date_applied_iso)
+                if job_dir_col:
+                    writer.update_cell(idx, job_dir_col, str(job_dir))
+                if not (job_dir / "job.txt").exists():
+                    print(f"  ⚠️ No job.txt at {job_dir}; skipping metadata.")
+                    writer.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
+                    writer.end_row()
+                    continue
+
+                # --- 2. Extract metadata ---
+                print(f"  📋 Extracting metadata…")
+                # Combined mode: the archive step's answer replaces the metadata LLM call (research still runs)
+                try:
+                    meta, _, _ = extract_metadata_for_job_dir(job_dir, posting_fields=result["extracted"])
+                except Exception as e:
+                    print(f"  ⚠️ Metadata extraction failed: {e}")
+                else:
+                    try:
+                        role_title = (meta.get("role_title") or "").strip()
+                        if role_title in ("", "Unknown"):
+                            manual = input(f"  Row {idx}: Could not identify role title. Enter role title (or Enter to keep 'Unknown'): ").strip()
+                            if manual:
+                                meta["role_title"] = manual
+                        # Coerce role_level to sheet dropdown: MID | SENIOR (map others)
+                        if "role_level" in meta:
+                            rl = meta["role_level"].upper()
+                            if rl in ("JUNIOR",):
+                                meta["role_level"] = "MID"
+                            elif rl in ("STAFF", "PRINCIPAL"):
+                                meta["role_level"] = "SENIOR"
+                        for header, json_key in METADATA_COLUMNS.items():
+                            c = meta_cols.get(header)
+                            if c and json_key in meta:
+                                writer.update_cell(idx, c, meta[json_key])
+                    except KeyError as e:
+                        print(f"  ⚠️ Could not parse metadata: {e}")
+
+                writer.update_cell(idx, archived_at_col, datetime.now().isoformat(timespec="seconds"))
+                writer.end_row()
+                print(f"  ✅ Row {idx} done.")
+    finally:
+        close_linkedin_fetcher()
+
+    start_background_render(archived_dirs)
+    print(f"\n{cache_summary()}")
     print("\n✅ populatejobs done.\n")
 
 
@@ -0,0 +1,133 @@
+"""
+Content-addressed store of raw fetched payloads (LinkedIn company page HTML, DuckDuckGo result lists)
+under data/_cache/raw/, so parsers can be re-run offline after a change instead of re-fetching:
+
+  data/_cache/raw/objects/<sha[:2]>/<sha256>.gz   payload bytes, gzip, named by the sha256 of the payload
+  data/_cache/raw/index.jsonl                      one line per fetch: {kind, key, sha256, fetched_at, meta}
+
+Identical payloads are stored once. latest(kind) gives the newest payload per key (e.g. per LinkedIn URL);
+`batchmetadata --reparse` uses it to re-run the LinkedIn parser over every saved page.
+
+Tuning (.env):
+  RAW_CACHE=0          don't store payloads
+  RAW_CACHE_MAX_MB     oldest payloads are evicted beyond this total size (default 1000); the store is scanned
+                       once per run and then only when the running total goes over
+
+Used by: batch_extract_metadata, web_search.
+"""
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RAW_CACHE_DIR = PROJECT_ROOT / "data" / "_cache" / "raw"
+DEFAULT_MAX_MB = 1000
+# Eviction trims the store to this fraction of RAW_CACHE_MAX_MB, so a full store isn't rescanned on every put
+EVICT_TO_FRACTION = 0.9
+
+_index_lock = threading.Lock()
+# Running total of stored object bytes (None until the first put scans the store), so puts only scan again to evict
+_stored_bytes: int | None = None
+_size_lock = threading.Lock()
+
+
+def _enabled() -> bool:
+    return os.environ.get("RAW_CACHE", "1") != "0"
+
+
+def _object_path(sha: str) -> Path:
+    return RAW_CACHE_DIR / "objects" / sha[:2] / f"{sha}.gz"
+
+
+def _scan() -> tuple[list[Path], int]:
+    """Stored objects, oldest first, and their total size."""
+    try:
+        blobs = sorted((RAW_CACHE_DIR / "objects").glob("*/*.gz"), key=lambda p: p.stat().st_mtime)
+        return blobs, sum(p.stat().st_size for p in blobs)
+    except OSError:
+        return [], 0
+
+
+def _evict(max_bytes: int) -> int:
+    """Delete the oldest objects until the store fits in max_bytes; returns the size left."""
+    blobs, total = _scan()
+    for path in blobs:
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            total -= path.stat().st_size
+            path.unlink()
+    return total
+
+
+def _account(added_bytes: int) -> None:
+    """Add a new object's size to the running total; only once it goes over RAW_CACHE_MAX_MB, evict the oldest
+    objects down to EVICT_TO_FRACTION of it."""
+    global _stored_bytes
+    max_bytes = int(float(os.environ.get("RAW_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1e6)
+    with _size_lock:
+        if _stored_bytes is None:
+            _stored_bytes = _scan()[1]
+        else:
+            _stored_bytes += added_bytes
+        if _stored_bytes > max_bytes:
+            _stored_bytes = _evict(int(max_bytes * EVICT_TO_FRACTION))
+
+
+def put(kind: str, key: str, content: str, meta: dict | None = None) -> str | None:
+    """Store content (e.g. page HTML) fetched for key, and log the fetch in the index. Returns its sha256,
+    or None when RAW_CACHE=0 or the write failed (callers never depend on the cache)."""
+    if not _enabled():
+        return None
+    data = content.encode("utf-8")
+    sha = hashlib.sha256(data).hexdigest()
+    path = _object_path(sha)
+    added_bytes = 0
+    try:
+        if path.exists():
+            os.utime(path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            compressed = gzip.compress(data)
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+            added_bytes = len(compressed)
+        entry = {"kind": kind, "key": key, "sha256": sha, "fetched_at": datetime.now().isoformat(timespec="seconds"),
+                 "meta": meta or {}}
+        with _index_lock, open(RAW_CACHE_DIR / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        return None
+    _account(added_bytes)
+    return sha
+
+
+def get(sha: str) -> str | None:
+    """Payload stored under sha256, or None if it was evicted."""
+    try:
+        return gzip.decompress(_object_path(sha).read_bytes()).decode("utf-8")
+    except (OSError, EOFError):
+        return None
+
+
+def latest(kind: str) -> dict[str, dict]:
+    """{key: newest index entry} for every key of this kind whose payload is still stored."""
+    entries: dict[str, dict] = {}
+    try:
+        with open(RAW_CACHE_DIR / "index.jsonl", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("kind") == kind:
+                    entries[entry["key"]] = entry
+    except OSError:
+        return {}
+    return {k: e for k, e in entries.items() if _object_path(e["sha256"]).exists()}
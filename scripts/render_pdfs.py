@@ -0,0 +1,126 @@
+"""
+Render job.pdf for archived postings from their saved raw.html, in one batch with one browser.
+No re-navigation: each page is loaded with set_content() (JavaScript off, <base href> set to the
+posting URL so relative stylesheets and images resolve), then printed.
+
+Archiving no longer prints PDFs on the critical path (ARCHIVE_PDF_MODE=deferred, the default);
+popjobs and archivejobs start this script in the background for the folders they just archived,
+so job.pdf shows up shortly after the run. Output of background runs goes to data/render_pdfs.log.
+
+  python scripts/render_pdfs.py                      # every data/<company>/<date>/ missing job.pdf
+  python scripts/render_pdfs.py data/acme/2026-02-09 # only these folders
+  python scripts/render_pdfs.py --force              # re-render even if job.pdf exists
+
+Alias: renderpdfs
+"""
+import html
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from browser_pool import BrowserPool
+
+DATA_DIR = Path("data")
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RENDER_LOG_FILE = "render_pdfs.log"
+SET_CONTENT_TIMEOUT_MS = 30000
+
+_HEAD_RE = re.compile(r"<head(?:\s[^>]*)?>", re.IGNORECASE)
+
+
+def pdf_mode() -> str:
+    """ARCHIVE_PDF_MODE: "deferred" (default; background batch), "inline" (print during archiving) or "off"."""
+    mode = os.environ.get("ARCHIVE_PDF_MODE", "deferred").strip().lower()
+    return mode if mode in ("deferred", "inline", "off") else "deferred"
+
+
+def with_base_href(raw_html: str, url: str) -> str:
+    """Insert <base href=url> so the saved page's relative assets resolve against the original site."""
+    if not url or "<base " in raw_html[:5000].lower():
+        return raw_html
+    base = f'<base href="{html.escape(url, quote=True)}">'
+    m = _HEAD_RE.search(raw_html)
+    if m:
+        return raw_html[: m.end()] + base + raw_html[m.end():]
+    return base + raw_html
+
+
+def find_pending(data_dir: Path, force: bool = False) -> list[Path]:
+    """Job folders (data/<company>/<date>/) that have raw.html but no job.pdf (or all of them with force)."""
+    return sorted(
+        raw.parent
+        for raw in data_dir.glob("*/*/raw.html")
+        if force or not (raw.parent / "job.pdf").exists()
+    )
+
+
+def render_pdfs(job_dirs: list[Path], pool: BrowserPool, force: bool = False) -> dict:
+    """Print raw.html -> job.pdf for each folder with one shared browser. Returns {"rendered", "skipped", "failed"}."""
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    for job_dir in job_dirs:
+        raw_path = job_dir / "raw.html"
+        pdf_path = job_dir / "job.pdf"
+        if not raw_path.exists() or (pdf_path.exists() and not force):
+            counts["skipped"] += 1
+            continue
+        url_path = job_dir / "url.txt"
+        url = url_path.read_text(encoding="utf-8").strip() if url_path.exists() else ""
+        started = time.monotonic()
+        try:
+            with pool.page(for_pdf=True, java_script_enabled=False) as page:
+                page.set_content(
+                    with_base_href(raw_path.read_text(encoding="utf-8"), url),
+                    wait_until="load",
+                    timeout=SET_CONTENT_TIMEOUT_MS,
+                )
+                page.pdf(path=str(pdf_path), format="Letter", print_background=True)
+        except Exception as e:
+            counts["failed"] += 1
+            print(f"⚠️ PDF failed for {job_dir}: {e}")
+            continue
+        counts["rendered"] += 1
+        print(f"📄 {pdf_path} ({int((time.monotonic() - started) * 1000)} ms)")
+    return counts
+
+
+def start_background_render(job_dirs: list[Path], data_dir: Path = PROJECT_ROOT / DATA_DIR) -> None:
+    """Start this script detached for the given folders (deferred PDF mode). Output goes to data/render_pdfs.log."""
+    job_dirs = [str(Path(d).resolve()) for d in job_dirs if d]
+    if not job_dirs or pdf_mode() != "deferred":
+        return
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with open(data_dir / RENDER_LOG_FILE, "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), *job_dirs],
+            cwd=str(PROJECT_ROOT),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    print(f"\n📄 Rendering {len(job_dirs)} PDF(s) in the background (log: {data_dir / RENDER_LOG_FILE})")
+
+
+def main():
+    args = sys.argv[1:]
+    force = "--force" in args
+    dirs = [Path(a) for a in args if a != "--force"]
+    job_dirs = dirs or find_pending(PROJECT_ROOT / DATA_DIR, force=force)
+    if not job_dirs:
+        print("No job folders need a PDF.")
+        return
+
+    started = time.monotonic()
+    with BrowserPool() as pool:
+        counts = render_pdfs(job_dirs, pool, force=force)
+    print(
+        f"\n✅ PDFs: {counts['rendered']} rendered, {counts['skipped']} skipped, {counts['failed']} failed "
+        f"in {time.monotonic() - started:.1f}s\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
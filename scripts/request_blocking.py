@@ -0,0 +1,97 @@
+"""
+Request interception for Playwright pages: aborts resource types and tracker hosts that job.txt
+and LinkedIn employee-count parsing never need (images, fonts, video, analytics, ad pixels), so
+pages load faster and use less bandwidth and memory.
+
+Policy (from .env, comma-separated):
+  BLOCK_RESOURCE_TYPES  resource types to abort (default: image,media,font)
+  BLOCK_HOSTS           extra host suffixes to abort, added to the built-in tracker list
+  ALLOW_HOSTS           host suffixes that are never blocked (wins over everything else)
+Pages rendered for PDF keep images (for_pdf=True) so job.pdf still looks like the posting.
+
+Used by: browser_pool (archiving), batch_extract_metadata (LinkedIn company pages).
+"""
+import os
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "heap.io",
+    "heapanalytics.com",
+    "newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "adsrvr.org",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "intercom.io",
+    "intercomcdn.com",
+    "drift.com",
+    "qualified.com",
+)
+
+
+def _env_list(name: str) -> tuple[str, ...]:
+    return tuple(x.strip().lower() for x in os.environ.get(name, "").split(",") if x.strip())
+
+
+def _host_matches(host: str, suffixes: tuple[str, ...]) -> bool:
+    return any(host == s or host.endswith("." + s) for s in suffixes)
+
+
+def build_policy(for_pdf: bool = False) -> dict:
+    """Return {"block_types", "deny_hosts", "allow_hosts"} from defaults + .env overrides."""
+    block_types = set(_env_list("BLOCK_RESOURCE_TYPES") or DEFAULT_BLOCKED_TYPES)
+    if for_pdf:
+        block_types.discard("image")
+    return {
+        "block_types": block_types,
+        "deny_hosts": TRACKER_HOSTS + _env_list("BLOCK_HOSTS"),
+        "allow_hosts": _env_list("ALLOW_HOSTS"),
+    }
+
+
+def should_block(url: str, resource_type: str, policy: dict) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    if _host_matches(host, policy["allow_hosts"]):
+        return False
+    return resource_type in policy["block_types"] or _host_matches(host, policy["deny_hosts"])
+
+
+def install_request_blocking(target, for_pdf: bool = False) -> dict:
+    """Route every request on a Playwright page or context through the policy.
+    Returns a live counter dict {"blocked": n, "allowed": n}."""
+    policy = build_policy(for_pdf=for_pdf)
+    counts = {"blocked": 0, "allowed": 0}
+
+    def handle(route):
+        req = route.request
+        if should_block(req.url, req.resource_type, policy):
+            counts["blocked"] += 1
+            route.abort()
+        else:
+            counts["allowed"] += 1
+            route.continue_()
+
+    target.route("**/*", handle)
+    return counts
@@ -0,0 +1,84 @@
+"""
+Buffered Google Sheets writer shared by popjobs, archivejobs and batchmetadata.
+Collects cell updates and sends them as one values batch_update per N rows instead of one
+update_cell call per field. Backs off on 429 (per-minute write quota) and 5xx, and counts the
+write requests it makes so runs can report API usage.
+
+Set SHEET_FLUSH_ROWS in .env to change how many rows are buffered per request (default 10).
+"""
+import os
+import random
+import time
+
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+DEFAULT_FLUSH_ROWS = 10
+MAX_RETRIES = 6
+RETRYABLE_STATUS = (429, 500, 502, 503)
+
+
+def _status_code(err: APIError) -> int | None:
+    resp = getattr(err, "response", None)
+    return getattr(resp, "status_code", None)
+
+
+class SheetWriter:
+    """Buffer cell updates for one worksheet and flush them with batch_update.
+
+    Use as a context manager so pending cells are flushed even if the run is interrupted:
+
+        with SheetWriter(ws) as writer:
+            writer.update_cell(idx, col, value)
+            writer.end_row()
+    """
+
+    def __init__(self, ws, flush_rows: int | None = None):
+        self.ws = ws
+        self.flush_rows = max(1, flush_rows or int(os.environ.get("SHEET_FLUSH_ROWS", DEFAULT_FLUSH_ROWS)))
+        self._pending: dict[tuple[int, int], object] = {}
+        self.requests = 0
+        self.cells_written = 0
+
+    def update_cell(self, row: int, col: int, value) -> None:
+        """Queue a single cell write (same arguments as gspread's Worksheet.update_cell)."""
+        self._pending[(row, col)] = value
+
+    def end_row(self) -> None:
+        """Mark the end of a row's updates; flush once flush_rows distinct rows are buffered."""
+        if len({r for r, _ in self._pending}) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send all buffered cells as one batch_update (retrying on quota / server errors)."""
+        if not self._pending:
+            return
+        data = [
+            {"range": rowcol_to_a1(row, col), "values": [[value]]}
+            for (row, col), value in sorted(self._pending.items())
+        ]
+        for attempt in range(MAX_RETRIES):
+            self.requests += 1
+            try:
+                # raw=False → USER_ENTERED, same as update_cell
+                self.ws.batch_update(data, raw=False)
+                break
+            except APIError as e:
+                if _status_code(e) not in RETRYABLE_STATUS or attempt == MAX_RETRIES - 1:
+                    raise
+                delay = min(64, 2 ** (attempt + 1)) + random.uniform(0, 1)
+                print(f"  ⏳ Sheets quota/server error ({_status_code(e)}); retrying in {delay:.0f}s…")
+                time.sleep(delay)
+        self.cells_written += len(data)
+        self._pending.clear()
+
+    def summary(self) -> str:
+        return f"📊 Sheets: {self.cells_written} cell(s) written in {self.requests} request(s)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        print(self.summary())
+        return False
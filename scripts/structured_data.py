@@ -0,0 +1,219 @@
+"""
+Structured posting data embedded in a job page: schema.org JobPosting JSON-LD (hiringOrganization,
+title, datePosted, validThrough, employmentType, jobLocation, baseSalary) and OpenGraph tags. Most
+career sites (Workday, iCIMS, SmartRecruiters, company sites with SEO plugins) emit JobPosting JSON-LD
+for Google for Jobs, so company and role title can be read directly instead of asking Claude.
+
+OpenGraph is only trusted for company + title when og:title reads "<title> at <company>", or when og:title
+ends with og:site_name ("Senior Engineer | Acme") and the site name is not a job board / ATS / aggregator
+(those name the platform, not the employer). Platform names are matched as whole words.
+
+Company names lose legal suffixes ("Acme, Inc." -> "Acme", "Costco Wholesale Corporation" -> "Costco
+Wholesale"), so they match the short names used elsewhere; archive_job_agent then prefers a shorter name
+the company store already knows. After changing the patterns, run python scripts/check_structured_data.py
+(cases in scripts/fixtures/structured_data/cases.json).
+
+Used by: archive_job_agent (writes posting.json next to raw.html), check_structured_data.
+"""
+import html
+import json
+import re
+
+LD_JSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>", re.I | re.S
+)
+META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.I)
+META_ATTR_RE = re.compile(r"""([a-zA-Z:_-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+TAG_RE = re.compile(r"<[^>]+>")
+# Separators need whitespace on both sides, so hyphenated names ("Coca-Cola", "Rolls-Royce") stay whole
+OG_TITLE_AT_RE = re.compile(r"^(?P<title>.+?)\s+at\s+(?P<company>.+?)(?:\s+[|–—-]\s+.*)?$")
+WORD_RE = re.compile(r"[a-z0-9]+")
+# og:site_name values (as word sequences) that name the hiring platform rather than the employer
+PLATFORM_SITE_NAMES = [
+    tuple(WORD_RE.findall(name)) for name in (
+        "ashby", "bamboohr", "built in", "builtin", "dice", "glassdoor", "greenhouse", "icims", "indeed",
+        "jobvite", "lever", "linkedin", "myworkdayjobs", "recruitee", "smartrecruiters", "teamtailor",
+        "wellfound", "angellist", "workable", "workday", "ziprecruiter", "otta", "welcome to the jungle", "wttj",
+        "work at a startup", "y combinator", "ycombinator", "himalayas", "remote ok", "remoteok",
+        "we work remotely", "weworkremotely", "monster", "simplyhired", "careerbuilder", "hired", "jobright",
+    )
+]
+# Words dropped from a site name to get the employer ("Acme Careers" -> "Acme"); a site name of only these is no employer
+GENERIC_SITE_WORDS = {"careers", "career", "jobs", "job", "hiring"}
+LEGAL_SUFFIX_RE = re.compile(
+    r"(?:,?\s+(?:inc|incorporated|llc|l\.l\.c|llp|ltd|corp|corporation|gmbh|plc|s\.a|s\.a\.s|sas"
+    r"|b\.v|bv|n\.v|pty|pte)\.?)+\s*$",
+    re.I,
+)
+# Suffixes that are also ordinary name words ("The Limited", "Bain & Co"): dropped only after a comma or when at
+# least two words remain ("Goldman Sachs & Co." -> "Goldman Sachs")
+SHORT_LEGAL_SUFFIX_RE = re.compile(r"(,)?\s+(?:co|sa|ag|nv|limited)\.?\s*$", re.I)
+POSTING_FILE = "posting.json"
+
+
+def _clean(value) -> str:
+    if not isinstance(value, str):
+        return ""
+    return " ".join(html.unescape(TAG_RE.sub(" ", value)).split())
+
+
+def strip_legal_suffix(name: str) -> str:
+    """Company name without trailing legal forms: "Acme, Inc." -> "Acme", "Goldman Sachs & Co. LLC" -> "Goldman Sachs"."""
+    short = name or ""
+    while True:
+        stripped = LEGAL_SUFFIX_RE.sub("", short)
+        m = SHORT_LEGAL_SUFFIX_RE.search(stripped)
+        if m and (m.group(1) or len(WORD_RE.findall(stripped[: m.start()].lower())) >= 2):
+            stripped = stripped[: m.start()]
+        stripped = stripped.rstrip(" ,&")
+        if stripped == short:
+            break
+        short = stripped
+    return short or (name or "")
+
+
+def _is_platform(site: str) -> bool:
+    words = WORD_RE.findall(site.lower())
+    return any(
+        words[i : i + len(platform)] == list(platform)
+        for platform in PLATFORM_SITE_NAMES
+        for i in range(len(words) - len(platform) + 1)
+    )
+
+
+def _iter_nodes(data):
+    """Every dict in a JSON-LD document (top-level lists, @graph and nested values included)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (list, dict)):
+                yield from _iter_nodes(value)
+
+
+def _is_job_posting(node: dict) -> bool:
+    types = node.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(t, str) and t.split("/")[-1].lower() == "jobposting" for t in types)
+
+
+def _org_name(org) -> str:
+    if isinstance(org, list):
+        org = org[0] if org else None
+    if isinstance(org, dict):
+        return strip_legal_suffix(_clean(org.get("name") or org.get("legalName")))
+    return strip_legal_suffix(_clean(org))
+
+
+def _location(loc) -> str:
+    places = loc if isinstance(loc, list) else [loc]
+    out = []
+    for place in places:
+        if not isinstance(place, dict):
+            continue
+        addr = place.get("address") if isinstance(place.get("address"), dict) else place
+        parts = [_clean(addr.get(k)) for k in ("addressLocality", "addressRegion")]
+        country = addr.get("addressCountry")
+        parts.append(_clean(country.get("name") if isinstance(country, dict) else country))
+        label = ", ".join(p for p in parts if p)
+        if label and label not in out:
+            out.append(label)
+    return "; ".join(out)
+
+
+def _salary(salary) -> dict | None:
+    if not isinstance(salary, dict):
+        return None
+    value = salary.get("value")
+    if isinstance(value, dict):
+        out = {k: value.get(k) for k in ("minValue", "maxValue", "value", "unitText") if value.get(k) is not None}
+    elif value is not None:
+        out = {"value": value}
+    else:
+        return None
+    if salary.get("currency"):
+        out["currency"] = salary["currency"]
+    return out or None
+
+
+def _json_ld_postings(page_html: str) -> list[dict]:
+    postings = []
+    for block in LD_JSON_RE.findall(page_html):
+        try:
+            data = json.loads(block.strip().rstrip(";"), strict=False)
+        except ValueError:
+            continue
+        postings.extend(node for node in _iter_nodes(data) if _is_job_posting(node))
+    return postings
+
+
+def _open_graph(page_html: str) -> dict:
+    og = {}
+    for tag in META_TAG_RE.findall(page_html):
+        attrs = {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+                 for m in META_ATTR_RE.finditer(tag)}
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        if key.startswith("og:") and attrs.get("content") and key[3:] not in og:
+            og[key[3:]] = _clean(attrs["content"])
+    return og
+
+
+def _from_open_graph(og: dict) -> tuple[str, str]:
+    """(company, title) from OpenGraph tags when they can be trusted, else empty strings."""
+    title = og.get("title") or ""
+    m = OG_TITLE_AT_RE.match(title)
+    if m and not _is_platform(m.group("company")):
+        return strip_legal_suffix(m.group("company").strip()), m.group("title").strip()
+    site = og.get("site_name") or ""
+    company = " ".join(w for w in site.split() if w.lower() not in GENERIC_SITE_WORDS)
+    if not company or not title or _is_platform(site):
+        return "", ""
+    # Only when og:title names the employer: "Senior Engineer | Acme" / "Senior Engineer - Acme Careers"
+    for sep in (" | ", " - ", " – ", " — "):
+        for suffix in (site, company):
+            if title.endswith(sep + suffix) and len(title) > len(sep + suffix):
+                return strip_legal_suffix(company), title[: -len(sep + suffix)].strip()
+    return "", ""
+
+
+def extract_structured_posting(page_html: str) -> dict | None:
+    """Posting fields from JSON-LD JobPosting (preferred) and OpenGraph, or None if the page has neither.
+    Keys: source ("json-ld" | "opengraph" | None when only partial OpenGraph data was found), company, title,
+    date_posted, valid_through, employment_type, location, salary, og (raw og:* tags)."""
+    if not page_html:
+        return None
+    og = _open_graph(page_html)
+    postings = _json_ld_postings(page_html)
+    if postings:
+        # Pages that list several postings (related jobs) put the main one first
+        node = next((p for p in postings if p.get("title") and p.get("hiringOrganization")), postings[0])
+        employment_type = node.get("employmentType")
+        if isinstance(employment_type, list):
+            employment_type = ", ".join(str(t) for t in employment_type)
+        return {
+            "source": "json-ld",
+            "company": _org_name(node.get("hiringOrganization")),
+            "title": _clean(node.get("title")),
+            "date_posted": _clean(node.get("datePosted")) or None,
+            "valid_through": _clean(node.get("validThrough")) or None,
+            "employment_type": _clean(employment_type) or None,
+            "location": _location(node.get("jobLocation")) or None,
+            "salary": _salary(node.get("baseSalary")),
+            "og": og,
+        }
+    if not og:
+        return None
+    company, title = _from_open_graph(og)
+    return {
+        "source": "opengraph" if company and title else None,
+        "company": company,
+        "title": title,
+        "date_posted": None,
+        "valid_through": None,
+        "employment_type": None,
+        "location": None,
+        "salary": None,
+        "og": og,
+    }
@@ -0,0 +1,210 @@
+"""
+Cached DuckDuckGo text search for company research. Results are stored on disk under
+data/_cache/search/ keyed by the normalized query (case, whitespace and quote style ignored), so
+re-running batchmetadata, or five rows at the same company, re-uses earlier answers instead of
+hitting DDG again. A cached answer for more results also serves requests for fewer. The raw DDG payload of
+every live search is also kept in raw_cache (kind "search").
+ddg_text_many() runs several queries on a small thread pool and can stop as soon as the answers
+collected so far are good enough. Live DDG requests from all threads share one rate limit.
+
+Tuning (.env):
+  SEARCH_CACHE_TTL_DAYS     entries older than this are re-fetched (default 14)
+  SEARCH_CACHE_MAX_ENTRIES  oldest entries are evicted beyond this many (default 5000)
+  SEARCH_CACHE=0            bypass the cache (always query DDG; nothing is stored)
+  SEARCH_WORKERS            concurrent queries in ddg_text_many (default 3)
+  SEARCH_MIN_INTERVAL_MS    minimum gap between live DDG requests across threads (default 250)
+
+Used by: batch_extract_metadata.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable
+
+import raw_cache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SEARCH_CACHE_DIR = PROJECT_ROOT / "data" / "_cache" / "search"
+DEFAULT_TTL_DAYS = 14
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_WORKERS = 3
+DEFAULT_MIN_INTERVAL_MS = 250
+
+_QUOTE_CHARS = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_stats_lock = threading.Lock()
+stats = {"queries": 0, "cache_hits": 0, "errors": 0, "skipped": 0}
+
+_stderr_lock = threading.Lock()
+_stderr_depth = 0
+_saved_stderr = None
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+@contextlib.contextmanager
+def _suppress_ddgs_stderr():
+    """Temporarily suppress stderr to hide ddgs 'Impersonate ... does not exist' messages.
+    Reference-counted so overlapping searches on several threads restore the real stderr exactly once."""
+    global _stderr_depth, _saved_stderr
+    with _stderr_lock:
+        if _stderr_depth == 0:
+            _saved_stderr, sys.stderr = sys.stderr, io.StringIO()
+        _stderr_depth += 1
+    try:
+        yield
+    finally:
+        with _stderr_lock:
+            _stderr_depth -= 1
+            if _stderr_depth == 0:
+                sys.stderr = _saved_stderr
+
+
+def _wait_for_rate_limit() -> None:
+    """Space live DDG requests at least SEARCH_MIN_INTERVAL_MS apart, across all threads."""
+    global _next_request_at
+    interval_s = int(os.environ.get("SEARCH_MIN_INTERVAL_MS", DEFAULT_MIN_INTERVAL_MS)) / 1000
+    with _rate_lock:
+        now = time.monotonic()
+        start_at = max(now, _next_request_at)
+        _next_request_at = start_at + interval_s
+    if start_at > now:
+        time.sleep(start_at - now)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").translate(_QUOTE_CHARS).lower().split())
+
+
+def _cache_path(query: str) -> Path:
+    return SEARCH_CACHE_DIR / f"{hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()}.json"
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("SEARCH_CACHE", "1") != "0"
+
+
+def _read_cache(query: str, max_results: int) -> list[dict] | None:
+    path = _cache_path(query)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    ttl_s = float(os.environ.get("SEARCH_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS)) * 86400
+    if time.time() - entry.get("fetched_at", 0) > ttl_s:
+        return None
+    results = entry.get("results") or []
+    # A smaller earlier request can't answer a bigger one, unless DDG already returned everything it had
+    if entry.get("max_results", 0) < max_results and len(results) >= entry.get("max_results", 0):
+        return None
+    return results[:max_results]
+
+
+def _evict(max_entries: int) -> None:
+    try:
+        entries = sorted(SEARCH_CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for path in entries[: max(0, len(entries) - max_entries)]:
+        with contextlib.suppress(OSError):
+            path.unlink()
+
+
+def _write_cache(query: str, max_results: int, results: list[dict]) -> None:
+    SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _cache_path(query)
+    entry = {"query": normalize_query(query), "max_results": max_results, "fetched_at": time.time(), "results": results}
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    _evict(int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+
+
+def ddg_text(query: str, max_results: int = 4, cancelled: threading.Event | None = None) -> list[dict] | None:
+    """DDG text search ({title, href, body} dicts), served from the on-disk cache when fresh.
+    Returns [] if ddgs is not installed or the search fails (failures are not cached), and None if
+    cancelled was set while this call waited for its rate-limit slot."""
+    if _cache_enabled():
+        cached = _read_cache(query, max_results)
+        if cached is not None:
+            with _stats_lock:
+                stats["queries"] += 1
+                stats["cache_hits"] += 1
+            return cached
+    try:
+        from ddgs import DDGS
+    except ImportError:
+        return []
+    _wait_for_rate_limit()
+    if cancelled is not None and cancelled.is_set():
+        with _stats_lock:
+            stats["skipped"] += 1
+        return None
+    with _stats_lock:
+        stats["queries"] += 1
+    try:
+        with _suppress_ddgs_stderr():
+            raw = DDGS().text(query, max_results=max_results) or []
+    except Exception as e:
+        # ddgs raises for an empty result set too; that answer is worth caching, errors are not
+        if not str(e).startswith("No results found"):
+            with _stats_lock:
+                stats["errors"] += 1
+            return []
+        raw = []
+    raw_cache.put("search", normalize_query(query), json.dumps(raw, ensure_ascii=False, default=str), {"max_results": max_results})
+    results = [
+        {"title": r.get("title") or "", "href": r.get("href") or r.get("url") or "", "body": r.get("body") or r.get("snippet") or ""}
+        for r in raw
+        if isinstance(r, dict)
+    ]
+    if _cache_enabled():
+        with contextlib.suppress(OSError):
+            _write_cache(query, max_results, results)
+    return results
+
+
+def ddg_text_many(
+    queries: list[tuple[str, int]],
+    stop_when: Callable[[dict[str, list[dict]]], bool] | None = None,
+    workers: int | None = None,
+) -> dict[str, list[dict]]:
+    """Run (query, max_results) searches concurrently on a bounded pool. After each answer,
+    stop_when(answers_so_far) may return True to skip the queries that haven't started yet.
+    Returns {query: results} in the order of queries, for the queries that ran."""
+    workers = workers or int(os.environ.get("SEARCH_WORKERS", DEFAULT_WORKERS))
+    answers: dict[str, list[dict]] = {}
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        pending = {pool.submit(ddg_text, q, n, stop): q for q, n in queries}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results = fut.result()
+                if results is not None:
+                    answers[pending[fut]] = results
+                del pending[fut]
+            if stop_when is not None and pending and stop_when(answers):
+                # Unstarted and rate-limit-waiting queries are dropped; requests already sent finish in
+                # the background (and are cached) without holding up the caller.
+                stop.set()
+                with _stats_lock:
+                    stats["skipped"] += sum(1 for fut in pending if fut.cancel())
+                break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return {q: answers[q] for q, _ in queries if q in answers}
+
+
+def search_summary() -> str:
+    line = f"🔎 Search: {stats['queries']} quer{'y' if stats['queries'] == 1 else 'ies'}, {stats['cache_hits']} from cache"
+    if stats["skipped"]:
+        line += f", {stats['skipped']} skipped (enough found)"
+    return line
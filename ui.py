@@ -65,6 +65,50 @@ def _pipe_button(label: str, script_path: Path, args: list, stdin_text: str | No
                 st.code(combined, language="text")
 
 
+def _linkedin_choices_widget(script_meta: Path):
+    """Pick LinkedIn companies queued by an unattended Batch Metadata run, then resume only those rows."""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    from batch_extract_metadata import load_pending_choices, resolve_pending_choice
+
+    pending = {slug: e for slug, e in load_pending_choices().items() if not e.get("chosen")}
+    if not pending:
+        return
+    with st.expander(f"✋ {len(pending)} compan{'y' if len(pending) == 1 else 'ies'} need a LinkedIn profile choice", expanded=True):
+        picks = {}
+        for slug, entry in sorted(pending.items()):
+            candidates = entry.get("candidates") or []
+            options = [f"{c['title']} — {c['href']}" for c in candidates] + ["Other (paste URL)"]
+            label = f"**{entry.get('company') or slug}** ({len(entry.get('job_dirs') or [])} row(s))"
+            choice = st.radio(label, options, key=f"li_choice_{slug}")
+            if choice == options[-1]:
+                url = st.text_input("LinkedIn company URL", key=f"li_url_{slug}", placeholder="https://www.linkedin.com/company/…")
+                if url.strip():
+                    picks[slug] = url.strip()
+            else:
+                picks[slug] = candidates[options.index(choice)]["href"]
+        if st.button("Save choices and resume rows", key="li_resume_btn"):
+            bad = [u for u in picks.values() if "linkedin.com/company" not in u.lower()]
+            if bad:
+                st.error(f"Not a LinkedIn company URL: {bad[0]}")
+                return
+            for slug, url in picks.items():
+                resolve_pending_choice(slug, url)
+            with st.spinner("Resuming Batch Metadata for the resolved rows…"):
+                code, out, err = run_cmd(script_meta, ["--resume"], None)
+            if code != 0:
+                st.error(f"**Batch Metadata --resume** failed (exit code {code})")
+                if err:
+                    st.code(err, language="text")
+                if out:
+                    st.code(out, language="text")
+            else:
+                st.success("**Batch Metadata** resumed rows completed.")
+                combined = (out.strip() + "\n\n" + err.strip()).strip()
+                if combined:
+                    st.code(combined, language="text")
+
+
 def page_pipeline():
     st.header("Pipeline")
     st.caption("Run pipeline steps. Inputs above each button; each button runs the corresponding CLI command.")
@@ -78,37 +122,16 @@ def page_pipeline():
     _pipe_button("Archive Jobs", SCRIPTS_DIR / "batch_archive_from_sheet.py", [], None, desc="Archive jobs in bulk from the sheet.")
 
     st.divider()
-    st.warning("⚠️ If this is the first time running a company through Batch Metadata, run it in the terminal instead. The UI can't respond to the LinkedIn company picker prompt.")
+    st.caption("Batch Metadata runs unattended here: companies with several LinkedIn matches are queued below instead of prompting.")
     company_meta = st.text_input("Company filter for **Batch Metadata** (leave blank for all)", key="pipe_batch_metadata_company", placeholder="e.g. Costco")
     script_meta = SCRIPTS_DIR / "batch_extract_metadata.py"
     if company_meta and company_meta.strip():
-        _pipe_button("Batch Metadata", script_meta, [company_meta.strip()], None, desc="Extract metadata (company filter).")
+        _pipe_button("Batch Metadata", script_meta, [company_meta.strip(), "--unattended"], None, desc="Extract metadata (company filter).")
     else:
         overwrite_meta = st.radio("New only / Overwrite all", ["New only", "Overwrite all"], key="pipe_batch_metadata_overwrite", horizontal=True)
-        stdin_meta = "A\n" if overwrite_meta == "Overwrite all" else "N\n"
-        c1, c2 = st.columns([1, 8])
-        with c1:
-            batch_meta_clicked = st.button("Batch Metadata", key="pipe_batch_metadata_btn")
-        with c2:
-            st.caption("Extract metadata for all (new only or overwrite).")
-        if batch_meta_clicked:
-            if script_meta.exists():
-                st.info("This may take several minutes depending on the number of rows.")
-                with st.spinner("Running Batch Metadata…"):
-                    code, out, err = run_cmd(script_meta, [], stdin_meta)
-                if code != 0:
-                    st.error(f"**Batch Metadata** failed (exit code {code})")
-                    if err:
-                        st.code(err, language="text")
-                    if out:
-                        st.code(out, language="text")
-                else:
-                    st.success("**Batch Metadata** completed.")
-                    combined = (out.strip() + "\n\n" + err.strip()).strip()
-                    if combined:
-                        st.code(combined, language="text")
-            else:
-                st.error(f"Script not found: {script_meta}")
+        args_meta = ["--unattended"] + (["--overwrite"] if overwrite_meta == "Overwrite all" else [])
+        _pipe_button("Batch Metadata", script_meta, args_meta, None, desc="Extract metadata for all (new only or overwrite).")
+    _linkedin_choices_widget(script_meta)
 
     # --- Applying ---
     st.subheader("Applying")